@@ -11,7 +11,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from app.database import Base
 from app.config import settings
 # Import all models to ensure they are registered with Base.metadata
-from app.models import User, Category, Book, Chunk, book_speaker_assignment  # noqa: F401
+from app.models import User, Category, Book, Chunk, book_speaker_assignment, IngestionJob, SpeakerBookProgress, RecordingDailyStats  # noqa: F401
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
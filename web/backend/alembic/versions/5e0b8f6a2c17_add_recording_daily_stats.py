@@ -0,0 +1,56 @@
+"""add_recording_daily_stats
+
+Revision ID: 5e0b8f6a2c17
+Revises: d4a7c93b1e52
+Create Date: 2026-10-16 15:48:02.117390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0b8f6a2c17'
+down_revision: Union[str, None] = 'd4a7c93b1e52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Дневные агрегаты записей для статистики
+    op.create_table('recording_daily_stats',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('speaker_id', sa.Integer(), nullable=False),
+    sa.Column('book_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('recordings_count', sa.Integer(), nullable=False),
+    sa.Column('total_duration', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['speaker_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['book_id'], ['books.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('day', 'speaker_id', 'book_id')
+    )
+    op.create_index(op.f('ix_recording_daily_stats_speaker_id'), 'recording_daily_stats', ['speaker_id'], unique=False)
+    op.create_index(op.f('ix_recording_daily_stats_book_id'), 'recording_daily_stats', ['book_id'], unique=False)
+    op.create_index(op.f('ix_recording_daily_stats_category_id'), 'recording_daily_stats', ['category_id'], unique=False)
+    
+    # Заполняем по существующим записям
+    op.execute(
+        "INSERT INTO recording_daily_stats "
+        "(day, speaker_id, book_id, category_id, recordings_count, total_duration) "
+        "SELECT DATE(recordings.created_at), recordings.speaker_id, chunks.book_id, books.category_id, "
+        "COUNT(recordings.id), COALESCE(SUM(recordings.duration), 0) "
+        "FROM recordings "
+        "JOIN chunks ON chunks.id = recordings.chunk_id "
+        "JOIN books ON books.id = chunks.book_id "
+        "GROUP BY DATE(recordings.created_at), recordings.speaker_id, chunks.book_id, books.category_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_recording_daily_stats_category_id'), table_name='recording_daily_stats')
+    op.drop_index(op.f('ix_recording_daily_stats_book_id'), table_name='recording_daily_stats')
+    op.drop_index(op.f('ix_recording_daily_stats_speaker_id'), table_name='recording_daily_stats')
+    op.drop_table('recording_daily_stats')
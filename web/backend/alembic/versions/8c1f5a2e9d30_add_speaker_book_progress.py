@@ -0,0 +1,57 @@
+"""add_speaker_book_progress
+
+Revision ID: 8c1f5a2e9d30
+Revises: 3b9e2d7c41a8
+Create Date: 2026-10-16 13:05:11.842615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1f5a2e9d30'
+down_revision: Union[str, None] = '3b9e2d7c41a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Количество чанков книги - чтобы не считать COUNT по чанкам при каждом запросе статистики
+    op.add_column('books', sa.Column('chunks_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        "UPDATE books SET chunks_count = "
+        "(SELECT COUNT(*) FROM chunks WHERE chunks.book_id = books.id)"
+    )
+    
+    # Прогресс спикера по книге (обновляется при сохранении записи)
+    op.create_table('speaker_book_progress',
+    sa.Column('speaker_id', sa.Integer(), nullable=False),
+    sa.Column('book_id', sa.Integer(), nullable=False),
+    sa.Column('recorded_chunks', sa.Integer(), nullable=False),
+    sa.Column('total_duration', sa.Float(), nullable=False),
+    sa.Column('last_recorded_order_index', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['speaker_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['book_id'], ['books.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('speaker_id', 'book_id')
+    )
+    op.create_index(op.f('ix_speaker_book_progress_book_id'), 'speaker_book_progress', ['book_id'], unique=False)
+    
+    # Заполняем по существующим записям
+    op.execute(
+        "INSERT INTO speaker_book_progress "
+        "(speaker_id, book_id, recorded_chunks, total_duration, last_recorded_order_index) "
+        "SELECT recordings.speaker_id, chunks.book_id, COUNT(recordings.id), "
+        "COALESCE(SUM(recordings.duration), 0), MAX(chunks.order_index) "
+        "FROM recordings JOIN chunks ON chunks.id = recordings.chunk_id "
+        "GROUP BY recordings.speaker_id, chunks.book_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_speaker_book_progress_book_id'), table_name='speaker_book_progress')
+    op.drop_table('speaker_book_progress')
+    op.drop_column('books', 'chunks_count')
@@ -0,0 +1,102 @@
+"""add_recordings_recorded_date
+
+Revision ID: a91c3e5f7d24
+Revises: 5e0b8f6a2c17
+Create Date: 2026-10-16 17:12:40.583104
+
+"""
+from datetime import date, datetime, timezone
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import settings
+from app.core import dates
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a91c3e5f7d24'
+down_revision: Union[str, None] = '5e0b8f6a2c17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # День записи в часовом поясе статистики (заполняется приложением при сохранении записи)
+    op.add_column('recordings', sa.Column('recorded_date', sa.Date(), nullable=True))
+    
+    # Заполняем по created_at существующих записей по тому же правилу, что и app.core.dates
+    # для новых записей: день в STATISTICS_TIMEZONE, без него - в локальном времени сервера
+    bind = op.get_bind()
+    if settings.STATISTICS_TIMEZONE and bind.dialect.name == "postgresql":
+        op.execute(
+            f"UPDATE recordings SET recorded_date = DATE(created_at AT TIME ZONE '{settings.STATISTICS_TIMEZONE}')"
+        )
+    else:
+        # Локальный часовой пояс сервера (с переходами на летнее время) и SQLite - пересчет в Python
+        _backfill_recorded_date(bind)
+    
+    with op.batch_alter_table('recordings') as batch_op:
+        batch_op.alter_column('recorded_date', existing_type=sa.Date(), nullable=False)
+    
+    # Индекс для группировки по дням: (день, спикер, длительность) покрывают запрос by_period,
+    # группировка по дню читает только индекс
+    op.create_index(
+        'ix_recordings_recorded_date',
+        'recordings',
+        ['recorded_date', 'speaker_id', 'duration'],
+        unique=False
+    )
+    
+    # Дневные агрегаты пересчитываем по recorded_date (границы дня могли сместиться из-за часового пояса)
+    op.execute("DELETE FROM recording_daily_stats")
+    op.execute(
+        "INSERT INTO recording_daily_stats "
+        "(day, speaker_id, book_id, category_id, recordings_count, total_duration) "
+        "SELECT recordings.recorded_date, recordings.speaker_id, chunks.book_id, books.category_id, "
+        "COUNT(recordings.id), COALESCE(SUM(recordings.duration), 0) "
+        "FROM recordings "
+        "JOIN chunks ON chunks.id = recordings.chunk_id "
+        "JOIN books ON books.id = chunks.book_id "
+        "GROUP BY recordings.recorded_date, recordings.speaker_id, chunks.book_id, books.category_id"
+    )
+
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _recorded_date(created_at: Optional[datetime]) -> date:
+    """День записи как dates.today() в момент created_at"""
+    if created_at is None:
+        return dates.today()
+    if created_at.tzinfo is None:
+        # SQLite хранит CURRENT_TIMESTAMP (server_default) в UTC без часового пояса
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    tz = dates.get_timezone()
+    return (created_at.astimezone(tz) if tz else created_at.astimezone()).date()
+
+
+def _backfill_recorded_date(bind) -> None:
+    recordings = sa.table(
+        'recordings',
+        sa.column('id', sa.Integer),
+        sa.column('created_at', sa.DateTime(timezone=True)),
+        sa.column('recorded_date', sa.Date),
+    )
+    rows = bind.execute(sa.select(recordings.c.id, recordings.c.created_at)).fetchall()
+    update = (
+        recordings.update()
+        .where(recordings.c.id == sa.bindparam('recording_id'))
+        .values(recorded_date=sa.bindparam('day'))
+    )
+    for start in range(0, len(rows), BACKFILL_BATCH_SIZE):
+        bind.execute(update, [
+            {'recording_id': row.id, 'day': _recorded_date(row.created_at)}
+            for row in rows[start:start + BACKFILL_BATCH_SIZE]
+        ])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_recordings_recorded_date', table_name='recordings')
+    op.drop_column('recordings', 'recorded_date')
@@ -0,0 +1,30 @@
+"""add_ingestion_job_heartbeat
+
+Revision ID: c5d81e3f4a69
+Revises: a91c3e5f7d24
+Create Date: 2026-10-17 11:04:27.912345
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d81e3f4a69'
+down_revision: Union[str, None] = 'a91c3e5f7d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Отметка выполняющейся задачи (брошенные задачи возвращаются в очередь по ее возрасту)
+    # и токен захвата (результат сохраняет только текущий исполнитель)
+    op.add_column('ingestion_jobs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('ingestion_jobs', sa.Column('claim_token', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('ingestion_jobs', 'claim_token')
+    op.drop_column('ingestion_jobs', 'heartbeat_at')
@@ -0,0 +1,27 @@
+"""add_next_unrecorded_pointer
+
+Revision ID: d4a7c93b1e52
+Revises: 8c1f5a2e9d30
+Create Date: 2026-10-16 14:21:37.509164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7c93b1e52'
+down_revision: Union[str, None] = '8c1f5a2e9d30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Указатель на следующий не записанный чанк (NULL - искать с начала книги, заполняется при первом поиске)
+    op.add_column('speaker_book_progress', sa.Column('next_unrecorded_order_index', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('speaker_book_progress', 'next_unrecorded_order_index')
@@ -19,7 +19,7 @@ async def login(
     db: Session = Depends(get_db)
 ):
     auth_service = AuthService(db)
-    user = auth_service.authenticate_user(login_data.username, login_data.password)
+    user = await auth_service.authenticate_user(login_data.username, login_data.password)
     access_token = auth_service.create_token_for_user(user)
     
     # Устанавливаем время жизни cookie равным времени жизни JWT токена
@@ -6,7 +6,9 @@ from app.database import get_db
 from app.dependencies import get_current_admin
 from app.models.user import User
 from app.schemas.book import BookResponse, BookWithChunksResponse, BookUpload, BooksPaginatedResponse
+from app.schemas.ingestion_job import IngestionJobResponse
 from app.services.book_service import BookService
+from app.services.ingestion_service import IngestionService
 
 router = APIRouter()
 
@@ -51,7 +53,7 @@ async def get_book(
     return BookResponse.model_validate(book)
 
 
-@router.post("/upload", response_model=BookResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/upload", response_model=IngestionJobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def upload_book(
     file: UploadFile = File(...),
     category_id: int = Form(...),
@@ -59,10 +61,14 @@ async def upload_book(
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin)
 ):
-    """Загрузить новую книгу (только для админа)"""
-    book_service = BookService(db)
-    book = await book_service.upload_book(file, category_id, title)
-    return BookResponse.model_validate(book)
+    """
+    Загрузить новую книгу (только для админа).
+    Книга обрабатывается в фоне: возвращается задача загрузки,
+    статус которой доступен по GET /api/v1/admin/ingestion-jobs/{job_id}.
+    """
+    ingestion_service = IngestionService(db)
+    job = await ingestion_service.create_job(file, category_id, title, created_by=current_admin.id)
+    return IngestionJobResponse.model_validate(job)
 
 
 @router.delete("/{book_id}", status_code=status.HTTP_204_NO_CONTENT)
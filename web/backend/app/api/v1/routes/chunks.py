@@ -7,6 +7,7 @@ from app.dependencies import get_current_admin
 from app.models.user import User
 from app.schemas.chunk import ChunkResponse, ChunksPaginatedResponse, SpeakerChunkResponse, SpeakerChunksPaginatedResponse
 from app.services.chunk_service import ChunkService
+from app.core.pagination import next_chunk_cursor
 
 router = APIRouter()
 
@@ -21,6 +22,7 @@ async def get_book_chunks(
     pageNumber: int = Query(default=1, ge=1, description="Номер страницы"),
     limit: int = Query(default=100, ge=1, le=1000, description="Количество записей на странице"),
     search: Optional[str] = Query(default=None, description="Поиск по тексту чанка"),
+    cursor: Optional[str] = Query(default=None, description="Курсор следующей страницы (next_cursor из предыдущего ответа); если передан, pageNumber не используется"),
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin)
 ):
@@ -31,20 +33,23 @@ async def get_book_chunks(
     - **pageNumber**: Номер страницы (начинается с 1)
     - **limit**: Количество записей на странице (максимум 1000)
     - **search**: Поиск по тексту чанка
+    - **cursor**: Курсор следующей страницы (keyset-пагинация, быстрее pageNumber на больших книгах)
     """
     chunk_service = ChunkService(db)
     chunks, total_count = chunk_service.get_chunks_by_book(
         book_id,
         page_number=pageNumber,
         limit=limit,
-        search=search
+        search=search,
+        cursor=cursor
     )
     
     return ChunksPaginatedResponse(
         items=[ChunkResponse.model_validate(chunk) for chunk in chunks],
         total=total_count,
         pageNumber=pageNumber,
-        limit=limit
+        limit=limit,
+        next_cursor=next_chunk_cursor(book_id, chunks, limit)
     )
 
 
@@ -59,6 +64,7 @@ async def get_book_chunks_with_recordings(
     pageNumber: int = Query(default=1, ge=1, description="Номер страницы"),
     limit: int = Query(default=100, ge=1, le=1000, description="Количество записей на странице"),
     search: Optional[str] = Query(default=None, description="Поиск по тексту чанка"),
+    cursor: Optional[str] = Query(default=None, description="Курсор следующей страницы (next_cursor из предыдущего ответа); если передан, pageNumber не используется"),
     filter: Optional[Literal["all", "recorded", "not_recorded"]] = Query(
         default="all",
         description="Фильтр: all - все, recorded - только озвученные, not_recorded - только не озвученные"
@@ -74,64 +80,26 @@ async def get_book_chunks_with_recordings(
     - **pageNumber**: Номер страницы (начинается с 1)
     - **limit**: Количество записей на странице (максимум 1000)
     - **search**: Поиск по тексту чанка
+    - **cursor**: Курсор следующей страницы (keyset-пагинация, быстрее pageNumber на больших книгах)
     - **filter**: Фильтр по статусу записи (all/recorded/not_recorded)
     """
     chunk_service = ChunkService(db)
     
-    # ШАГ 1: Получаем ВСЕ чанки книги (без пагинации, но с поиском)
-    # Используем большой лимит для получения всех чанков
-    all_chunks, _ = chunk_service.get_chunks_by_book(
+    # LEFT JOIN с записями спикера, фильтр по статусу, COUNT и пагинация - одним запросом в БД
+    chunks_with_recordings, total_count = chunk_service.get_chunks_with_recordings(
         book_id,
-        page_number=1,
-        limit=100000,  # Большой лимит для получения всех чанков
-        search=search
+        speaker_id,
+        page_number=pageNumber,
+        limit=limit,
+        search=search,
+        status_filter=filter,
+        cursor=cursor
     )
     
-    if not all_chunks:
-        return SpeakerChunksPaginatedResponse(
-            items=[],
-            total=0,
-            pageNumber=pageNumber,
-            limit=limit
-        )
-    
-    # Оптимизация: получаем все записи одним bulk-запросом
-    from app.models.recording import Recording
-    chunk_ids = [chunk.id for chunk in all_chunks]
-    
-    # Один запрос для получения всех записей спикера по этим чанкам
-    recordings = db.query(Recording).filter(
-        Recording.chunk_id.in_(chunk_ids),
-        Recording.speaker_id == speaker_id
-    ).all()
-    
-    # Создаем словарь для быстрого поиска записей
-    recordings_map = {rec.chunk_id: rec for rec in recordings}
-    
-    # ШАГ 2: Фильтруем чанки по статусу записи
-    filtered_chunks = []
-    for chunk in all_chunks:
-        recording = recordings_map.get(chunk.id)
-        is_recorded = recording is not None
-        
-        # Применяем фильтр
-        if filter == "recorded" and not is_recorded:
-            continue
-        if filter == "not_recorded" and is_recorded:
-            continue
-        
-        # Сохраняем чанк с информацией о записи
-        filtered_chunks.append((chunk, recording, is_recorded))
-    
-    # ШАГ 3: Применяем пагинацию к отфильтрованным результатам
-    total_count = len(filtered_chunks)
-    skip = (pageNumber - 1) * limit
-    paginated_chunks = filtered_chunks[skip:skip + limit]
-    
     # Формируем ответ
     from app.schemas.recording import RecordingResponse
     speaker_chunks = []
-    for chunk, recording, is_recorded in paginated_chunks:
+    for chunk, recording in chunks_with_recordings:
         speaker_chunk = SpeakerChunkResponse(
             id=chunk.id,
             book_id=chunk.book_id,
@@ -140,7 +108,7 @@ async def get_book_chunks_with_recordings(
             estimated_duration=chunk.estimated_duration,
             created_at=chunk.created_at,
             updated_at=chunk.updated_at,
-            is_recorded_by_me=is_recorded,
+            is_recorded_by_me=recording is not None,
             my_recording=RecordingResponse.model_validate(recording) if recording else None
         )
         speaker_chunks.append(speaker_chunk)
@@ -149,7 +117,8 @@ async def get_book_chunks_with_recordings(
         items=speaker_chunks,
         total=total_count,
         pageNumber=pageNumber,
-        limit=limit
+        limit=limit,
+        next_cursor=next_chunk_cursor(book_id, [chunk for chunk, _ in chunks_with_recordings], limit)
     )
 
 
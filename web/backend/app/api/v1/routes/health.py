@@ -1,4 +1,11 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from app.database import engine, async_engine
+from app.dependencies import get_current_admin
+from app.models.user import User
+from app.core.db_metrics import POOL_METRICS, PoolMetrics
+from app.core.security import password_hash_pool
+from app.core.audio_processor import conversion_metrics
 
 router = APIRouter()
 
@@ -8,4 +15,28 @@ async def health_check():
     return {"status": "ok", "message": "Service is healthy"}
 
 
+@router.get("/health/db")
+async def database_pool_metrics(
+    current_admin: User = Depends(get_current_admin)
+):
+    """Метрики пулов соединений: занятые соединения, ожидание соединения, таймауты"""
+    return {
+        name: POOL_METRICS.get(name, PoolMetrics()).snapshot(pool)
+        for name, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool))
+    }
+
+
+@router.get("/health/password-hashing")
+async def password_hashing_metrics(
+    current_admin: User = Depends(get_current_admin)
+):
+    """Метрики пула bcrypt: очередь, ожидание и время операций с паролями"""
+    return password_hash_pool.metrics()
+
 
+@router.get("/health/audio-conversion")
+async def audio_conversion_metrics(
+    current_admin: User = Depends(get_current_admin)
+):
+    """Метрики конвертации записей: очередь пула, время, ошибки и таймауты ffmpeg"""
+    return conversion_metrics()
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.dependencies import get_current_admin
+from app.models.user import User
+from app.schemas.ingestion_job import IngestionJobResponse
+from app.services.ingestion_service import IngestionService
+
+router = APIRouter()
+
+
+@router.get("/{job_id}", response_model=IngestionJobResponse, status_code=status.HTTP_200_OK)
+async def get_ingestion_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    """Получить статус задачи загрузки книги: этап, прогресс и время по этапам (только для админа)"""
+    ingestion_service = IngestionService(db)
+    job = ingestion_service.get_job(job_id)
+    return IngestionJobResponse.model_validate(job)
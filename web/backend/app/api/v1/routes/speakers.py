@@ -1,16 +1,19 @@
 from fastapi import APIRouter, Depends, status, Query, HTTPException
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, Literal
 
-from app.database import get_db
+from app.database import get_async_db
 from app.dependencies import get_current_user, verify_book_access
 from app.models.user import User, UserRole
-from app.schemas.chunk import SpeakerChunkResponse, SpeakerChunksPaginatedResponse
+from app.schemas.chunk import ChunkResponse, SpeakerChunkResponse, SpeakerNextChunkResponse, SpeakerChunksPaginatedResponse
 from app.schemas.book import BookResponse, BookWithStatisticsResponse
 from app.services.chunk_service import ChunkService
+from app.core.pagination import next_chunk_cursor
 from app.services.book_service import BookService
 from app.repositories.recording_repository import RecordingRepository
 from app.repositories.chunk_repository import ChunkRepository
+from app.repositories.speaker_book_progress_repository import SpeakerBookProgressRepository
 
 router = APIRouter()
 
@@ -22,7 +25,7 @@ router = APIRouter()
 )
 async def get_my_book(
     book_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -44,42 +47,33 @@ async def get_my_book(
             detail="Only speakers can access this endpoint"
         )
     
-    # Проверяем доступ к книге
-    verify_book_access(book_id, current_user, db)
-    
-    book_service = BookService(db)
-    book = book_service.get_book_by_id(book_id)
-    
-    # Оптимизация: получаем статистику одним запросом с JOIN
-    from app.models.chunk import Chunk
-    from app.models.recording import Recording
-    from sqlalchemy import func, case
-    
-    # Один запрос для получения всей статистики
-    stats_result = db.query(
-        func.count(Chunk.id).label('total_chunks'),
-        func.count(case((Recording.id.isnot(None), 1))).label('recorded_chunks')
-    ).outerjoin(
-        Recording,
-        (Recording.chunk_id == Chunk.id) & (Recording.speaker_id == current_user.id)
-    ).filter(
-        Chunk.book_id == book_id
-    ).first()
-    
-    total_chunks = stats_result.total_chunks or 0
-    recorded_count = stats_result.recorded_chunks or 0
-    unrecorded_count = total_chunks - recorded_count
-    progress_percentage = (recorded_count / total_chunks * 100) if total_chunks > 0 else 0.0
+    # Запросы к БД выполняются в асинхронной сессии и не блокируют event loop
+    def load(session: Session) -> BookWithStatisticsResponse:
+        # Проверяем доступ к книге
+        verify_book_access(book_id, current_user, session)
+        
+        book_service = BookService(session)
+        book = book_service.get_book_by_id(book_id)
+        
+        # Счетчики поддерживаются при сохранении записей - без COUNT по чанкам и записям
+        progress = SpeakerBookProgressRepository.get(session, current_user.id, book_id)
+        
+        total_chunks = book.chunks_count or 0
+        recorded_count = progress.recorded_chunks if progress else 0
+        unrecorded_count = total_chunks - recorded_count
+        progress_percentage = (recorded_count / total_chunks * 100) if total_chunks > 0 else 0.0
+        
+        # Формируем ответ
+        book_response = BookResponse.model_validate(book)
+        return BookWithStatisticsResponse(
+            **book_response.model_dump(),
+            total_chunks=total_chunks,
+            recorded_chunks=recorded_count,
+            unrecorded_chunks=unrecorded_count,
+            progress_percentage=round(progress_percentage, 2)
+        )
     
-    # Формируем ответ
-    book_response = BookResponse.model_validate(book)
-    return BookWithStatisticsResponse(
-        **book_response.model_dump(),
-        total_chunks=total_chunks,
-        recorded_chunks=recorded_count,
-        unrecorded_chunks=unrecorded_count,
-        progress_percentage=round(progress_percentage, 2)
-    )
+    return await db.run_sync(load)
 
 
 @router.get(
@@ -92,11 +86,12 @@ async def get_my_book_chunks(
     pageNumber: int = Query(default=1, ge=1, description="Номер страницы"),
     limit: int = Query(default=50, ge=1, le=1000, description="Количество записей на странице"),
     search: Optional[str] = Query(default=None, description="Поиск по тексту чанка"),
+    cursor: Optional[str] = Query(default=None, description="Курсор следующей страницы (next_cursor из предыдущего ответа); если передан, pageNumber не используется"),
     filter: Optional[Literal["all", "recorded", "not_recorded"]] = Query(
         default="all",
         description="Фильтр: all - все, recorded - только озвученные, not_recorded - только не озвученные"
     ),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -107,6 +102,7 @@ async def get_my_book_chunks(
     - **pageNumber**: Номер страницы (начинается с 1)
     - **limit**: Количество записей на странице (максимум 1000)
     - **search**: Поиск по тексту чанка
+    - **cursor**: Курсор следующей страницы (keyset-пагинация, быстрее pageNumber на больших книгах)
     - **filter**: Фильтр по статусу записи (all/recorded/not_recorded)
     """
     # Проверяем, что пользователь является спикером
@@ -116,96 +112,61 @@ async def get_my_book_chunks(
             detail="Only speakers can access this endpoint"
         )
     
-    # Проверяем доступ к книге
-    verify_book_access(book_id, current_user, db)
-    
-    chunk_service = ChunkService(db)
-    recording_repo = RecordingRepository()
-    
-    # ШАГ 1: Получаем ВСЕ чанки книги (без пагинации, но с поиском)
-    # Используем большой лимит для получения всех чанков
-    all_chunks, _ = chunk_service.get_chunks_by_book(
-        book_id,
-        page_number=1,
-        limit=100000,  # Большой лимит для получения всех чанков
-        search=search
-    )
-    
-    if not all_chunks:
-        return SpeakerChunksPaginatedResponse(
-            items=[],
-            total=0,
-            pageNumber=pageNumber,
-            limit=limit
+    def load(session: Session) -> SpeakerChunksPaginatedResponse:
+        # Проверяем доступ к книге
+        verify_book_access(book_id, current_user, session)
+        
+        chunk_service = ChunkService(session)
+        
+        # LEFT JOIN с записями спикера, фильтр по статусу, COUNT и пагинация - одним запросом в БД
+        chunks_with_recordings, total_count = chunk_service.get_chunks_with_recordings(
+            book_id,
+            current_user.id,
+            page_number=pageNumber,
+            limit=limit,
+            search=search,
+            status_filter=filter,
+            cursor=cursor
         )
-    
-    # Оптимизация: получаем все записи одним bulk-запросом
-    from app.models.recording import Recording
-    chunk_ids = [chunk.id for chunk in all_chunks]
-    
-    # Один запрос для получения всех записей спикера по этим чанкам
-    recordings = db.query(Recording).filter(
-        Recording.chunk_id.in_(chunk_ids),
-        Recording.speaker_id == current_user.id
-    ).all()
-    
-    # Создаем словарь для быстрого поиска записей
-    recordings_map = {rec.chunk_id: rec for rec in recordings}
-    
-    # ШАГ 2: Фильтруем чанки по статусу записи
-    filtered_chunks = []
-    for chunk in all_chunks:
-        recording = recordings_map.get(chunk.id)
-        is_recorded = recording is not None
         
-        # Применяем фильтр
-        if filter == "recorded" and not is_recorded:
-            continue
-        if filter == "not_recorded" and is_recorded:
-            continue
+        # Формируем ответ
+        from app.schemas.recording import RecordingResponse
+        speaker_chunks = []
+        for chunk, recording in chunks_with_recordings:
+            speaker_chunk = SpeakerChunkResponse(
+                id=chunk.id,
+                book_id=chunk.book_id,
+                text=chunk.text,
+                order_index=chunk.order_index,
+                estimated_duration=chunk.estimated_duration,
+                created_at=chunk.created_at,
+                updated_at=chunk.updated_at,
+                is_recorded_by_me=recording is not None,
+                my_recording=RecordingResponse.model_validate(recording) if recording else None
+            )
+            speaker_chunks.append(speaker_chunk)
         
-        # Сохраняем чанк с информацией о записи
-        filtered_chunks.append((chunk, recording, is_recorded))
-    
-    # ШАГ 3: Применяем пагинацию к отфильтрованным результатам
-    total_count = len(filtered_chunks)
-    skip = (pageNumber - 1) * limit
-    paginated_chunks = filtered_chunks[skip:skip + limit]
-    
-    # Формируем ответ
-    from app.schemas.recording import RecordingResponse
-    speaker_chunks = []
-    for chunk, recording, is_recorded in paginated_chunks:
-        speaker_chunk = SpeakerChunkResponse(
-            id=chunk.id,
-            book_id=chunk.book_id,
-            text=chunk.text,
-            order_index=chunk.order_index,
-            estimated_duration=chunk.estimated_duration,
-            created_at=chunk.created_at,
-            updated_at=chunk.updated_at,
-            is_recorded_by_me=is_recorded,
-            my_recording=RecordingResponse.model_validate(recording) if recording else None
+        return SpeakerChunksPaginatedResponse(
+            items=speaker_chunks,
+            total=total_count,
+            pageNumber=pageNumber,
+            limit=limit,
+            next_cursor=next_chunk_cursor(book_id, [chunk for chunk, _ in chunks_with_recordings], limit)
         )
-        speaker_chunks.append(speaker_chunk)
     
-    return SpeakerChunksPaginatedResponse(
-        items=speaker_chunks,
-        total=total_count,
-        pageNumber=pageNumber,
-        limit=limit
-    )
+    return await db.run_sync(load)
 
 
 @router.get(
     "/me/books/{book_id}/next-chunk",
-    response_model=SpeakerChunkResponse,
+    response_model=SpeakerNextChunkResponse,
     status_code=status.HTTP_200_OK
 )
 async def get_next_chunk_for_recording(
     book_id: int,
     chunk_id: Optional[int] = Query(default=None, description="ID чанка для перезаписи (опционально)"),
-    db: Session = Depends(get_db),
+    prefetch: int = Query(default=0, ge=0, le=50, description="Количество следующих не записанных чанков для предзагрузки"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -218,6 +179,8 @@ async def get_next_chunk_for_recording(
     
     - **book_id**: ID книги
     - **chunk_id**: ID чанка для перезаписи (опционально)
+    - **prefetch**: Сколько следующих не записанных чанков вернуть в next_chunks,
+      чтобы клиент мог загрузить их заранее и не делать запрос между дублями
     
     Если все чанки записаны (и chunk_id не передан), возвращает 404.
     """
@@ -228,57 +191,62 @@ async def get_next_chunk_for_recording(
             detail="Only speakers can access this endpoint"
         )
     
-    # Проверяем доступ к книге
-    verify_book_access(book_id, current_user, db)
-    
-    from app.repositories.chunk_repository import ChunkRepository
-    chunk_repo = ChunkRepository()
-    recording_repo = RecordingRepository()
-    
-    # Если передан chunk_id - получаем этот чанк
-    if chunk_id is not None:
-        chunk = chunk_repo.get_by_id(db, chunk_id)
-        if not chunk:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Chunk not found"
-            )
-        # Проверяем, что чанк принадлежит этой книге
-        if chunk.book_id != book_id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Chunk does not belong to this book"
-            )
-    else:
-        # Получаем следующий не записанный чанк
-        chunk = chunk_repo.get_next_unrecorded_chunk(db, book_id, current_user.id)
+    def load(session: Session) -> SpeakerNextChunkResponse:
+        # Проверяем доступ к книге
+        verify_book_access(book_id, current_user, session)
+        
+        chunk_service = ChunkService(session)
+        recording_repo = RecordingRepository()
         
-        if not chunk:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="All chunks for this book have been recorded"
+        # Если передан chunk_id - получаем этот чанк
+        if chunk_id is not None:
+            chunk = chunk_service.get_chunk_by_id(chunk_id)
+            # Проверяем, что чанк принадлежит этой книге
+            if chunk.book_id != book_id:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Chunk does not belong to this book"
+                )
+        
+            # Проверяем наличие записи
+            recording = recording_repo.get_by_chunk_and_speaker(
+                session,
+                chunk.id,
+                current_user.id
             )
+        
+            next_chunks = []
+            if prefetch:
+                upcoming = chunk_service.get_next_unrecorded_chunks(book_id, current_user.id, count=prefetch + 1)
+                next_chunks = [c for c in upcoming if c.id != chunk.id][:prefetch]
+        else:
+            # Получаем следующий не записанный чанк (и следующие за ним для предзагрузки)
+            upcoming = chunk_service.get_next_unrecorded_chunks(book_id, current_user.id, count=prefetch + 1)
+        
+            if not upcoming:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="All chunks for this book have been recorded"
+                )
+            chunk = upcoming[0]
+            next_chunks = upcoming[1:]
+            recording = None  # Чанк не записан
+        
+        # Формируем ответ
+        from app.schemas.recording import RecordingResponse
+        speaker_chunk = SpeakerNextChunkResponse(
+            id=chunk.id,
+            book_id=chunk.book_id,
+            text=chunk.text,
+            order_index=chunk.order_index,
+            estimated_duration=chunk.estimated_duration,
+            created_at=chunk.created_at,
+            updated_at=chunk.updated_at,
+            is_recorded_by_me=recording is not None,
+            my_recording=RecordingResponse.model_validate(recording) if recording else None,
+            next_chunks=[ChunkResponse.model_validate(c) for c in next_chunks]
+        )
+        
+        return speaker_chunk
     
-    # Проверяем наличие записи
-    recording = recording_repo.get_by_chunk_and_speaker(
-        db,
-        chunk.id,
-        current_user.id
-    )
-    
-    # Формируем ответ
-    from app.schemas.recording import RecordingResponse
-    speaker_chunk = SpeakerChunkResponse(
-        id=chunk.id,
-        book_id=chunk.book_id,
-        text=chunk.text,
-        order_index=chunk.order_index,
-        estimated_duration=chunk.estimated_duration,
-        created_at=chunk.created_at,
-        updated_at=chunk.updated_at,
-        is_recorded_by_me=recording is not None,
-        my_recording=RecordingResponse.model_validate(recording) if recording else None
-    )
-    
-    return speaker_chunk
-
+    return await db.run_sync(load)
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends, status, Query, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from datetime import datetime
 
-from app.database import get_db
+from app.database import get_async_db
 from app.dependencies import get_current_user, get_current_admin
 from app.models.user import User, UserRole
-from app.schemas.statistics import SpeakerStatisticsResponse, AdminStatisticsResponse
-from app.services.statistics_service import StatisticsService
+from app.schemas.statistics import SpeakerStatisticsResponse, AdminStatisticsResponse, StatisticsCacheMetricsResponse
+from app.services.statistics_service import StatisticsService, statistics_cache
 
 router = APIRouter()
 
@@ -30,7 +30,7 @@ async def get_my_statistics(
         default=None,
         description="Конечная дата для custom периода (формат: YYYY-MM-DD)"
     ),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -69,12 +69,14 @@ async def get_my_statistics(
                     detail="Invalid end_date format. Use YYYY-MM-DD"
                 )
     
-    statistics_service = StatisticsService(db)
-    return statistics_service.get_speaker_statistics(
-        speaker_id=current_user.id,
-        period=period,
-        start_date=start_dt,
-        end_date=end_dt
+    # Запросы статистики выполняются в асинхронной сессии и не блокируют event loop
+    return await db.run_sync(
+        lambda session: StatisticsService(session).get_speaker_statistics(
+            speaker_id=current_user.id,
+            period=period,
+            start_date=start_dt,
+            end_date=end_dt
+        )
     )
 
 
@@ -108,7 +110,7 @@ async def get_admin_statistics(
         default=None,
         description="Фильтр по категории"
     ),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin: User = Depends(get_current_admin)
 ):
     """
@@ -143,17 +145,30 @@ async def get_admin_statistics(
                     detail="Invalid end_date format. Use YYYY-MM-DD"
                 )
     
-    statistics_service = StatisticsService(db)
-    return statistics_service.get_admin_statistics(
-        period=period,
-        start_date=start_dt,
-        end_date=end_dt,
-        speaker_id=speaker_id,
-        book_id=book_id,
-        category_id=category_id
+    return await db.run_sync(
+        lambda session: StatisticsService(session).get_admin_statistics(
+            period=period,
+            start_date=start_dt,
+            end_date=end_dt,
+            speaker_id=speaker_id,
+            book_id=book_id,
+            category_id=category_id
+        )
     )
 
 
+@router.get(
+    "/admin/cache",
+    response_model=StatisticsCacheMetricsResponse,
+    status_code=status.HTTP_200_OK
+)
+async def get_statistics_cache_metrics(
+    current_admin: User = Depends(get_current_admin)
+):
+    """Метрики кэша статистики: попадания, промахи, сбросы и размер (для текущего процесса)"""
+    return statistics_cache.metrics()
+
+
 @router.get(
     "/me/by-book/{book_id}",
     response_model=SpeakerStatisticsResponse,
@@ -161,7 +176,7 @@ async def get_admin_statistics(
 )
 async def get_my_statistics_by_book(
     book_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Получить статистику спикера по конкретной книге"""
@@ -171,8 +186,9 @@ async def get_my_statistics_by_book(
             detail="Only speakers can access this endpoint"
         )
     
-    statistics_service = StatisticsService(db)
-    stats = statistics_service.get_speaker_statistics(speaker_id=current_user.id)
+    stats = await db.run_sync(
+        lambda session: StatisticsService(session).get_speaker_statistics(speaker_id=current_user.id)
+    )
     
     # Фильтруем только по указанной книге
     filtered_stats = SpeakerStatisticsResponse(
@@ -193,7 +209,7 @@ async def get_my_statistics_by_book(
 )
 async def get_my_statistics_by_category(
     category_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Получить статистику спикера по конкретной категории"""
@@ -203,8 +219,9 @@ async def get_my_statistics_by_category(
             detail="Only speakers can access this endpoint"
         )
     
-    statistics_service = StatisticsService(db)
-    stats = statistics_service.get_speaker_statistics(speaker_id=current_user.id)
+    stats = await db.run_sync(
+        lambda session: StatisticsService(session).get_speaker_statistics(speaker_id=current_user.id)
+    )
     
     # Фильтруем только по указанной категории
     filtered_stats = SpeakerStatisticsResponse(
@@ -228,7 +245,7 @@ async def get_admin_statistics_by_speaker(
     period: Optional[str] = Query(default=None),
     start_date: Optional[str] = Query(default=None),
     end_date: Optional[str] = Query(default=None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin: User = Depends(get_current_admin)
 ):
     """Получить статистику админа по конкретному спикеру"""
@@ -247,12 +264,13 @@ async def get_admin_statistics_by_speaker(
             except ValueError:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid end_date format")
     
-    statistics_service = StatisticsService(db)
-    return statistics_service.get_admin_statistics(
-        period=period,
-        start_date=start_dt,
-        end_date=end_dt,
-        speaker_id=speaker_id
+    return await db.run_sync(
+        lambda session: StatisticsService(session).get_admin_statistics(
+            period=period,
+            start_date=start_dt,
+            end_date=end_dt,
+            speaker_id=speaker_id
+        )
     )
 
 
@@ -266,7 +284,7 @@ async def get_admin_statistics_by_book(
     period: Optional[str] = Query(default=None),
     start_date: Optional[str] = Query(default=None),
     end_date: Optional[str] = Query(default=None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin: User = Depends(get_current_admin)
 ):
     """Получить статистику админа по конкретной книге"""
@@ -285,12 +303,13 @@ async def get_admin_statistics_by_book(
             except ValueError:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid end_date format")
     
-    statistics_service = StatisticsService(db)
-    return statistics_service.get_admin_statistics(
-        period=period,
-        start_date=start_dt,
-        end_date=end_dt,
-        book_id=book_id
+    return await db.run_sync(
+        lambda session: StatisticsService(session).get_admin_statistics(
+            period=period,
+            start_date=start_dt,
+            end_date=end_dt,
+            book_id=book_id
+        )
     )
 
 
@@ -304,7 +323,7 @@ async def get_admin_statistics_by_category(
     period: Optional[str] = Query(default=None),
     start_date: Optional[str] = Query(default=None),
     end_date: Optional[str] = Query(default=None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin: User = Depends(get_current_admin)
 ):
     """Получить статистику админа по конкретной категории"""
@@ -323,11 +342,12 @@ async def get_admin_statistics_by_category(
             except ValueError:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid end_date format")
     
-    statistics_service = StatisticsService(db)
-    return statistics_service.get_admin_statistics(
-        period=period,
-        start_date=start_dt,
-        end_date=end_dt,
-        category_id=category_id
+    return await db.run_sync(
+        lambda session: StatisticsService(session).get_admin_statistics(
+            period=period,
+            start_date=start_dt,
+            end_date=end_dt,
+            category_id=category_id
+        )
     )
 
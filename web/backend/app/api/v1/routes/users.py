@@ -48,7 +48,7 @@ async def create_user(
 ):
     """Создать нового пользователя (только для админа)"""
     user_service = UserService(db)
-    new_user = user_service.create_user(user_data)
+    new_user = await user_service.create_user(user_data)
     return UserResponse.model_validate(new_user)
 
 
@@ -0,0 +1,130 @@
+"""
+Нагрузочная проверка слоя БД: пропускная способность конкурентных запросов
+при синхронной сессии в event loop (как в роутах до перехода на AsyncSession)
+и при асинхронной сессии (await db.run_sync).
+
+Смешанная нагрузка: тяжелые запросы статистики админа (без кэша, по recordings)
+и легкие запросы (первая книга). Кроме пропускной способности измеряется задержка
+event loop: насколько опаздывает периодическая задача, пока выполняются запросы -
+столько же ждут ответа все остальные запросы воркера. Работает с базой из DATABASE_URL, только чтение.
+
+Запуск:
+    python -m app.benchmark
+    python -m app.benchmark --requests 400 --concurrency 50 --heavy-ratio 0.1
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, AsyncSessionLocal, async_engine
+from app.models.book import Book
+from app.services.statistics_service import StatisticsService
+
+
+def heavy_request(session: Session) -> None:
+    # Мимо кэша и дневных агрегатов: полный расчет по таблице recordings
+    StatisticsService(session)._get_admin_statistics_raw(period="month")
+
+
+def light_request(session: Session) -> None:
+    session.query(Book).order_by(Book.id).first()
+
+
+WORKLOADS: Dict[str, Callable[[Session], None]] = {
+    "heavy": heavy_request,
+    "light": light_request,
+}
+
+
+async def run_request(mode: str, kind: str) -> float:
+    started = time.perf_counter()
+    if mode == "sync":
+        db = SessionLocal()
+        try:
+            WORKLOADS[kind](db)
+        finally:
+            db.close()
+    else:
+        async with AsyncSessionLocal() as db:
+            await db.run_sync(WORKLOADS[kind])
+    return time.perf_counter() - started
+
+
+async def run_client(mode: str, kinds: List[str], latencies: Dict[str, List[float]]) -> None:
+    for kind in kinds:
+        latencies[kind].append(await run_request(mode, kind))
+        # Переключение на другие запросы, как между запросами в сервере
+        await asyncio.sleep(0)
+
+
+async def measure_loop_lag(lags: List[float], stop: asyncio.Event, interval: float = 0.005) -> None:
+    """Опоздание пробуждения периодической задачи относительно interval"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(max(time.perf_counter() - started - interval, 0.0))
+
+
+async def run_benchmark(
+    mode: str,
+    requests: int,
+    concurrency: int,
+    heavy_ratio: float
+) -> Tuple[float, Dict[str, List[float]], List[float]]:
+    rng = random.Random(0)
+    kinds = ["heavy" if rng.random() < heavy_ratio else "light" for _ in range(requests)]
+    latencies: Dict[str, List[float]] = {"heavy": [], "light": []}
+    lags: List[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(measure_loop_lag(lags, stop))
+
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        run_client(mode, kinds[i::concurrency], latencies)
+        for i in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+    return elapsed, latencies, lags
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+async def main(requests: int, concurrency: int, heavy_ratio: float) -> None:
+    # Прогрев: соединения пулов и кэши планов запросов
+    for mode in ("sync", "async"):
+        await run_benchmark(mode, min(requests, concurrency), concurrency, heavy_ratio)
+
+    print(f"requests={requests} concurrency={concurrency} heavy_ratio={heavy_ratio}")
+    print(f"{'mode':<6} {'req/s':>8} {'light p50 ms':>13} {'heavy p50 ms':>13} {'loop lag p95 ms':>16} {'loop lag max ms':>16}")
+    for mode in ("sync", "async"):
+        elapsed, latencies, lags = await run_benchmark(mode, requests, concurrency, heavy_ratio)
+        light, heavy = latencies["light"], latencies["heavy"]
+        print(
+            f"{mode:<6} {requests / elapsed:>8.1f} "
+            f"{percentile(light, 0.5) * 1000:>13.1f} "
+            f"{(statistics.median(heavy) if heavy else 0.0) * 1000:>13.1f} "
+            f"{percentile(lags, 0.95) * 1000:>16.1f} {(max(lags) if lags else 0.0) * 1000:>16.1f}"
+        )
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сравнение синхронной и асинхронной сессии БД под конкурентной нагрузкой")
+    parser.add_argument("--requests", type=int, default=200, help="Количество запросов")
+    parser.add_argument("--concurrency", type=int, default=20, help="Количество одновременных клиентов")
+    parser.add_argument("--heavy-ratio", type=float, default=0.2, help="Доля тяжелых запросов статистики")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.concurrency, args.heavy_ratio))
@@ -18,6 +18,41 @@ class Settings(BaseSettings):
     SECRET_KEY: str = Field(..., description="Секретный ключ для JWT токенов (ОБЯЗАТЕЛЬНО)")
     ALGORITHM: str = Field(default="HS256", description="Алгоритм шифрования JWT")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=300000, description="Время жизни access token в минутах")
+    BCRYPT_ROUNDS: int = Field(default=12, description="Cost factor bcrypt для новых хешей паролей")
+    PASSWORD_REHASH: bool = Field(
+        default=True,
+        description="При успешном входе перехешировать пароль, если его хеш создан с другим BCRYPT_ROUNDS"
+    )
+    PASSWORD_HASH_WORKERS: int = Field(
+        default=4,
+        description="Потоков для хеширования и проверки паролей (одновременных операций bcrypt)"
+    )
+    PASSWORD_HASH_MAX_QUEUE: int = Field(
+        default=100,
+        description="Максимум операций с паролями в очереди пула; сверх этого вход отвечает 503 (0 - без ограничения)"
+    )
+    AUTH_USER_CACHE_TTL: float = Field(
+        default=60.0,
+        description="Время жизни пользователя в кэше аутентификации в секундах (0 - искать пользователя в БД на каждый запрос)"
+    )
+    AUTH_USER_CACHE_MAX_ENTRIES: int = Field(
+        default=10000,
+        description="Максимальное количество пользователей в кэше аутентификации процесса"
+    )
+    
+    # Пул соединений с БД (отдельный пул у синхронного и асинхронного движка, для SQLite не применяется)
+    DB_POOL_SIZE: int = Field(default=10, description="Количество постоянных соединений в пуле")
+    DB_MAX_OVERFLOW: int = Field(default=20, description="Дополнительные соединения сверх DB_POOL_SIZE при пиковой нагрузке")
+    DB_POOL_TIMEOUT: float = Field(default=30.0, description="Сколько секунд ждать свободного соединения, прежде чем вернуть ошибку")
+    DB_POOL_RECYCLE: int = Field(default=1800, description="Пересоздавать соединения старше указанного числа секунд (-1 - не пересоздавать)")
+    DB_POOL_PRE_PING: bool = Field(
+        default=True,
+        description="Проверять соединение запросом перед каждой выдачей из пула (лишний запрос к БД; можно отключить при DB_POOL_RECYCLE меньше таймаута простоя сервера БД)"
+    )
+    DB_REQUEST_STATS: bool = Field(
+        default=False,
+        description="Считать запросы к БД в каждом HTTP запросе: заголовки X-DB-Queries, X-DB-Time-Ms, X-DB-Pool-Wait-Ms и строка в логе"
+    )
     
     # CORS
     CORS_ORIGINS: List[str] = Field(
@@ -45,6 +80,62 @@ class Settings(BaseSettings):
         default=100,
         description="Порог длины предложения в символах для выбора стратегии разбиения"
     )
+    CHUNKING_WORKERS: int = Field(
+        default=0,
+        description="Количество процессов для параллельной нарезки больших книг на чанки (0 - по числу ядер CPU, 1 - без параллелизма)"
+    )
+    CHUNKING_PARALLEL_MIN_SIZE: int = Field(
+        default=200000,
+        description="Размер файла книги в байтах, начиная с которого она нарезается на чанки параллельно"
+    )
+    CHUNK_INSERT_BATCH_SIZE: int = Field(
+        default=1000,
+        description="Количество чанков в одной пачке при сохранении в БД во время загрузки книги"
+    )
+    
+    # Book Ingestion (фоновая загрузка книг)
+    INGESTION_BACKEND: str = Field(
+        default="executor",
+        description="Где обрабатываются задачи загрузки книг: executor - пул потоков внутри приложения, queue - отдельный процесс воркера (python -m app.worker), берущий задачи из таблицы ingestion_jobs"
+    )
+    INGESTION_WORKERS: int = Field(
+        default=2,
+        description="Количество задач загрузки книг, обрабатываемых одновременно (потоков в пуле или в процессе воркера)"
+    )
+    INGESTION_POLL_INTERVAL: float = Field(
+        default=2.0,
+        description="Интервал опроса очереди задач загрузки воркером в секундах (для INGESTION_BACKEND=queue)"
+    )
+    INGESTION_JOB_TIMEOUT: int = Field(
+        default=3600,
+        description="Через сколько секунд без отметки о работе (heartbeat, обновляется с прогрессом) задача в статусе running считается брошенной (процесс остановлен или упал) и возвращается в очередь. В SQLite прогресс пишется только по завершении, поэтому время считается от начала обработки"
+    )
+    INGESTION_UPLOADS_DIR: str = Field(
+        default="uploads",
+        description="Путь к директории для временных файлов загружаемых книг (относительно корня проекта)"
+    )
+    
+    # Statistics
+    STATISTICS_STRATEGY: str = Field(
+        default="rollup",
+        description="Источник статистики: rollup - дневные агрегаты recording_daily_stats, raw - агрегатные запросы по таблице recordings, grouping_sets - статистика админа одним запросом по recordings (GROUPING SETS в PostgreSQL)"
+    )
+    STATISTICS_TIMEZONE: str = Field(
+        default="",
+        description="Часовой пояс границ дня в статистике, например Asia/Bishkek (пусто - локальное время сервера)"
+    )
+    STATISTICS_CACHE_TTL: float = Field(
+        default=30.0,
+        description="Время жизни закэшированного ответа статистики в секундах (0 - кэш отключен)"
+    )
+    STATISTICS_CACHE_MAX_ENTRIES: int = Field(
+        default=1024,
+        description="Максимальное количество ответов статистики в кэше процесса (вытесняются давно не использованные)"
+    )
+    STATISTICS_CACHE_BACKEND: str = Field(
+        default="memory",
+        description="Хранилище кэша статистики: memory - в памяти процесса, или путь к классу 'модуль:Класс' (наследник app.core.cache.CacheBackend) для общего кэша нескольких воркеров"
+    )
     
     # Audio Recording Settings
     WAVS_DIR: str = Field(
@@ -66,6 +157,24 @@ class Settings(BaseSettings):
         description="Количество каналов: 1 (моно) или 2 (стерео). Для TTS обычно используется моно"
     )
     
+    # Конвертация загруженных записей (ffmpeg из файла в файл в пуле потоков)
+    AUDIO_FFMPEG_BINARY: str = Field(
+        default="ffmpeg",
+        description="Конвертер аудио: имя в PATH или путь к исполняемому файлу с интерфейсом ffmpeg"
+    )
+    AUDIO_CONVERSION_WORKERS: int = Field(
+        default=4,
+        description="Количество одновременных конвертаций аудио (процессов ffmpeg)"
+    )
+    AUDIO_CONVERSION_MAX_QUEUE: int = Field(
+        default=32,
+        description="Максимум записей в очереди на конвертацию; сверх этого загрузка отвечает 503 (0 - без ограничения)"
+    )
+    AUDIO_CONVERSION_TIMEOUT: float = Field(
+        default=30.0,
+        description="Максимальное время конвертации одной записи в секундах (процесс ffmpeg завершается, загрузка отвечает 504)"
+    )
+    
     @field_validator('CORS_ORIGINS', mode='before')
     @classmethod
     def parse_cors_origins(cls, v):
@@ -78,6 +187,50 @@ class Settings(BaseSettings):
                 return [origin.strip() for origin in v.split(',') if origin.strip()]
         return v
     
+    @field_validator('INGESTION_BACKEND')
+    @classmethod
+    def validate_ingestion_backend(cls, v):
+        """Валидация способа обработки задач загрузки"""
+        if v not in ("executor", "queue"):
+            raise ValueError("INGESTION_BACKEND должен быть 'executor' или 'queue'")
+        return v
+    
+    @field_validator('STATISTICS_STRATEGY')
+    @classmethod
+    def validate_statistics_strategy(cls, v):
+        """Валидация источника статистики"""
+        if v not in ("rollup", "raw", "grouping_sets"):
+            raise ValueError("STATISTICS_STRATEGY должен быть 'rollup', 'raw' или 'grouping_sets'")
+        return v
+    
+    @field_validator('BCRYPT_ROUNDS')
+    @classmethod
+    def validate_bcrypt_rounds(cls, v):
+        """Валидация cost factor bcrypt"""
+        if not 4 <= v <= 31:
+            raise ValueError("BCRYPT_ROUNDS должен быть от 4 до 31")
+        return v
+    
+    @field_validator('STATISTICS_TIMEZONE')
+    @classmethod
+    def validate_statistics_timezone(cls, v):
+        """Валидация часового пояса статистики"""
+        if v:
+            from zoneinfo import ZoneInfo
+            try:
+                ZoneInfo(v)
+            except Exception:
+                raise ValueError(f"Неизвестный часовой пояс STATISTICS_TIMEZONE: {v}")
+        return v
+    
+    @field_validator('STATISTICS_CACHE_BACKEND')
+    @classmethod
+    def validate_statistics_cache_backend(cls, v):
+        """Валидация хранилища кэша статистики"""
+        if v != "memory" and ":" not in v:
+            raise ValueError("STATISTICS_CACHE_BACKEND должен быть 'memory' или путем к классу вида 'модуль:Класс'")
+        return v
+    
     @field_validator('SECRET_KEY')
     @classmethod
     def validate_secret_key(cls, v):
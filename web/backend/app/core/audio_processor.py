@@ -1,11 +1,19 @@
 import re
+import mmap
+import os
+import shutil
+import subprocess
+import threading
+import time
+import uuid
+from functools import lru_cache
 from pathlib import Path
-from typing import Tuple, Optional
-import wave
-import io
+from typing import BinaryIO, List, Tuple, Optional
 
 from fastapi import HTTPException, status
 from app.config import settings
+from app.core import pcm
+from app.core.worker_pool import WorkerPool
 
 
 def sanitize_filename(filename: str) -> str:
@@ -58,232 +66,225 @@ def detect_audio_format(audio_data: bytes, filename: Optional[str] = None) -> Op
 
 
 def get_audio_duration(audio_data: bytes) -> float:
-    """Получает длительность аудио в секундах"""
+    """
+    Получает длительность аудио в секундах.
+    Записи сохраняются только в PCM WAV (в том числе 24-bit и WAVE_FORMAT_EXTENSIBLE),
+    поэтому длительность берется из заголовка по размеру чанка data, без декодирования.
+    """
     try:
-        # Пробуем через pydub, если доступен
-        try:
-            from pydub import AudioSegment
-            audio = AudioSegment.from_file(io.BytesIO(audio_data))
-            return len(audio) / 1000.0  # pydub возвращает длительность в миллисекундах
-        except ImportError:
-            pass
-        
-        # Пробуем через wave для WAV файлов
-        with wave.open(io.BytesIO(audio_data), 'rb') as wav_file:
-            frames = wav_file.getnframes()
-            sample_rate = wav_file.getframerate()
-            duration = frames / float(sample_rate)
-            return duration
-    except Exception:
-        # Если не удалось определить длительность, возвращаем 0
-        return 0.0
-
-
-def convert_to_wav_16bit_mono(audio_data: bytes, input_format: str = None, filename: str = None) -> bytes:
+        info = pcm.parse_wav_header(audio_data)
+        if info.is_pcm:
+            return info.duration
+    except pcm.PcmFormatError:
+        pass
+    # Если не удалось определить длительность, возвращаем 0
+    return 0.0
+
+
+# Кодек PCM для битности AUDIO_BIT_DEPTH
+PCM_CODECS = {8: 'pcm_u8', 16: 'pcm_s16le', 24: 'pcm_s24le', 32: 'pcm_s32le'}
+
+# Размер блока при копировании загрузки и данных WAV на диск
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class ConversionStats:
+    """Конвертации (запуски ffmpeg или NumPy): количество, ошибки, таймауты и время"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.input_bytes = 0
+        self.output_bytes = 0
+        self.time_total = 0.0
+        self.time_max = 0.0
+
+    def record(self, elapsed: float, input_bytes: int, output_bytes: int = 0, error: bool = False, timeout: bool = False) -> None:
+        with self._lock:
+            self.runs += 1
+            self.errors += error
+            self.timeouts += timeout
+            self.input_bytes += input_bytes
+            self.output_bytes += output_bytes
+            self.time_total += elapsed
+            self.time_max = max(self.time_max, elapsed)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "errors": self.errors,
+                "timeouts": self.timeouts,
+                "input_bytes": self.input_bytes,
+                "output_bytes": self.output_bytes,
+                "time_avg_ms": self.time_total / self.runs * 1000 if self.runs else 0.0,
+                "time_max_ms": self.time_max * 1000,
+            }
+
+
+ffmpeg_stats = ConversionStats()
+pcm_stats = ConversionStats()
+passthrough_stats = ConversionStats()
+
+# Конвертация выполняется в отдельном пуле потоков: поток ждет процесс ffmpeg, не занимая event loop
+audio_conversion_pool = WorkerPool(
+    "audio-convert",
+    workers=lambda: settings.AUDIO_CONVERSION_WORKERS,
+    max_queue=lambda: settings.AUDIO_CONVERSION_MAX_QUEUE,
+    busy_detail="Too many concurrent audio uploads, please retry",
+)
+
+
+@lru_cache(maxsize=None)
+def _find_binary(binary: str) -> Optional[str]:
+    return shutil.which(binary)
+
+
+def ffmpeg_available() -> bool:
+    """Найден ли конвертер AUDIO_FFMPEG_BINARY (имя в PATH или путь к файлу)"""
+    return _find_binary(settings.AUDIO_FFMPEG_BINARY) is not None
+
+
+def target_bit_depth() -> int:
+    """Битность выходного WAV: AUDIO_BIT_DEPTH, по умолчанию 24-bit для высокого качества"""
+    return settings.AUDIO_BIT_DEPTH if settings.AUDIO_BIT_DEPTH in PCM_CODECS else 24
+
+
+def build_ffmpeg_command(input_path: str, output_path: str) -> List[str]:
+    """Команда ffmpeg: аудио из файла input_path в WAV с настройками качества из config в файл output_path"""
+    pcm_codec = PCM_CODECS[target_bit_depth()]
+    return [
+        _find_binary(settings.AUDIO_FFMPEG_BINARY) or settings.AUDIO_FFMPEG_BINARY,
+        '-hide_banner',
+        '-loglevel', 'error',
+        '-i', input_path,
+        '-acodec', pcm_codec,  # PCM с указанной битностью
+        '-ac', str(settings.AUDIO_CHANNELS),  # Количество каналов
+        '-ar', str(settings.AUDIO_SAMPLE_RATE),  # Частота дискретизации
+        '-f', 'wav',
+        '-y',  # Перезаписать выходной файл
+        output_path
+    ]
+
+
+def _run_ffmpeg(cmd: List[str], input_size: int) -> Tuple[subprocess.CompletedProcess, float]:
     """
-    Конвертирует аудио в WAV формат с настройками качества из config.
+    Запускает ffmpeg и завершает процесс по таймауту AUDIO_CONVERSION_TIMEOUT.
+    Ошибки и таймауты учитываются в ffmpeg_stats, успешный запуск учитывает вызывающий.
     
-    Args:
-        audio_data: Байты аудио файла
-        input_format: Формат входного файла (если известен)
-        filename: Имя файла (для определения формата, если не указан)
+    Returns:
+        Tuple[результат процесса, время выполнения в секундах]
+    """
+    started = time.perf_counter()
+    try:
+        result = subprocess.run(cmd, stdin=subprocess.DEVNULL, capture_output=True, timeout=settings.AUDIO_CONVERSION_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        ffmpeg_stats.record(time.perf_counter() - started, input_size, error=True, timeout=True)
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"Конвертация аудио не завершилась за {settings.AUDIO_CONVERSION_TIMEOUT} секунд"
+        )
+    
+    if result.returncode != 0:
+        ffmpeg_stats.record(time.perf_counter() - started, input_size, error=True)
+        stderr = result.stderr.decode('utf-8', errors='replace')
+        raise Exception(f"Decoding failed. ffmpeg returned error code: {result.returncode}\n\nOutput from ffmpeg/avlib:\n\n{stderr}")
+    return result, time.perf_counter() - started
+
+
+def get_file_duration(path: Path) -> float:
+    """get_audio_duration для файла: WAV читается через mmap, с диска загружается только заголовок"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0.0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return get_audio_duration(data)
+
+
+def convert_file_to_wav(input_path: Path, output_path: Path) -> float:
+    """
+    Конвертирует аудио файл в WAV с настройками качества из config, из файла в файл.
+    WAV читается через mmap и обрабатывается блоками, ffmpeg читает и пишет файлы сам,
+    поэтому память не зависит от длины записи. WAV в целевом формате со стандартным
+    заголовком не копируется: input_path переименовывается в output_path.
+    Формат остальных файлов ffmpeg определяет по содержимому.
     
     Returns:
-        Байты WAV файла в формате, указанном в настройках (по умолчанию высокое качество)
+        Длительность в секундах
     """
+    input_size = input_path.stat().st_size
+    if input_size == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Пустой аудио файл"
+        )
+    
     try:
-        # Определяем формат по содержимому, если не указан
-        if not input_format:
-            input_format = detect_audio_format(audio_data, filename)
-        
-        # Пробуем использовать pydub для конвертации (если установлен)
-        pydub_available = False
-        try:
-            from pydub import AudioSegment
-            pydub_available = True
-        except ImportError:
-            pass
-        
-        if pydub_available:
-            try:
-                # Определяем формат по расширению или используем auto-detect
-                if input_format:
-                    # Для webm и opus pydub может не работать напрямую, пробуем через ffmpeg
-                    if input_format in ['webm', 'opus']:
-                        raise ValueError(f"pydub may not support {input_format} format, using ffmpeg")
-                    
-                    audio = AudioSegment.from_file(io.BytesIO(audio_data), format=input_format)
-                else:
-                    # Auto-detect формат
-                    audio = AudioSegment.from_file(io.BytesIO(audio_data))
-                
-                # Конвертируем с настройками качества из config
-                sample_rate = settings.AUDIO_SAMPLE_RATE
-                bit_depth = settings.AUDIO_BIT_DEPTH
-                channels = settings.AUDIO_CHANNELS
-                
-                # Устанавливаем параметры качества
-                audio = audio.set_channels(channels)
-                # sample_width: 1=8-bit, 2=16-bit, 3=24-bit, 4=32-bit
-                sample_width = (bit_depth + 7) // 8  # Округляем до байтов
-                audio = audio.set_sample_width(sample_width)
-                audio = audio.set_frame_rate(sample_rate)
-                
-                # Экспортируем в WAV
-                wav_buffer = io.BytesIO()
-                audio.export(wav_buffer, format="wav")
-                return wav_buffer.getvalue()
-                
-            except Exception as pydub_error:
-                # Если pydub не смог обработать, пробуем через ffmpeg
-                # Это нормально для webm/opus форматов
-                pass
+        with open(input_path, 'rb') as f:
+            head = f.read(64)
         
-        # Если pydub не установлен или не смог обработать, пробуем другие методы
-        if not pydub_available:
-            # Если pydub не установлен, пробуем обработать как WAV напрямую
+        # WAV - без ffmpeg: без перекодирования, если уже в целевом формате, иначе через NumPy
+        if detect_audio_format(head) == 'wav':
+            started = time.perf_counter()
+            rename_input = False
             try:
-                with wave.open(io.BytesIO(audio_data), 'rb') as wav_in:
-                    # Читаем параметры
-                    n_channels = wav_in.getnchannels()
-                    sample_width = wav_in.getsampwidth()
-                    framerate = wav_in.getframerate()
-                    n_frames = wav_in.getnframes()
-                    audio_frames = wav_in.readframes(n_frames)
-                    
-                    # Конвертируем в моно, если стерео
-                    if n_channels == 2:
-                        # Преобразуем стерео в моно (усредняем каналы)
-                        if sample_width == 1:
-                            # 8-bit
-                            audio_frames = bytes([(audio_frames[i] + audio_frames[i+1]) // 2 
-                                                 for i in range(0, len(audio_frames), 2)])
-                        elif sample_width == 2:
-                            # 16-bit
-                            audio_frames = bytes([(audio_frames[i] + audio_frames[i+2]) // 2 
-                                                 for i in range(0, len(audio_frames), 4)])
-                            audio_frames = bytes([audio_frames[i] for i in range(0, len(audio_frames), 2)])
-                        elif sample_width == 4:
-                            # 32-bit
-                            audio_frames = bytes([(audio_frames[i] + audio_frames[i+4]) // 2 
-                                                 for i in range(0, len(audio_frames), 8)])
-                            audio_frames = bytes([audio_frames[i] for i in range(0, len(audio_frames), 4)])
-                    
-                    # Конвертируем в 16-bit, если нужно
-                    if sample_width != 2:
-                        # Упрощенная конвертация (для полной нужен более сложный алгоритм)
-                        # В реальном проекте лучше использовать pydub
-                        pass
-                    
-                    # Нормализуем sample rate до 44100
-                    if framerate != 44100:
-                        # Упрощенная ресемплизация (для полной нужен более сложный алгоритм)
-                        # В реальном проекте лучше использовать pydub
-                        pass
-                    
-                    # Создаем новый WAV файл
-                    wav_buffer = io.BytesIO()
-                    with wave.open(wav_buffer, 'wb') as wav_out:
-                        wav_out.setnchannels(1)  # Моно
-                        wav_out.setsampwidth(2)  # 16-bit
-                        wav_out.setframerate(44100)  # 44.1 kHz
-                        wav_out.writeframes(audio_frames)
-                    
-                    return wav_buffer.getvalue()
-                    
-            except Exception as e:
-                # Если не удалось обработать как WAV, пробуем через ffmpeg
+                with open(input_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    found = pcm.passthrough_header(
+                        data,
+                        settings.AUDIO_SAMPLE_RATE,
+                        target_bit_depth(),
+                        settings.AUDIO_CHANNELS
+                    )
+                    if found is not None:
+                        info, header = found
+                        rename_input = pcm.has_header(data, info, header)
+                        if not rename_input:
+                            # Переписывается только заголовок, данные копируются блоками
+                            with open(output_path, 'wb') as out:
+                                out.write(header)
+                                end = info.data_offset + info.frames * info.block_align
+                                for position in range(info.data_offset, end, UPLOAD_CHUNK_SIZE):
+                                    out.write(data[position:min(position + UPLOAD_CHUNK_SIZE, end)])
+                        stats = passthrough_stats
+                    else:
+                        with open(output_path, 'wb') as out:
+                            pcm.write_converted_wav(
+                                data,
+                                out,
+                                settings.AUDIO_SAMPLE_RATE,
+                                target_bit_depth(),
+                                settings.AUDIO_CHANNELS,
+                                deadline=time.monotonic() + settings.AUDIO_CONVERSION_TIMEOUT
+                            )
+                        stats = pcm_stats
+                if rename_input:
+                    os.replace(input_path, output_path)
+                stats.record(time.perf_counter() - started, input_size, output_path.stat().st_size)
+                return get_file_duration(output_path)
+            except pcm.PcmFormatError:
+                # Сжатый WAV (ADPCM, mu-law и т.п.), необычная частота или поврежденный заголовок - пробуем через ffmpeg
                 pass
-        
-        # Используем ffmpeg для конвертации (работает с большинством форматов)
-        try:
-            import subprocess
-            import tempfile
-            import os
-            
-            # Определяем расширение для временного файла
-            suffix = f'.{input_format}' if input_format else '.tmp'
-            
-            # Создаем временный файл для входных данных
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as input_file:
-                input_file.write(audio_data)
-                input_file_path = input_file.name
-            
-            # Создаем временный файл для выходных данных
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as output_file:
-                output_file_path = output_file.name
-            
-            try:
-                # Используем настройки качества из config
-                sample_rate = settings.AUDIO_SAMPLE_RATE
-                bit_depth = settings.AUDIO_BIT_DEPTH
-                channels = settings.AUDIO_CHANNELS
-                
-                # Определяем кодек PCM в зависимости от битности
-                if bit_depth == 8:
-                    pcm_codec = 'pcm_u8'
-                elif bit_depth == 16:
-                    pcm_codec = 'pcm_s16le'
-                elif bit_depth == 24:
-                    pcm_codec = 'pcm_s24le'
-                elif bit_depth == 32:
-                    pcm_codec = 'pcm_s32le'
-                else:
-                    # По умолчанию используем 24-bit для высокого качества
-                    pcm_codec = 'pcm_s24le'
-                    bit_depth = 24
-                
-                # Используем ffmpeg для конвертации с высоким качеством
-                cmd = [
-                    'ffmpeg',
-                    '-i', input_file_path,
-                    '-acodec', pcm_codec,  # PCM с указанной битностью
-                    '-ac', str(channels),  # Количество каналов
-                    '-ar', str(sample_rate),  # Частота дискретизации
-                    '-y',  # Перезаписать выходной файл
-                    output_file_path
-                ]
-                
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=30
+            except TimeoutError:
+                pcm_stats.record(time.perf_counter() - started, input_size, error=True, timeout=True)
+                raise HTTPException(
+                    status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                    detail=f"Конвертация аудио не завершилась за {settings.AUDIO_CONVERSION_TIMEOUT} секунд"
                 )
-                
-                if result.returncode != 0:
-                    raise Exception(f"Decoding failed. ffmpeg returned error code: {result.returncode}\n\nOutput from ffmpeg/avlib:\n\n{result.stderr}")
-                
-                # Читаем результат
-                with open(output_file_path, 'rb') as f:
-                    wav_data = f.read()
-                
-                if len(wav_data) == 0:
-                    raise Exception("ffmpeg produced empty output file")
-                
-                return wav_data
-                
-            finally:
-                # Удаляем временные файлы
-                try:
-                    os.unlink(input_file_path)
-                except:
-                    pass
-                try:
-                    os.unlink(output_file_path)
-                except:
-                    pass
-                    
-        except FileNotFoundError:
+        
+        if not ffmpeg_available():
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Не удалось обработать аудио файл. Установите ffmpeg для поддержки этого формата."
             )
-        except Exception as ffmpeg_error:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Ошибка конвертации аудио: {str(ffmpeg_error)}"
-            )
+        _, elapsed = _run_ffmpeg(build_ffmpeg_command(str(input_path), str(output_path)), input_size)
+        output_size = output_path.stat().st_size if output_path.exists() else 0
+        if output_size == 0:
+            ffmpeg_stats.record(elapsed, input_size, error=True)
+            raise Exception("ffmpeg produced empty output file")
+        ffmpeg_stats.record(elapsed, input_size, output_size)
+        return get_file_duration(output_path)
     
     except HTTPException:
         raise
@@ -294,24 +295,28 @@ def convert_to_wav_16bit_mono(audio_data: bytes, input_format: str = None, filen
         )
 
 
-def save_audio_file(
-    audio_data: bytes,
-    speaker_name: str,
-    book_name: str,
-    chunk_id: int
-) -> Tuple[str, float]:
+def conversion_metrics() -> dict:
     """
-    Сохраняет аудио файл в папку wavs/speaker_name с названием book_name_chunk_id.wav
-    
-    Args:
-        audio_data: Байты WAV файла
-        speaker_name: Имя спикера
-        book_name: Название книги
-        chunk_id: ID чанка
-    
-    Returns:
-        Tuple[путь к файлу относительно корня проекта, длительность в секундах]
+    Метрики пула конвертации, запусков ffmpeg, конвертаций WAV через NumPy
+    и записей, сохраненных без перекодирования (passthrough_ratio - их доля среди всех)
     """
+    passthrough = passthrough_stats.snapshot()
+    ffmpeg = ffmpeg_stats.snapshot()
+    pcm_converted = pcm_stats.snapshot()
+    total = passthrough["runs"] + ffmpeg["runs"] + pcm_converted["runs"]
+    return {
+        "converter": settings.AUDIO_FFMPEG_BINARY,
+        "converter_available": ffmpeg_available(),
+        "pool": audio_conversion_pool.metrics(),
+        "ffmpeg": ffmpeg,
+        "pcm": pcm_converted,
+        "passthrough": passthrough,
+        "passthrough_ratio": passthrough["runs"] / total if total else 0.0,
+    }
+
+
+def get_speaker_dir(speaker_name: str) -> Path:
+    """Папка записей спикера wavs/speaker_name (создается при необходимости)"""
     # Получаем абсолютный путь к директории wavs
     # WAVS_DIR задан относительно корня проекта (backend/)
     backend_dir = Path(__file__).parent.parent.parent  # Переходим из app/core/ в backend/
@@ -324,22 +329,60 @@ def save_audio_file(
     # Создаем папку для спикера
     speaker_dir = wavs_dir / sanitize_filename(speaker_name)
     speaker_dir.mkdir(parents=True, exist_ok=True)
+    return speaker_dir
+
+
+def save_uploaded_audio(
+    source: BinaryIO,
+    speaker_name: str,
+    book_name: str,
+    chunk_id: int
+) -> Tuple[str, float]:
+    """
+    Сохраняет загруженный файл в wavs/speaker_name/book_name_chunk_id.wav без чтения в память целиком:
+    загрузка копируется блоками во временный файл в папке спикера, конвертируется
+    из файла в файл, и результат атомарно переименовывается в итоговый файл
+    (при повторной записи старый файл заменяется только готовым новым).
     
-    # Формируем имя файла: book_name_chunk_id.wav
-    book_name_clean = sanitize_filename(book_name)
-    filename = f"{book_name_clean}_{chunk_id}.wav"
-    file_path = speaker_dir / filename
+    Args:
+        source: Файл загрузки (UploadFile.file)
+        speaker_name: Имя спикера
+        book_name: Название книги
+        chunk_id: ID чанка
     
-    # Сохраняем файл
-    with open(file_path, 'wb') as f:
-        f.write(audio_data)
+    Returns:
+        Tuple[путь к файлу относительно корня проекта, длительность в секундах]
+    """
+    speaker_dir = get_speaker_dir(speaker_name)
+    filename = f"{sanitize_filename(book_name)}_{chunk_id}.wav"
+    # Временные файлы рядом с итоговым: переименование в пределах одной файловой системы атомарно
+    token = uuid.uuid4().hex
+    upload_path = speaker_dir / f".{filename}.{token}.upload"
+    output_path = speaker_dir / f".{filename}.{token}.part"
     
-    # Получаем длительность
-    duration = get_audio_duration(audio_data)
+    try:
+        source.seek(0)
+        with open(upload_path, 'wb') as spool:
+            shutil.copyfileobj(source, spool, UPLOAD_CHUNK_SIZE)
+        duration = convert_file_to_wav(upload_path, output_path)
+        os.replace(output_path, speaker_dir / filename)
+    finally:
+        for path in (upload_path, output_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
     
-    # Возвращаем относительный путь от корня проекта
     # Путь будет вида: wavs/speaker_name/book_name_chunk_id.wav
     relative_path = f"{settings.WAVS_DIR}/{sanitize_filename(speaker_name)}/{filename}"
-    
     return relative_path, duration
 
+
+async def store_uploaded_audio(
+    source: BinaryIO,
+    speaker_name: str,
+    book_name: str,
+    chunk_id: int
+) -> Tuple[str, float]:
+    """save_uploaded_audio в пуле конвертации (не блокирует event loop)"""
+    return await audio_conversion_pool.run(save_uploaded_audio, source, speaker_name, book_name, chunk_id)
@@ -0,0 +1,117 @@
+import importlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class CacheBackend(ABC):
+    """
+    Хранилище кэша. Кроме значений с TTL хранит счетчики версий (без TTL):
+    версии входят в ключи записей, и увеличение версии делает устаревшими
+    все записи, построенные на ней, без перебора ключей.
+
+    Реализация для общего кэша нескольких воркеров (например, Redis) подключается
+    через STATISTICS_CACHE_BACKEND="модуль:Класс"; значения должны сериализоваться pickle.
+    """
+
+    name: str = "custom"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Значение по ключу или None (нет или истек TTL)"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Сохранить значение на ttl секунд"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Удалить значение по ключу"""
+
+    @abstractmethod
+    def get_versions(self, keys: List[str]) -> List[int]:
+        """Текущие версии (0, если версия еще не увеличивалась)"""
+
+    @abstractmethod
+    def bump_versions(self, keys: List[str]) -> None:
+        """Увеличить версии на 1"""
+
+    def clear(self) -> None:
+        """Удалить все значения"""
+
+    def metrics(self) -> Dict[str, int]:
+        """Метрики хранилища (количество записей, вытеснения и т.п.)"""
+        return {}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Кэш в памяти процесса: TTL и вытеснение давно не использованных записей (LRU)"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max(max_entries, 1)
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get_versions(self, keys: List[str]) -> List[int]:
+        with self._lock:
+            return [self._versions.get(key, 0) for key in keys]
+
+    def bump_versions(self, keys: List[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._versions[key] = self._versions.get(key, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+
+def load_cache_backend(spec: str, max_entries: int) -> CacheBackend:
+    """Создать хранилище кэша: 'memory' или путь к классу 'модуль:Класс' (создается без аргументов)"""
+    if spec == "memory":
+        return MemoryCacheBackend(max_entries)
+    module_name, class_name = spec.split(":", 1)
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    if not issubclass(backend_class, CacheBackend):
+        raise TypeError(f"{spec} is not a CacheBackend")
+    return backend_class()
@@ -0,0 +1,44 @@
+from datetime import date, datetime, time, timedelta, tzinfo
+from functools import lru_cache
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from app.config import settings
+
+
+@lru_cache(maxsize=None)
+def _zone(name: str) -> Optional[tzinfo]:
+    return ZoneInfo(name) if name else None
+
+
+def get_timezone() -> Optional[tzinfo]:
+    """Часовой пояс границ дня для статистики (None - локальное время сервера)"""
+    return _zone(settings.STATISTICS_TIMEZONE)
+
+
+def now() -> datetime:
+    """Текущее время в часовом поясе статистики (всегда с часовым поясом)"""
+    tz = get_timezone()
+    return datetime.now(tz) if tz else datetime.now().astimezone()
+
+
+def today() -> date:
+    return now().date()
+
+
+def localize(value: datetime) -> datetime:
+    """Дата/время из запроса (без часового пояса) - в часовом поясе статистики (без него - в локальном)"""
+    if value.tzinfo is not None:
+        return value
+    tz = get_timezone()
+    return value.replace(tzinfo=tz) if tz else value.astimezone()
+
+
+def day_start(day: date) -> datetime:
+    """Начало дня (полночь) в часовом поясе статистики"""
+    return localize(datetime.combine(day, time.min))
+
+
+def day_range(day: date) -> Tuple[datetime, datetime]:
+    """Полуоткрытый интервал времени дня: [полночь, следующая полночь)"""
+    return day_start(day), day_start(day + timedelta(days=1))
@@ -0,0 +1,110 @@
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Optional, Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+
+@dataclass
+class RequestQueryStats:
+    """Запросы к БД в рамках одного HTTP запроса"""
+    queries: int = 0
+    query_time: float = 0.0
+    pool_wait: float = 0.0
+
+
+# Статистика текущего HTTP запроса (устанавливается middleware, см. DB_REQUEST_STATS)
+request_query_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+class PoolMetrics:
+    """Ожидание соединений из пула и занятые соединения"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.max_in_use = 0
+
+    def record_checkout(self, wait: float, in_use: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.max_in_use = max(self.max_in_use, in_use)
+
+    def record_timeout(self, wait: float) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def snapshot(self, pool: Pool) -> dict:
+        with self._lock:
+            return {
+                "pool": type(pool).__name__,
+                "size": pool.size() if hasattr(pool, "size") else None,
+                "in_use": pool.checkedout() if hasattr(pool, "checkedout") else None,
+                "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+                "max_in_use": self.max_in_use,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": self.wait_total / self.checkouts * 1000 if self.checkouts else 0.0,
+                "wait_max_ms": self.wait_max * 1000,
+            }
+
+
+# Метрики пулов по имени движка ("sync", "async")
+POOL_METRICS: Dict[str, PoolMetrics] = {}
+
+
+def instrumented_pool_class(base: Type[Pool], name: str) -> Type[Pool]:
+    """
+    Подкласс пула, который измеряет ожидание соединения (в том числе при исчерпании пула).
+    Класс сохраняется при пересоздании пула (engine.dispose()), поэтому метрики не теряются.
+    """
+    metrics = POOL_METRICS.setdefault(name, PoolMetrics())
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = base._do_get(self)
+        except exc.TimeoutError:
+            metrics.record_timeout(time.perf_counter() - started)
+            raise
+        wait = time.perf_counter() - started
+        metrics.record_checkout(wait, self.checkedout())
+        stats = request_query_stats.get()
+        if stats is not None:
+            stats.pool_wait += wait
+        return connection
+
+    return type(f"Instrumented{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Учет количества и времени запросов в статистике текущего HTTP запроса"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        stats = request_query_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.query_time += time.perf_counter() - started
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        # Запрос завершился ошибкой - after_cursor_execute не будет вызван
+        if context.connection is not None and context.connection.info.get("query_started"):
+            context.connection.info["query_started"].pop()
@@ -0,0 +1,170 @@
+"""
+Сөздүк боюнча издөө (Aho–Corasick).
+Сөздүктүн бардык ачкычтарын текстти бир өтүү менен табат жана
+эң узун дал келүүнү биринчи алмаштырат.
+"""
+
+import re
+
+
+class DictionaryMatcher:
+    """
+    Ачкыч → маани сөздүгү үчүн trie + Aho–Corasick автоматы.
+
+    Иштөө убактысы сөздүктүн өлчөмүнөн көз каранды эмес: текст бир жолу өтүлөт,
+    ар бир позицияда ошол жерден башталган ачкычтар узунунан баштап каралат.
+
+    Колдонуу:
+        matcher = DictionaryMatcher({'км': 'километр', 'м': 'метр'})
+        matcher.sub(text)                        # жөнөкөй алмаштыруу
+        matcher.sub(text, resolve=fn, starts=it) # контекст менен (сан, сөз чеги)
+
+    resolve(text, start, end, key) → (span_start, span_end, replacement) же None.
+    Ал дал келүүнүн контекстин текшерет жана алмаштырыла турган аралыкты
+    кеңейте алат (мисалы, бирдиктин алдындагы санды кошуу). Аралык ачкычты
+    өз ичине камтышы керек (span_start <= start).
+    """
+
+    def __init__(self, mapping):
+        self.mapping = dict(mapping)
+
+        # Trie: ар бир абал — {символ: абал}
+        self._goto = [{}]
+        # Ушул абалда бүткөн ачкычтар (бир абалда бирөө гана)
+        self._key = [None]
+        for key in self.mapping:
+            if not key:
+                raise ValueError("DictionaryMatcher: бош ачкыч колдонулбайт")
+            state = 0
+            for char in key:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._key.append(None)
+                state = nxt
+            self._key[state] = key
+
+        # Aho–Corasick: fail шилтемелери жана ар бир абалда бүткөн ачкычтар
+        # (өзүнөн баштап fail чынжыры боюнча, узунунан кыскасына карай)
+        self._fail = [0] * len(self._goto)
+        self._out = [()] * len(self._goto)
+        queue = []
+        for state in self._goto[0].values():
+            queue.append(state)
+            self._out[state] = (self._key[state],) if self._key[state] else ()
+        for state in queue:
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(char, 0)
+                own = (self._key[nxt],) if self._key[nxt] else ()
+                self._out[nxt] = own + self._out[self._fail[nxt]]
+
+        # Ачкычтардын биринчи символдору — тамырдан секирүү үчүн
+        first_chars = ''.join(sorted(self._goto[0]))
+        self._first_chars = re.compile('[' + re.escape(first_chars) + ']') if first_chars else None
+
+    def __len__(self):
+        return len(self.mapping)
+
+    def __contains__(self, key):
+        return key in self.mapping
+
+    def iter_matches(self, text):
+        """
+        Бардык дал келүүлөр (бири-бирин жаап калгандары да): (start, end, key).
+        end боюнча иреттелген, бир end үчүн — узунунан кыскасына.
+        """
+        if self._first_chars is None:
+            return
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        first_chars = self._first_chars
+        state = 0
+        i = 0
+        n = len(text)
+        while i < n:
+            if state == 0:
+                # Тамырда турганда эч бир ачкыч башталбаган символдорду өткөрүп жиберебиз
+                m = first_chars.search(text, i)
+                if m is None:
+                    return
+                i = m.start()
+            char = text[i]
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            i += 1
+            for key in out[state]:
+                yield i - len(key), i, key
+
+    def match_at(self, text, pos):
+        """pos позициясынан башталган ачкычтар, узунунан кыскасына (trie боюнча басуу)."""
+        goto = self._goto
+        keys = []
+        state = 0
+        n = len(text)
+        while pos < n:
+            state = goto[state].get(text[pos])
+            if state is None:
+                break
+            if self._key[state] is not None:
+                keys.append(self._key[state])
+            pos += 1
+        keys.reverse()
+        return keys
+
+    def finditer(self, text, resolve=None, starts=None):
+        """
+        Бири-бирин жаппаган дал келүүлөр, солдон оңго, ар бир позицияда эң узун ачкыч биринчи.
+        (span_start, span_end, replacement) кайтарат.
+
+        starts — ачкыч башталышы мүмкүн болгон позициялар (өсүү тартибинде).
+        Берилсе, trie ошол позициялардан гана басылат (мисалы, сөздүн башы же сандан кийин);
+        берилбесе, бүт текст Aho–Corasick автоматы менен өтүлөт.
+        """
+        if resolve is None:
+            mapping = self.mapping
+
+            def resolve(text, start, end, key):
+                return start, end, mapping[key]
+
+        if starts is None:
+            candidates = {}
+            for start, _, key in self.iter_matches(text):
+                candidates.setdefault(start, []).append(key)
+            positions = sorted(candidates)
+            keys_at = lambda pos: sorted(candidates[pos], key=len, reverse=True)
+        else:
+            positions = starts
+            keys_at = lambda pos: self.match_at(text, pos)
+
+        last_end = 0
+        for pos in positions:
+            if pos < last_end:
+                continue
+            for key in keys_at(pos):
+                resolved = resolve(text, pos, pos + len(key), key)
+                if resolved is None or resolved[0] < last_end:
+                    continue
+                yield resolved
+                last_end = resolved[1]
+                break
+
+    def sub(self, text, resolve=None, starts=None):
+        """Табылган ачкычтарды алмаштыруу (эң узун дал келүү биринчи)."""
+        parts = []
+        last_end = 0
+        for span_start, span_end, replacement in self.finditer(text, resolve, starts):
+            parts.append(text[last_end:span_start])
+            parts.append(replacement)
+            last_end = span_end
+        if not parts:
+            return text
+        parts.append(text[last_end:])
+        return ''.join(parts)
@@ -1,11 +1,16 @@
-from typing import Tuple
+import codecs
+from pathlib import Path
+from typing import Iterable, Iterator
 from fastapi import UploadFile, HTTPException, status
 
 
-async def parse_document(file: UploadFile) -> Tuple[str, str]:
+# Размер блока при потоковом чтении документа (байт)
+READ_BLOCK_SIZE = 1024 * 1024
+
+
+def get_file_type(file: UploadFile) -> str:
     """
-    Парсит загруженный TXT файл и возвращает текст и тип файла.
-    Возвращает: (text, file_type)
+    Проверяет расширение загруженного файла и возвращает тип файла.
     """
     filename = file.filename.lower()
     
@@ -15,17 +20,37 @@ async def parse_document(file: UploadFile) -> Tuple[str, str]:
             detail="Unsupported file type. Only .txt files are supported"
         )
     
-    file_type = 'txt'
-    content = await file.read()
-    text = content.decode('utf-8', errors='ignore')
-    
-    if not text.strip():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Document is empty or could not be parsed"
-        )
-    
-    return text, file_type
+    return 'txt'
 
 
+async def save_upload_file(file: UploadFile, destination: Path, block_size: int = READ_BLOCK_SIZE) -> int:
+    """
+    Сохраняет загруженный файл на диск блоками (без чтения целиком в память).
+    Возвращает количество записанных байт.
+    """
+    size = 0
+    with open(destination, 'wb') as out:
+        while True:
+            block = await file.read(block_size)
+            if not block:
+                break
+            out.write(block)
+            size += len(block)
+    return size
+
 
+def decode_text_blocks(blocks: Iterable[bytes]) -> Iterator[str]:
+    """
+    Декодирует TXT файл, читаемый блоками, и выдает текст по частям.
+    Многобайтовые символы на границе блоков декодируются корректно
+    (результат совпадает с content.decode('utf-8', errors='ignore')).
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+    for block in blocks:
+        text = decoder.decode(block)
+        if text:
+            yield text
+    
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
@@ -5,12 +5,29 @@
 Сандарды, даталарды, убакытты, акча бирдиктерин жана башка форматтарды сөзгө айландырат
 """
 
+import functools
 import re
 import sys
 
+from app.core.dictionary_matcher import DictionaryMatcher
+
+
+# Кыргызча мүчөлөр (аббревиатуралардан кийин: БУУнун, КРнын, ЖЧКга)
+KYRGYZ_SUFFIXES = (
+    'нын', 'нун', 'нүн', 'нин', 'дын', 'дун', 'дүн', 'дин', 'тын', 'тун', 'түн', 'тин',
+    'га', 'ге', 'ка', 'ке', 'го', 'гө', 'ко', 'кө', 'да', 'де', 'та', 'те', 'до', 'дө', 'то', 'тө',
+    'дан', 'ден', 'тан', 'тен', 'дон', 'дөн', 'тон', 'төн', 'н', 'ы', 'и', 'у', 'ү'
+)
+
+# 0–9999 сандары (жөнөкөй жана иреттик) алдын ала эсептелген таблицада сакталат
+NUMBER_TABLE_SIZE = 10000
+
+# Таблицадан тышкаркы сандар жана ондук сандар үчүн LRU кэштин өлчөмү
+NUMBER_CACHE_SIZE = 4096
+
 
 class KyrgyzTextNormalizer:
-    def __init__(self):
+    def __init__(self, use_rule_engine=True, number_cache_size=NUMBER_CACHE_SIZE):
         # Сандар 0-9
         self.ones = ['', 'бир', 'эки', 'үч', 'төрт', 'беш', 'алты', 'жети', 'сегиз', 'тогуз']
         self.tens = ['', 'он', 'жыйырма', 'отуз', 'кырк', 'элүү', 'алтымыш', 'жетимиш', 'сексен', 'токсон']
@@ -254,9 +271,49 @@ class KyrgyzTextNormalizer:
             'г.': '',
             'ш.': 'шаары'
         }
+        
+        # Сандарды сөзгө айландыруу кэштери (таблица + LRU)
+        self._number_words = _MemoizedConverter(self._compute_number_to_words, number_cache_size)
+        self._number_ordinals = _MemoizedConverter(self._compute_number_to_ordinal, number_cache_size)
+        self._decimal_words = _MemoizedConverter(self._compute_decimal_to_words, number_cache_size)
+        self._number_words.fill_table(NUMBER_TABLE_SIZE)
+        self._number_ordinals.fill_table(NUMBER_TABLE_SIZE)
+        self.reset_converter_stats()
+        
+        # Эрежелер таблицасы бир жолу түзүлөт (normalize ар чакырылганда эмес).
+        # use_rule_engine=False — ар бир сөздүк ачкычы өзүнчө re.sub менен
+        # колдонулат (эски ырааттуу режим, салыштыруу үчүн).
+        self.use_rule_engine = use_rule_engine
+        self._rules = self._build_rules()
     
     def number_to_words(self, num):
         """Санды сөзгө айландыруу"""
+        return self._number_words(num)
+    
+    def number_to_ordinal(self, num):
+        """Иреттик сан (порядковое числительное)"""
+        return self._number_ordinals(num)
+    
+    def decimal_to_words(self, num_str):
+        """Ондук санды сөзгө айландыруу (0.5 → нөл бүтүн ондон беш)"""
+        return self._decimal_words(num_str)
+    
+    def converter_stats(self):
+        """Сан айландыргычтардын кэш статистикасы (таблица/кэш колдонулушу, hit rate)"""
+        return {
+            'number_to_words': self._number_words.stats(),
+            'number_to_ordinal': self._number_ordinals.stats(),
+            'decimal_to_words': self._decimal_words.stats(),
+        }
+    
+    def reset_converter_stats(self):
+        """Эсептегичтерди нөлгө коюу (таблицалар сакталат, LRU кэштер тазаланат)"""
+        self._number_words.reset_stats()
+        self._number_ordinals.reset_stats()
+        self._decimal_words.reset_stats()
+    
+    def _compute_number_to_words(self, num):
+        """Санды сөзгө айландыруу (кэшсиз эсептөө)"""
         if num == 0:
             return 'нөл'
         if num < 0:
@@ -304,8 +361,8 @@ class KyrgyzTextNormalizer:
         
         return result.strip()
     
-    def number_to_ordinal(self, num):
-        """Иреттик сан (порядковое числительное)"""
+    def _compute_number_to_ordinal(self, num):
+        """Иреттик сан (кэшсиз эсептөө)"""
         if num >= 1000:
             thousands = num // 1000
             remainder = num % 1000
@@ -332,8 +389,8 @@ class KyrgyzTextNormalizer:
             return self.ordinal_ones[num]
         return self.number_to_words(num) + 'инчи'
     
-    def decimal_to_words(self, num_str):
-        """Ондук санды сөзгө айландыруу (0.5 → нөл бүтүн ондон беш)"""
+    def _compute_decimal_to_words(self, num_str):
+        """Ондук санды сөзгө айландыруу (кэшсиз эсептөө)"""
         # Үтүрдү чекитке алмаштыруу
         num_str = num_str.replace(',', '.')
         
@@ -364,480 +421,750 @@ class KyrgyzTextNormalizer:
         
         return result
     
-    def normalize(self, text):
-        """Негизги нормализация функциясы"""
-        result = text
+    def _apply_harmony(self, word, suffix):
+        """Сингармонизм эрежеси (үндүү + үнсүз гармониясы)"""
+        if not suffix:
+            return word
+        
+        word_lower = word.lower()
+        last_char = word_lower[-1] if word_lower else ''
+        
+        # Үндүүлөр жана үнсүздөр
+        hard_vowels = 'аоуы'
+        soft_vowels = 'эеөүи'
+        all_vowels = hard_vowels + soft_vowels
+        voiceless_consonants = 'кпстфхцчшщ'
+        
+        # Акыркы үндүүнү табуу (үндүү гармониясы үчүн)
+        last_vowel = ''
+        for char in reversed(word_lower):
+            if char in all_vowels:
+                last_vowel = char
+                break
+        
+        is_soft = last_vowel in soft_vowels
+        ends_with_vowel = last_char in all_vowels
+        ends_with_voiceless = last_char in voiceless_consonants
+        
+        # 1. Үнсүз гармониясы (д/т/н тандоо)
+        # Мүчөнүн башындагы үнсүздү оңдоо
+        new_suffix = suffix
+        if suffix and suffix[0] in 'дт':
+            if ends_with_vowel:
+                new_suffix = 'н' + suffix[1:]
+            elif ends_with_voiceless:
+                new_suffix = 'т' + suffix[1:]
+            else:
+                new_suffix = 'д' + suffix[1:]
+        elif suffix and suffix[0] in 'гк':
+            if ends_with_voiceless:
+                new_suffix = 'к' + suffix[1:]
+            else:
+                new_suffix = 'г' + suffix[1:]
+        
+        # 2. Үндүү гармониясы
+        # Тоголок: о, у, ө, ү
+        # Жазык: а, ы, е, и
+        rounded_vowels = 'оуөү'
+        is_rounded = last_vowel in rounded_vowels
+        
+        # Мүчөнүн үндүүлөрүн өзгөртүү
+        result_suffix = ''
+        for char in new_suffix:
+            if char == 'ы':
+                if is_soft:
+                    result_suffix += 'и'
+                elif is_rounded:
+                    result_suffix += 'у'
+                else:
+                    result_suffix += 'ы'
+            elif char == 'а':
+                if is_soft and is_rounded:
+                    result_suffix += 'ө'
+                elif is_soft:
+                    result_suffix += 'е'
+                elif is_rounded:
+                    result_suffix += 'о'
+                else:
+                    result_suffix += 'а'
+            elif char == 'и':
+                if is_rounded:
+                    result_suffix += 'ү'
+                else:
+                    result_suffix += 'и'
+            elif char == 'е':
+                if is_rounded:
+                    result_suffix += 'ө'
+                else:
+                    result_suffix += 'е'
+            else:
+                result_suffix += char
+        
+        return word + result_suffix
+    
+    def _format_date(self, m):
+        """01.02.2024 → эки миң жыйырма төртүнчү жылдын биринчи февралы"""
+        year = self.number_to_ordinal(int(m.group(3)))
+        day = self.number_to_ordinal(int(m.group(1)))
+        month = self.months.get(m.group(2).zfill(2), m.group(2))
+        # Айдын мүчөсү
+        if month.endswith('ь'):
+            month = month[:-1] + 'ы'
+        elif month.endswith('й'):
+            month = month[:-1] + 'ы'
+        else:
+            month = month + 'ы'
+        return f"{year} жылдын {day} {month}"
+    
+    def _fraction_to_words(self, m):
+        """Бөлчөктөр: 5/8 → сегизден беш"""
+        numerator = int(m.group(1))
+        denominator = int(m.group(2))
+        denom_word = self.number_to_words(denominator)
+        numer_word = self.number_to_words(numerator)
+        
+        # Мүчө тандоо (сингармонизм)
+        last_vowel = ''
+        for char in reversed(denom_word):
+            if char in 'аоуыэеөүи':
+                last_vowel = char
+                break
+        
+        if last_vowel in 'өү':
+            suffix = 'дөн'
+        elif last_vowel in 'оу':
+            suffix = 'дон'
+        elif last_vowel in 'еи':
+            suffix = 'ден'
+        else:
+            suffix = 'дан'
+        
+        # Үнсүз гармониясы
+        if denom_word[-1] in 'кпстфхцчшщ':
+            suffix = 'т' + suffix[1:]
+        elif denom_word[-1] in 'аоуыэеөүи':
+            suffix = 'н' + suffix[1:]
+        
+        return f"{denom_word}{suffix} {numer_word}"
+    
+    def _resolve_unit(self, text, start, end, unit):
+        """15 км, 5 кг: бирдиктин алдында сан (боштук менен же боштуксуз), артында сөз чеги"""
+        if not _at_word_boundary(text, end):
+            return None
+        number_end = start
+        while number_end > 0 and text[number_end - 1].isspace():
+            number_end -= 1
+        number_start = _number_start(text, number_end)
+        if number_start is None:
+            return None
+        return number_start, end, f"{self.decimal_to_words(text[number_start:number_end])} {self.units[unit]}"
+    
+    def _resolve_currency(self, text, start, end, symbol):
+        """$20 (сан символдон кийин) же 20$ (сан символдон мурун)"""
+        name = self.currencies[symbol]
+        number_end = _number_end(text, end)
+        if number_end is not None:
+            return start, number_end, f"{self.decimal_to_words(text[end:number_end])} {name}"
+        number_start = _number_start(text, start)
+        if number_start is not None:
+            return number_start, end, f"{self.decimal_to_words(text[number_start:start])} {name}"
+        return None
+    
+    def _resolve_kyrgyz_abbr(self, text, start, end, abbr):
+        """БУУнун, КРнын: аббревиатура + мүчө бүт сөздү түзүшү керек"""
+        word_end = end
+        while word_end < len(text) and _is_word_char(text[word_end]):
+            word_end += 1
+        suffix = text[end:word_end]
+        if suffix and suffix not in KYRGYZ_SUFFIXES:
+            return None
+        if not _at_word_boundary(text, word_end):
+            return None
+        return start, word_end, self._apply_harmony(self.kyrgyz_abbr[abbr], suffix)
+    
+    def _resolve_english_abbr(self, text, start, end, abbr):
+        """USA, EU: аббревиатура бүт сөз болушу керек"""
+        if not _at_word_boundary(text, start) or not _at_word_boundary(text, end):
+            return None
+        return start, end, self.english_abbr[abbr]
+    
+    def _build_rules(self):
+        """
+        Эрежелер таблицасын түзүү.
+        Ар бир паттерн бир жолу компиляцияланат; тартиби normalize() кадамдарынын
+        тартибине дал келет. Сөздүк эрежелери (кыскартуулар, валюталар, бирдиктер,
+        аббревиатуралар) үй-бүлө боюнча бир alternation'го бириктирилет.
+        """
+        rules = []
+        
+        def add(pattern, repl):
+            rules.append(_Rule(pattern, repl))
         
         # === 0. КЫСКАРТУУЛАР (эң биринчи) ===
         # б.з.ч., ж.б., м-н, б-ча ж.б.
         # НЕ используем IGNORECASE чтобы не путать инициалы (К. Алымбеков) с сокращениями (к. = кылым)
-        for abbr, full in sorted(self.short_abbr.items(), key=lambda x: -len(x[0])):
-            result = re.sub(re.escape(abbr), full, result)
+        short_abbr = sorted(self.short_abbr.items(), key=lambda x: -len(x[0]))
+        rules.append(_RuleFamily(
+            sequential=[_Rule(re.escape(abbr), full) for abbr, full in short_abbr],
+            passes=[
+                _MatcherRule(DictionaryMatcher(group))
+                for group in _literal_passes(short_abbr)
+            ]
+        ))
         
         # === 1. ТЕЛЕФОН НОМЕРЛЕРИ ===
         # +996 555 123 456
-        result = re.sub(
+        add(
             r'\+(\d{3})\s*(\d{3})\s*(\d{3})\s*(\d{3})',
-            lambda m: f"плюс {self.number_to_words(int(m.group(1)))} {self.number_to_words(int(m.group(2)))} {self.number_to_words(int(m.group(3)))} {self.number_to_words(int(m.group(4)))}",
-            result
+            lambda m: f"плюс {self.number_to_words(int(m.group(1)))} {self.number_to_words(int(m.group(2)))} {self.number_to_words(int(m.group(3)))} {self.number_to_words(int(m.group(4)))}"
         )
         # 0555 12 34 56
-        result = re.sub(
+        add(
             r'\b0(\d{3})\s+(\d{2})\s+(\d{2})\s+(\d{2})\b',
-            lambda m: f"нөл {self.number_to_words(int(m.group(1)))} {self.number_to_words(int(m.group(2)))} {self.number_to_words(int(m.group(3)))} {self.number_to_words(int(m.group(4)))}",
-            result
+            lambda m: f"нөл {self.number_to_words(int(m.group(1)))} {self.number_to_words(int(m.group(2)))} {self.number_to_words(int(m.group(3)))} {self.number_to_words(int(m.group(4)))}"
         )
         # 123-45-67, 56-56-89 (телефон)
-        result = re.sub(
+        add(
             r'\b(\d{2,3})-(\d{2})-(\d{2})\b',
-            lambda m: f"{self.number_to_words(int(m.group(1)))} {self.number_to_words(int(m.group(2)))} {self.number_to_words(int(m.group(3)))}",
-            result
+            lambda m: f"{self.number_to_words(int(m.group(1)))} {self.number_to_words(int(m.group(2)))} {self.number_to_words(int(m.group(3)))}"
         )
         
         # === 2. EMAIL ЖАНА URL ===
         # test@example.com
-        result = re.sub(
+        add(
             r'\b([a-zA-Z0-9._%+-]+)@([a-zA-Z0-9.-]+)\.([a-zA-Z]{2,})\b',
-            lambda m: f"{m.group(1)} эт белгиси {m.group(2)} чекит {m.group(3)}",
-            result
+            lambda m: f"{m.group(1)} эт белгиси {m.group(2)} чекит {m.group(3)}"
         )
         
         # === 3. ДАТАЛАР ===
         # 2025-жылдын 8-марты
-        result = re.sub(
+        add(
             r'(\d{4})\s*-?\s*жылдын\s+(\d{1,2})\s*-?\s*(\w+)',
-            lambda m: f"{self.number_to_words(int(m.group(1)))} жылдын {self.number_to_words(int(m.group(2)))} {m.group(3)}",
-            result
+            lambda m: f"{self.number_to_words(int(m.group(1)))} жылдын {self.number_to_words(int(m.group(2)))} {m.group(3)}"
         )
         
         # 8-март, 2024-жыл → сегиз март эки миң жыйырма төртүнчү жыл
-        result = re.sub(
+        add(
             r'(\d{1,2})\s*-?\s*(\w+),?\s*(\d{4})\s*[-\.]\s*жыл',
-            lambda m: f"{self.number_to_words(int(m.group(1)))} {m.group(2)} {self.number_to_ordinal(int(m.group(3)))} жыл",
-            result
+            lambda m: f"{self.number_to_words(int(m.group(1)))} {m.group(2)} {self.number_to_ordinal(int(m.group(3)))} жыл"
         )
         
         # 15-август 1991-жыл → он беш август бир миң тогуз жүз токсон биринчи жыл
-        result = re.sub(
+        add(
             r'(\d{1,2})\s*-?\s*(\w+)\s+(\d{4})\s*[-\.]\s*жыл',
-            lambda m: f"{self.number_to_words(int(m.group(1)))} {m.group(2)} {self.number_to_ordinal(int(m.group(3)))} жыл",
-            result
+            lambda m: f"{self.number_to_words(int(m.group(1)))} {m.group(2)} {self.number_to_ordinal(int(m.group(3)))} жыл"
         )
         
         # 2024-08-15 12:30 (ISO формат)
-        result = re.sub(
+        add(
             r'(\d{4})-(\d{2})-(\d{2})\s+(\d{1,2}):(\d{2})',
-            lambda m: f"{self.number_to_words(int(m.group(1)))} жылдын {self.months.get(m.group(2), m.group(2))} айынын {self.number_to_words(int(m.group(3)))} күнү саат {self.number_to_words(int(m.group(4)))} {self.number_to_words(int(m.group(5)))}",
-            result
+            lambda m: f"{self.number_to_words(int(m.group(1)))} жылдын {self.months.get(m.group(2), m.group(2))} айынын {self.number_to_words(int(m.group(3)))} күнү саат {self.number_to_words(int(m.group(4)))} {self.number_to_words(int(m.group(5)))}"
         )
         
         # 01.02.2024 → эки миң жыйырма төртүнчү жылдын биринчи февралы
-        def format_date(m):
-            year = self.number_to_ordinal(int(m.group(3)))
-            day = self.number_to_ordinal(int(m.group(1)))
-            month = self.months.get(m.group(2).zfill(2), m.group(2))
-            # Айдын мүчөсү
-            if month.endswith('ь'):
-                month = month[:-1] + 'ы'
-            elif month.endswith('й'):
-                month = month[:-1] + 'ы'
-            else:
-                month = month + 'ы'
-            return f"{year} жылдын {day} {month}"
-        
-        result = re.sub(r'(\d{1,2})\.(\d{1,2})\.(\d{4})', format_date, result)
-        result = re.sub(r'(\d{1,2})/(\d{1,2})/(\d{4})', format_date, result)
+        add(r'(\d{1,2})\.(\d{1,2})\.(\d{4})', self._format_date)
+        add(r'(\d{1,2})/(\d{1,2})/(\d{4})', self._format_date)
         
         # === 4-5. ЖЫЛДАР (ЖАЛПЫ ПАТТЕРН) ===
         # Эреже: жыл маркери болсо (жыл, жылы, ж, жж, г, гг) → иреттик сан
         
         # Диапазон: 2024-2025-жж, 2024-2025 жж., 2020-2024-жылдары
-        result = re.sub(
+        add(
             r'(\d{4})\s*[-–—]\s*(\d{4})\s*[-.]?\s*(жылдары|жылдар|жж|гг)\.?',
-            lambda m: f"{self.number_to_ordinal(int(m.group(1)))} {self.number_to_ordinal(int(m.group(2)))} жылдар",
-            result
+            lambda m: f"{self.number_to_ordinal(int(m.group(1)))} {self.number_to_ordinal(int(m.group(2)))} жылдар"
         )
         
         # Жалгыз жыл: 2024-жыл, 2024-жылы, 2024ж, 2024 ж., 2024-жж
-        result = re.sub(
+        add(
             r'(\d{4})\s*[-.]?\s*(жылы|жыл|жж|гг|ж|г)\.?(?!\w)',
-            lambda m: f"{self.number_to_ordinal(int(m.group(1)))} жыл" + ('ы' if m.group(2) == 'жылы' else ''),
-            result
+            lambda m: f"{self.number_to_ordinal(int(m.group(1)))} жыл" + ('ы' if m.group(2) == 'жылы' else '')
         )
         
         # === 6. УБАКЫТ ===
         # 18:30да
-        result = re.sub(
+        add(
             r'(\d{1,2}):(\d{2})(да|де|та|те)',
-            lambda m: f"{self.number_to_words(int(m.group(1)))} {self.number_to_words(int(m.group(2)))}{m.group(3)}",
-            result
+            lambda m: f"{self.number_to_words(int(m.group(1)))} {self.number_to_words(int(m.group(2)))}{m.group(3)}"
         )
         
         # 12:45, 00:15
-        result = re.sub(
+        add(
             r'\b(\d{1,2}):(\d{2})\b',
-            lambda m: f"{self.number_to_words(int(m.group(1)))} {self.number_to_words(int(m.group(2)))}",
-            result
+            lambda m: f"{self.number_to_words(int(m.group(1)))} {self.number_to_words(int(m.group(2)))}"
         )
         
         # === 7. АКЧА БИРДИКТЕРИ ===
         # 1.5 млн сом, 2 млрд сом
-        result = re.sub(
+        add(
             r'(\d+(?:[.,]\d+)?)\s*(млн|млрд|трлн)\s*(сом|доллар|евро|рубль)',
-            lambda m: f"{self.decimal_to_words(m.group(1))} {self.large_numbers.get(m.group(2), m.group(2))} {m.group(3)}",
-            result
+            lambda m: f"{self.decimal_to_words(m.group(1))} {self.large_numbers.get(m.group(2), m.group(2))} {m.group(3)}"
         )
         
         # 3 450,50 сом (боштук менен)
-        result = re.sub(
+        add(
             r'(\d{1,3}(?:\s\d{3})*)[,.](\d{2})\s*сом',
-            lambda m: f"{self.number_to_words(int(m.group(1).replace(' ', '')))} сом {self.number_to_words(int(m.group(2)))} тыйын",
-            result
+            lambda m: f"{self.number_to_words(int(m.group(1).replace(' ', '')))} сом {self.number_to_words(int(m.group(2)))} тыйын"
         )
         
         # 1 250 сом (боштук менен чоң сан)
-        result = re.sub(
+        add(
             r'(\d{1,3}(?:\s\d{3})+)\s*сом\b',
-            lambda m: f"{self.number_to_words(int(m.group(1).replace(' ', '')))} сом",
-            result
+            lambda m: f"{self.number_to_words(int(m.group(1).replace(' ', '')))} сом"
         )
         
         # 1500 сом, 1000сом (боштуксуз)
-        result = re.sub(
+        add(
             r'(\d+)\s*сом\b',
-            lambda m: f"{self.number_to_words(int(m.group(1)))} сом",
-            result
+            lambda m: f"{self.number_to_words(int(m.group(1)))} сом"
         )
         
         # $20, 15€, 500₽
-        for symbol, name in self.currencies.items():
-            if symbol in ['$', '€', '₽', '£', '¥', '₸', '₴']:
-                # Символ алдында: $20
-                result = re.sub(
-                    re.escape(symbol) + r'(\d+(?:[.,]\d+)?)',
-                    lambda m, n=name: f"{self.decimal_to_words(m.group(1))} {n}",
-                    result
-                )
-                # Символ артында: 20$
-                result = re.sub(
-                    r'(\d+(?:[.,]\d+)?)' + re.escape(symbol),
-                    lambda m, n=name: f"{self.decimal_to_words(m.group(1))} {n}",
-                    result
-                )
+        # Символ сөздүктөн табылат, сан анын алдында же артында болушу керек.
+        # Бир сан эки символдун ортосунда турса (5$5, €5$), жеке эрежелердин
+        # тартиби маанилүү болот — мындай текстте ырааттуу режимге өтөбүз.
+        currency_symbols = [symbol for symbol in self.currencies
+                            if symbol in ['$', '€', '₽', '£', '¥', '₸', '₴']]
+        currency_class = '[' + ''.join(re.escape(symbol) for symbol in currency_symbols) + ']'
+        currency_sequential = []
+        for symbol in currency_symbols:
+            name = self.currencies[symbol]
+            # Символ алдында: $20
+            currency_sequential.append(_Rule(
+                re.escape(symbol) + r'(\d+(?:[.,]\d+)?)',
+                lambda m, n=name: f"{self.decimal_to_words(m.group(1))} {n}"
+            ))
+            # Символ артында: 20$
+            currency_sequential.append(_Rule(
+                r'(\d+(?:[.,]\d+)?)' + re.escape(symbol),
+                lambda m, n=name: f"{self.decimal_to_words(m.group(1))} {n}"
+            ))
+        rules.append(_RuleFamily(
+            sequential=currency_sequential,
+            passes=[_MatcherRule(
+                DictionaryMatcher({symbol: self.currencies[symbol] for symbol in currency_symbols}),
+                resolve=self._resolve_currency
+            )],
+            conflict=re.compile(
+                currency_class + r'[\d.,]*\d[\d.,]*' + currency_class + '|' +
+                r'\d' + currency_class + r'\d'
+            )
+        ))
         
         # === 8. ИРЕТТИК САНДАР (порядковые) ===
         # Сан-сөз формасы: 2-кылымда, 3-курста, 5-класс → иреттик сан
-        result = re.sub(
+        add(
             r'(\d+)-([а-яөүңА-ЯӨҮҢ]+)',
-            lambda m: f"{self.number_to_ordinal(int(m.group(1)))} {m.group(2)}",
-            result
+            lambda m: f"{self.number_to_ordinal(int(m.group(1)))} {m.group(2)}"
         )
         
         # 1-чи, 5-чи, 10-чу, 21чи, 100-чү
-        result = re.sub(
+        add(
             r'(\d+)\s*-?\s*(чи|чу|чү|нчи|нчу|нчү|ынчы|инчи|үнчү|унчу)',
-            lambda m: self.number_to_ordinal(int(m.group(1))),
-            result
+            lambda m: self.number_to_ordinal(int(m.group(1)))
         )
         
         # === 9. ЖАШ, КЛАСС (боштуксуз) ===
         # 25жашта, 5чи класста
-        result = re.sub(
+        add(
             r'(\d+)жашта',
-            lambda m: f"{self.number_to_words(int(m.group(1)))} жашта",
-            result
+            lambda m: f"{self.number_to_words(int(m.group(1)))} жашта"
         )
-        result = re.sub(
+        add(
             r'(\d+)(чи|чу|чү)\s*класста',
-            lambda m: f"{self.number_to_ordinal(int(m.group(1)))} класста",
-            result
+            lambda m: f"{self.number_to_ordinal(int(m.group(1)))} класста"
         )
         
         # 30мин шейин
-        result = re.sub(
+        add(
             r'(\d+)(мин|мүн|сек|саат)\b',
-            lambda m: f"{self.number_to_words(int(m.group(1)))} {self.units.get(m.group(2), m.group(2))}",
-            result
+            lambda m: f"{self.number_to_words(int(m.group(1)))} {self.units.get(m.group(2), m.group(2))}"
         )
         
         # === 10. КУРСТАР ===
         # 3-курста
-        result = re.sub(
+        add(
             r'(\d+)\s*-?\s*курста',
-            lambda m: f"{self.number_to_ordinal(int(m.group(1)))} курста",
-            result
+            lambda m: f"{self.number_to_ordinal(int(m.group(1)))} курста"
         )
         
         # === 11. ӨЛЧӨМ БИРДИКТЕРИ ===
         # 15 км, 5 кг, 100 м²
-        for unit, name in sorted(self.units.items(), key=lambda x: -len(x[0])):
-            result = re.sub(
-                r'(\d+(?:[.,]\d+)?)\s*' + re.escape(unit) + r'\b',
-                lambda m, n=name: f"{self.decimal_to_words(m.group(1))} {n}",
-                result
-            )
+        # Бирдиктер сандан кийинки позициялардан гана изделет; бир позицияда эң узун бирдик утат
+        units = sorted(self.units.items(), key=lambda x: -len(x[0]))
+        rules.append(_RuleFamily(
+            sequential=[
+                _Rule(
+                    r'(\d+(?:[.,]\d+)?)\s*' + re.escape(unit) + r'\b',
+                    lambda m, n=name: f"{self.decimal_to_words(m.group(1))} {n}"
+                )
+                for unit, name in units
+            ],
+            passes=[_MatcherRule(
+                DictionaryMatcher(units),
+                resolve=self._resolve_unit,
+                starts=re.compile(r'\d\s*(?=[' + re.escape(''.join({unit[0] for unit, _ in units})) + '])'),
+                start_group_end=True
+            )]
+        ))
         
         # === 12. ПАЙЫЗ ДИАПАЗОНУ ===
         # 1—2% → бир эки пайыз
-        result = re.sub(
+        add(
             r'(\d+(?:[.,]\d+)?)\s*[-–—]\s*(\d+(?:[.,]\d+)?)\s*%',
-            lambda m: f"{self.decimal_to_words(m.group(1))} {self.decimal_to_words(m.group(2))} пайыз",
-            result
+            lambda m: f"{self.decimal_to_words(m.group(1))} {self.decimal_to_words(m.group(2))} пайыз"
         )
         
         # === 13. ПАЙЫЗ ===
         # 5%
-        result = re.sub(
+        add(
             r'(\d+(?:[.,]\d+)?)\s*%',
-            lambda m: f"{self.decimal_to_words(m.group(1))} пайыз",
-            result
+            lambda m: f"{self.decimal_to_words(m.group(1))} пайыз"
         )
         
         # === 14. МАТЕМАТИКА (кемитүү) ===
         # 45-56 → кырк беш кемитүү элүү алты
-        result = re.sub(
+        add(
             r'\b(\d+)\s*[-–—]\s*(\d+)\b',
-            lambda m: f"{self.number_to_words(int(m.group(1)))} кемитүү {self.number_to_words(int(m.group(2)))}",
-            result
+            lambda m: f"{self.number_to_words(int(m.group(1)))} кемитүү {self.number_to_words(int(m.group(2)))}"
         )
         
         # === 15. МАТЕМАТИКА ===
         # Теңдик менен: 3×4=12, 5+3=8
-        result = re.sub(
+        add(
             r'(\d+)\s*[×xXхХ*]\s*(\d+)\s*=\s*(\d+)',
-            lambda m: f"{self.number_to_words(int(m.group(1)))} көбөйтүү {self.number_to_words(int(m.group(2)))} барабар {self.number_to_words(int(m.group(3)))}",
-            result
+            lambda m: f"{self.number_to_words(int(m.group(1)))} көбөйтүү {self.number_to_words(int(m.group(2)))} барабар {self.number_to_words(int(m.group(3)))}"
         )
-        result = re.sub(
+        add(
             r'(\d+)\s*\+\s*(\d+)\s*=\s*(\d+)',
-            lambda m: f"{self.number_to_words(int(m.group(1)))} кошуу {self.number_to_words(int(m.group(2)))} барабар {self.number_to_words(int(m.group(3)))}",
-            result
+            lambda m: f"{self.number_to_words(int(m.group(1)))} кошуу {self.number_to_words(int(m.group(2)))} барабар {self.number_to_words(int(m.group(3)))}"
         )
-        result = re.sub(
+        add(
             r'(\d+)\s*[-−]\s*(\d+)\s*=\s*(\d+)',
-            lambda m: f"{self.number_to_words(int(m.group(1)))} кемитүү {self.number_to_words(int(m.group(2)))} барабар {self.number_to_words(int(m.group(3)))}",
-            result
+            lambda m: f"{self.number_to_words(int(m.group(1)))} кемитүү {self.number_to_words(int(m.group(2)))} барабар {self.number_to_words(int(m.group(3)))}"
         )
-        result = re.sub(
+        add(
             r'(\d+)\s*/\s*(\d+)\s*=\s*(\d+)',
-            lambda m: f"{self.number_to_words(int(m.group(1)))} бөлүү {self.number_to_words(int(m.group(2)))} барабар {self.number_to_words(int(m.group(3)))}",
-            result
+            lambda m: f"{self.number_to_words(int(m.group(1)))} бөлүү {self.number_to_words(int(m.group(2)))} барабар {self.number_to_words(int(m.group(3)))}"
         )
         
         # Теңдиксиз: 45+65, 44*56, 56/56
-        result = re.sub(
+        add(
             r'(\d+)\s*\+\s*(\d+)',
-            lambda m: f"{self.number_to_words(int(m.group(1)))} кошуу {self.number_to_words(int(m.group(2)))}",
-            result
+            lambda m: f"{self.number_to_words(int(m.group(1)))} кошуу {self.number_to_words(int(m.group(2)))}"
         )
-        result = re.sub(
+        add(
             r'(\d+)\s*[×xXхХ*]\s*(\d+)',
-            lambda m: f"{self.number_to_words(int(m.group(1)))} көбөйтүү {self.number_to_words(int(m.group(2)))}",
-            result
+            lambda m: f"{self.number_to_words(int(m.group(1)))} көбөйтүү {self.number_to_words(int(m.group(2)))}"
         )
-        result = re.sub(
+        add(
             r'(\d+)\s*/\s*(\d+)',
-            lambda m: f"{self.number_to_words(int(m.group(1)))} бөлүү {self.number_to_words(int(m.group(2)))}",
-            result
+            lambda m: f"{self.number_to_words(int(m.group(1)))} бөлүү {self.number_to_words(int(m.group(2)))}"
         )
         
         # === 16. АББРЕВИАТУРАЛАР ===
         # Кыргызча аббревиатуралар (мүчөлөр менен: БУУнун, КРнын, ЖЧКга)
-        # Сингармонизм эрежеси (үндүү + үнсүз гармониясы)
-        def apply_harmony(word, suffix):
-            if not suffix:
-                return word
-            
-            word_lower = word.lower()
-            last_char = word_lower[-1] if word_lower else ''
-            
-            # Үндүүлөр жана үнсүздөр
-            hard_vowels = 'аоуы'
-            soft_vowels = 'эеөүи'
-            all_vowels = hard_vowels + soft_vowels
-            voiced_consonants = 'бвгджзйлмнрңь'
-            voiceless_consonants = 'кпстфхцчшщ'
-            
-            # Акыркы үндүүнү табуу (үндүү гармониясы үчүн)
-            last_vowel = ''
-            for char in reversed(word_lower):
-                if char in all_vowels:
-                    last_vowel = char
-                    break
-            
-            is_soft = last_vowel in soft_vowels
-            ends_with_vowel = last_char in all_vowels
-            ends_with_voiceless = last_char in voiceless_consonants
-            
-            # 1. Үнсүз гармониясы (д/т/н тандоо)
-            consonant_map = {
-                # Үндүүдөн кийин → н
-                ('д', True): 'н', ('т', True): 'н',
-                # Үнсүз жумшактан кийин → д
-                ('т', False): 'д',
-                # Каткалаң үнсүздөн кийин → т
-                ('д', False): 'т' if ends_with_voiceless else 'д',
-                ('н', False): 'д' if not ends_with_voiceless else 'т',
-            }
-            
-            # Мүчөнүн башындагы үнсүздү оңдоо
-            new_suffix = suffix
-            if suffix and suffix[0] in 'дт':
-                if ends_with_vowel:
-                    new_suffix = 'н' + suffix[1:]
-                elif ends_with_voiceless:
-                    new_suffix = 'т' + suffix[1:]
-                else:
-                    new_suffix = 'д' + suffix[1:]
-            elif suffix and suffix[0] in 'гк':
-                if ends_with_voiceless:
-                    new_suffix = 'к' + suffix[1:]
-                else:
-                    new_suffix = 'г' + suffix[1:]
-            
-            # 2. Үндүү гармониясы 
-            # Тоголок: о, у, ө, ү
-            # Жазык: а, ы, е, и
-            rounded_vowels = 'оуөү'
-            is_rounded = last_vowel in rounded_vowels
-            
-            # Мүчөнүн үндүүлөрүн өзгөртүү
-            result_suffix = ''
-            for char in new_suffix:
-                if char == 'ы':
-                    if is_soft:
-                        result_suffix += 'и'
-                    elif is_rounded:
-                        result_suffix += 'у'
-                    else:
-                        result_suffix += 'ы'
-                elif char == 'а':
-                    if is_soft and is_rounded:
-                        result_suffix += 'ө'
-                    elif is_soft:
-                        result_suffix += 'е'
-                    elif is_rounded:
-                        result_suffix += 'о'
-                    else:
-                        result_suffix += 'а'
-                elif char == 'и':
-                    if is_rounded:
-                        result_suffix += 'ү'
-                    else:
-                        result_suffix += 'и'
-                elif char == 'е':
-                    if is_rounded:
-                        result_suffix += 'ө'
-                    else:
-                        result_suffix += 'е'
-                else:
-                    result_suffix += char
-            
-            return word + result_suffix
-        
-        kyrgyz_suffixes = r'(нын|нун|нүн|нин|дын|дун|дүн|дин|тын|тун|түн|тин|га|ге|ка|ке|го|гө|ко|кө|да|де|та|те|до|дө|то|тө|дан|ден|тан|тен|дон|дөн|тон|төн|н|ы|и|у|ү)?'
-        for abbr, full in self.kyrgyz_abbr.items():
-            result = re.sub(r'\b' + re.escape(abbr) + kyrgyz_suffixes + r'\b', 
-                          lambda m, f=full: apply_harmony(f, m.group(1)), 
-                          result)
+        # \b...\b чектери бүт сөздү гана кармайт, ошондуктан ар бир сөзгө
+        # бир гана аббревиатура дал келет жана тартип маанилүү эмес.
+        # Trie сөздүн башынан гана басылат.
+        kyrgyz_suffixes = '(' + '|'.join(KYRGYZ_SUFFIXES) + ')?'
+        rules.append(_RuleFamily(
+            sequential=[
+                _Rule(
+                    r'\b' + re.escape(abbr) + kyrgyz_suffixes + r'\b',
+                    lambda m, f=full: self._apply_harmony(f, m.group(1))
+                )
+                for abbr, full in self.kyrgyz_abbr.items()
+            ],
+            passes=[_MatcherRule(
+                DictionaryMatcher(self.kyrgyz_abbr),
+                resolve=self._resolve_kyrgyz_abbr,
+                starts=_word_starts(self.kyrgyz_abbr)
+            )]
+        ))
         
         # Англисче аббревиатуралар
-        for abbr, full in self.english_abbr.items():
-            result = re.sub(r'\b' + re.escape(abbr) + r'\b', full, result)
+        rules.append(_RuleFamily(
+            sequential=[
+                _Rule(r'\b' + re.escape(abbr) + r'\b', full)
+                for abbr, full in self.english_abbr.items()
+            ],
+            passes=[_MatcherRule(
+                DictionaryMatcher(self.english_abbr),
+                resolve=self._resolve_english_abbr,
+                starts=_word_starts(self.english_abbr)
+            )]
+        ))
         
         # === 17. АДРЕСТЕР ===
         # г. Бишкек
-        result = re.sub(r'\bг\.\s*', '', result)
+        add(r'\bг\.\s*', '')
         # 7-кичи район
-        result = re.sub(
+        add(
             r'(\d+)\s*-?\s*кичи\s*район',
-            lambda m: f"{self.number_to_ordinal(int(m.group(1)))} кичи район",
-            result
+            lambda m: f"{self.number_to_ordinal(int(m.group(1)))} кичи район"
         )
         # 54/1 (үй номуру)
         # Бөлчөктөр: 5/8 → сегизден беш
-        def fraction_to_words(m):
-            numerator = int(m.group(1))
-            denominator = int(m.group(2))
-            denom_word = self.number_to_words(denominator)
-            numer_word = self.number_to_words(numerator)
-            
-            # Мүчө тандоо (сингармонизм)
-            last_vowel = ''
-            for char in reversed(denom_word):
-                if char in 'аоуыэеөүи':
-                    last_vowel = char
-                    break
-            
-            if last_vowel in 'өү':
-                suffix = 'дөн'
-            elif last_vowel in 'оу':
-                suffix = 'дон'
-            elif last_vowel in 'еи':
-                suffix = 'ден'
-            else:
-                suffix = 'дан'
-            
-            # Үнсүз гармониясы
-            if denom_word[-1] in 'кпстфхцчшщ':
-                suffix = 'т' + suffix[1:]
-            elif denom_word[-1] in 'аоуыэеөүи':
-                suffix = 'н' + suffix[1:]
-            
-            return f"{denom_word}{suffix} {numer_word}"
-        
-        result = re.sub(r'\b(\d+)/(\d+)\b', fraction_to_words, result)
+        add(r'\b(\d+)/(\d+)\b', self._fraction_to_words)
         
         # === 18. АПОСТРОФ МЕНЕН СӨЗДӨР ===
         # Google'га, GitHub'тан
-        result = re.sub(r"(\w+)'(\w+)", r'\1\2', result)
+        add(r"(\w+)'(\w+)", r'\1\2')
         
         # === 19. АТАЙЫН СИМВОЛДОР ===
         # Тырмакчалар
-        result = re.sub(r'[«»„"""]', '', result)
-        result = re.sub(r"[''‚']", '', result)
+        add(r'[«»„"""]', '')
+        add(r"[''‚']", '')
         
         # №
-        result = re.sub(
+        add(
             r'№\s*(\d+)',
-            lambda m: f"номур {self.number_to_words(int(m.group(1)))}",
-            result
+            lambda m: f"номур {self.number_to_words(int(m.group(1)))}"
         )
         
         # Жалгыз турган символдор
-        result = re.sub(r'(?<=[,\s])%(?=[,\s]|$)', 'пайыз', result)
-        result = re.sub(r'(?<=[,\s])№(?=[,\s]|$)', 'номур', result)
-        result = re.sub(r'(?<=[,\s])@(?=[,\s]|$)', 'эт белгиси', result)
-        result = re.sub(r'(?<=[,\s])&(?=[,\s]|$)', 'жана', result)
+        add(r'(?<=[,\s])%(?=[,\s]|$)', 'пайыз')
+        add(r'(?<=[,\s])№(?=[,\s]|$)', 'номур')
+        add(r'(?<=[,\s])@(?=[,\s]|$)', 'эт белгиси')
+        add(r'(?<=[,\s])&(?=[,\s]|$)', 'жана')
         
         # === 20. ОНДУК САНДАР ===
         # 3.14, 1,25, 0,001
-        result = re.sub(
+        add(
             r'\b(\d+[.,]\d+)\b',
-            lambda m: self.decimal_to_words(m.group(1)),
-            result
+            lambda m: self.decimal_to_words(m.group(1))
         )
         
         # === 21. БОШТУК МЕНЕН ЖАЗЫЛГАН ЧОҢ САНДАР ===
         # 1 234 567
-        def replace_spaced_number(match):
-            num_str = match.group(0).replace(' ', '')
-            return self.number_to_words(int(num_str))
-        result = re.sub(r'\b\d{1,3}(?:\s\d{3})+\b', replace_spaced_number, result)
+        add(
+            r'\b\d{1,3}(?:\s\d{3})+\b',
+            lambda m: self.number_to_words(int(m.group(0).replace(' ', '')))
+        )
         
         # === 22. ЖӨНӨКӨЙ САНДАР ===
-        result = re.sub(
+        add(
             r'\b(\d+)\b',
-            lambda m: self.number_to_words(int(m.group(1))),
-            result
+            lambda m: self.number_to_words(int(m.group(1)))
         )
         
         # === 23. ТАЗАЛОО ===
         # Ашыкча боштуктарды алып салуу
-        result = re.sub(r'\s+', ' ', result)
-        result = result.strip()
+        add(r'\s+', ' ')
         
-        return result
+        return rules
+    
+    def normalize(self, text):
+        """Негизги нормализация функциясы"""
+        result = text
+        
+        if self.use_rule_engine:
+            for rule in self._rules:
+                result = rule.apply(result)
+        else:
+            for rule in self._rules:
+                result = rule.apply_sequential(result)
+        
+        return result.strip()
+
+
+class _MemoizedConverter:
+    """
+    Сан айландыргычтын кэши: 0..N-1 үчүн алдын ала эсептелген таблица,
+    калган маанилер үчүн чектелген LRU кэш. Колдонулуш эсептегичтери менен.
+    """
+    
+    def __init__(self, compute, maxsize):
+        self._compute = compute
+        self._cached = functools.lru_cache(maxsize=maxsize)(compute)
+        self._table = []
+        self.table_hits = 0
+    
+    def fill_table(self, size):
+        """
+        0..size-1 таблицасын толтуруу. Рекурсивдүү чакыруулар дайыма кичирээк санга
+        кайрылат, ошондуктан алар мурунку таблица саптарынан алынат.
+        """
+        table = self._table
+        for num in range(len(table), size):
+            table.append(self._compute(num))
+    
+    def __call__(self, key):
+        table = self._table
+        if type(key) is int and 0 <= key < len(table):
+            self.table_hits += 1
+            return table[key]
+        return self._cached(key)
+    
+    def stats(self):
+        info = self._cached.cache_info()
+        calls = self.table_hits + info.hits + info.misses
+        return {
+            'calls': calls,
+            'table_hits': self.table_hits,
+            'cache_hits': info.hits,
+            'misses': info.misses,
+            'cache_size': info.currsize,
+            'hit_rate': (self.table_hits + info.hits) / calls if calls else 0.0,
+        }
+    
+    def reset_stats(self):
+        # lru_cache эсептегичтери кэш менен бирге гана тазаланат; таблица сакталат
+        self.table_hits = 0
+        self._cached.cache_clear()
+
+
+class _Rule:
+    """Бир жолу компиляцияланган паттерн жана анын алмаштыруусу"""
+    __slots__ = ('pattern', 'repl')
+
+    def __init__(self, pattern, repl):
+        self.pattern = re.compile(pattern)
+        self.repl = repl
+
+    def apply(self, text):
+        return self.pattern.sub(self.repl, text)
+
+    apply_sequential = apply
+
+
+class _MatcherRule:
+    """
+    DictionaryMatcher аркылуу сөздүк эрежеси.
+    starts — ачкыч башталышы мүмкүн болгон позицияларды берген паттерн
+    (start_group_end=True болсо, позиция — дал келүүнүн аягы).
+    """
+    __slots__ = ('matcher', 'resolve', 'starts', 'start_group_end')
+    
+    def __init__(self, matcher, resolve=None, starts=None, start_group_end=False):
+        self.matcher = matcher
+        self.resolve = resolve
+        self.starts = starts
+        self.start_group_end = start_group_end
+    
+    def apply(self, text):
+        starts = None
+        if self.starts is not None:
+            if self.start_group_end:
+                starts = (m.end() for m in self.starts.finditer(text))
+            else:
+                starts = (m.start() for m in self.starts.finditer(text))
+        return self.matcher.sub(text, resolve=self.resolve, starts=starts)
+    
+    apply_sequential = apply
+
+
+class _RuleFamily:
+    """
+    Сөздүк эрежелеринин үй-бүлөсү.
+
+    sequential — ар бир ачкыч үчүн өзүнчө эреже, баштапкы тартипте (эталон).
+    passes — бириккен alternation'дор; ар бир pass текстти бир жолу өтөт.
+    conflict — бул паттерн текстте табылса, бириккен режим ырааттуу режимден
+    айырмаланышы мүмкүн, ошондуктан sequential колдонулат.
+    """
+    __slots__ = ('sequential', 'passes', 'conflict')
+
+    def __init__(self, sequential, passes, conflict=None):
+        self.sequential = sequential
+        self.passes = passes
+        self.conflict = conflict
+
+    def apply(self, text):
+        if self.conflict is not None and self.conflict.search(text):
+            return self.apply_sequential(text)
+        for rule in self.passes:
+            text = rule.apply(text)
+        return text
+
+    def apply_sequential(self, text):
+        for rule in self.sequential:
+            text = rule.apply(text)
+        return text
+
+
+def _is_word_char(char):
+    """re модулундагы \\w менен бирдей"""
+    return char.isalnum() or char == '_'
+
+
+def _at_word_boundary(text, pos):
+    """re модулундагы \\b менен бирдей"""
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
+
+
+def _number_start(text, end):
+    """
+    end позициясында бүткөн \\d+(?:[.,]\\d+)? санынын эң сол башы, же None.
+    """
+    start = end
+    while start > 0 and text[start - 1].isdecimal():
+        start -= 1
+    if start == end:
+        return None
+    if start >= 2 and text[start - 1] in '.,' and text[start - 2].isdecimal():
+        start -= 1
+        while start > 0 and text[start - 1].isdecimal():
+            start -= 1
+    return start
+
+
+def _number_end(text, start):
+    """
+    start позициясынан башталган \\d+(?:[.,]\\d+)? санынын аягы (ач көз), же None.
+    """
+    end = start
+    while end < len(text) and text[end].isdecimal():
+        end += 1
+    if end == start:
+        return None
+    if end + 1 < len(text) and text[end] in '.,' and text[end + 1].isdecimal():
+        end += 1
+        while end < len(text) and text[end].isdecimal():
+            end += 1
+    return end
+
+
+def _word_starts(keys):
+    """Ачкычтын биринчи тамгасы менен башталган сөздөрдүн баштары"""
+    first_chars = ''.join(sorted({key[0] for key in keys}))
+    return re.compile(r'\b[' + re.escape(first_chars) + ']')
+
+
+def _overlaps(left, right):
+    """left'тин аягы right'тын башы менен жарым-жартылай дал келеби"""
+    return any(left.endswith(right[:i]) for i in range(1, min(len(left), len(right))))
+
+
+def _literal_passes(items):
+    """
+    Ырааттуу түрдө колдонулган литерал алмаштырууларды (ачкыч, маани) pass'тарга бөлөт.
+
+    Бир pass'тагы alternation солдон оңго бир жолу өтөт, ал эми ырааттуу режимде
+    мурунку ачкыч бүт текстте биринчи алмаштырылат. Натыйжа бирдей болушу үчүн
+    pass ичинде:
+    - кийинки ачкыч мурункуга солдон кирип кетпеши керек (жж. / ж.б. → "жж.б.");
+    - мурунку ачкычтын мааниси кийинки ачкыч үчүн жаңы дал келүү түзбөшү керек.
+    Шарт бузулса, жаңы pass башталат.
+    """
+    passes = []
+    current = []
+    for key, value in items:
+        clash = any(
+            _overlaps(key, prev_key)
+            or key in prev_value or (prev_value and prev_value in key)
+            or _overlaps(prev_value, key) or _overlaps(key, prev_value)
+            for prev_key, prev_value in current
+        )
+        if clash:
+            passes.append(current)
+            current = []
+        current.append((key, value))
+    if current:
+        passes.append(current)
+    return passes
 
 
 def main():
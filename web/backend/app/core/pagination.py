@@ -0,0 +1,40 @@
+import base64
+import json
+from fastapi import HTTPException, status
+
+
+def encode_chunk_cursor(book_id: int, order_index: int) -> str:
+    """
+    Курсор для keyset-пагинации чанков: позиция (book_id, order_index) последнего
+    чанка страницы. Для клиента это непрозрачная строка.
+    """
+    payload = json.dumps({"b": book_id, "o": order_index}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_chunk_cursor(cursor: str, book_id: int) -> int:
+    """Разбирает курсор и возвращает order_index, после которого начинается страница"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        cursor_book_id = int(payload["b"])
+        order_index = int(payload["o"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    
+    if cursor_book_id != book_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor does not belong to this book",
+        )
+    return order_index
+
+
+def next_chunk_cursor(book_id: int, chunks: list, limit: int) -> str | None:
+    """Курсор следующей страницы или None, если страница последняя"""
+    if len(chunks) < limit or not chunks:
+        return None
+    return encode_chunk_cursor(book_id, chunks[-1].order_index)
@@ -0,0 +1,311 @@
+import struct
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from math import gcd
+from typing import BinaryIO, Optional, Tuple
+
+import numpy as np
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Поддерживаемые битности выходного WAV
+OUTPUT_BIT_DEPTHS = (8, 16, 24, 32)
+
+# Кадров в одном блоке обработки (~1.4 с при 48 кГц)
+BLOCK_FRAMES = 65536
+
+# Частоты дискретизации, которые конвертируются через NumPy. Частота из заголовка загрузки
+# не проверена: при других частотах (и несократимом отношении, больше MAX_RESAMPLE_FACTOR)
+# фильтр ресемплинга и время расчета растут с частотой, такие файлы конвертирует ffmpeg
+MIN_SAMPLE_RATE = 8000
+MAX_SAMPLE_RATE = 192000
+MAX_RESAMPLE_FACTOR = 1000
+
+
+class PcmFormatError(ValueError):
+    """Данные не являются WAV или формат не поддерживается (сжатый кодек, неизвестная битность)"""
+
+
+@dataclass
+class WavInfo:
+    """Параметры WAV из заголовка (fmt и data)"""
+    format_tag: int  # Для WAVE_FORMAT_EXTENSIBLE - формат из SubFormat
+    channels: int
+    sample_rate: int
+    bits_per_sample: int
+    block_align: int
+    data_offset: int
+    data_size: int
+    extensible: bool = False
+
+    @property
+    def is_pcm(self) -> bool:
+        """Несжатые отсчеты (целые или float): количество кадров вычисляется из размера data"""
+        return self.format_tag in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT)
+
+    @property
+    def sample_width(self) -> int:
+        """Байт на отсчет одного канала"""
+        return self.block_align // self.channels
+
+    @property
+    def frames(self) -> int:
+        return self.data_size // self.block_align
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.sample_rate
+
+
+def parse_wav_header(data: bytes) -> WavInfo:
+    """
+    Разбирает чанки RIFF/WAVE до начала данных, сами отсчеты не читаются.
+    Размер data ограничивается фактической длиной данных: у WAV, записанного
+    в поток, размеры в заголовке могут быть 0 или 0xFFFFFFFF.
+    """
+    if len(data) < 12 or data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        raise PcmFormatError("Not a RIFF/WAVE file")
+
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        chunk_size = struct.unpack_from('<I', data, offset + 4)[0]
+        body = offset + 8
+        if chunk_id == b'fmt ':
+            if chunk_size < 16 or body + 16 > len(data):
+                raise PcmFormatError("Truncated fmt chunk")
+            format_tag, channels, sample_rate, _, block_align, bits = struct.unpack_from('<HHIIHH', data, body)
+            extensible = format_tag == WAVE_FORMAT_EXTENSIBLE
+            if extensible:
+                # cbSize, wValidBitsPerSample, dwChannelMask, SubFormat (GUID, первые 2 байта - код формата)
+                if chunk_size < 40 or body + 26 > len(data):
+                    raise PcmFormatError("Truncated WAVE_FORMAT_EXTENSIBLE header")
+                format_tag = struct.unpack_from('<H', data, body + 24)[0]
+            fmt = (format_tag, channels, sample_rate, bits, block_align, extensible)
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise PcmFormatError("data chunk before fmt chunk")
+            format_tag, channels, sample_rate, bits, block_align, extensible = fmt
+            if not channels or not sample_rate or not block_align or block_align % channels:
+                raise PcmFormatError("Invalid fmt chunk")
+            return WavInfo(
+                format_tag=format_tag,
+                channels=channels,
+                sample_rate=sample_rate,
+                bits_per_sample=bits,
+                block_align=block_align,
+                data_offset=body,
+                data_size=min(chunk_size, len(data) - body),
+                extensible=extensible,
+            )
+        offset = body + chunk_size + (chunk_size & 1)
+
+    raise PcmFormatError("No data chunk")
+
+
+def decode_samples(data, info: WavInfo, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+    """
+    Кадры [start, stop) WAV в float32 в диапазоне [-1, 1), форма (кадры, каналы).
+    Буфер читается через np.frombuffer без копирования, копия создается только при переводе в float.
+    """
+    stop = info.frames if stop is None else min(stop, info.frames)
+    start = max(start, 0)
+    width = info.sample_width
+    count = max(stop - start, 0) * info.channels
+    offset = info.data_offset + start * info.block_align
+    if info.format_tag == WAVE_FORMAT_PCM:
+        if width == 1:
+            raw = np.frombuffer(data, dtype=np.uint8, count=count, offset=offset)
+            samples = (raw.astype(np.float32) - 128.0) / 128.0
+        elif width == 2:
+            raw = np.frombuffer(data, dtype='<i2', count=count, offset=offset)
+            samples = raw.astype(np.float32) / 32768.0
+        elif width == 3:
+            raw = np.frombuffer(data, dtype=np.uint8, count=count * 3, offset=offset).reshape(-1, 3)
+            # Три байта little-endian в старшие байты int32: знак расширяется сдвигом
+            value = (raw[:, 0].astype(np.int32) << 8) | (raw[:, 1].astype(np.int32) << 16) | (raw[:, 2].astype(np.int32) << 24)
+            samples = (value >> 8).astype(np.float32) / 8388608.0
+        elif width == 4:
+            raw = np.frombuffer(data, dtype='<i4', count=count, offset=offset)
+            samples = (raw.astype(np.float64) / 2147483648.0).astype(np.float32)
+        else:
+            raise PcmFormatError(f"Unsupported PCM sample width: {width} bytes")
+    elif info.format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        if width == 4:
+            samples = np.frombuffer(data, dtype='<f4', count=count, offset=offset).astype(np.float32)
+        elif width == 8:
+            samples = np.frombuffer(data, dtype='<f8', count=count, offset=offset).astype(np.float32)
+        else:
+            raise PcmFormatError(f"Unsupported float sample width: {width} bytes")
+    else:
+        raise PcmFormatError(f"Unsupported WAV format: 0x{info.format_tag:04x}")
+    return samples.reshape(-1, info.channels)
+
+
+def remix_channels(samples: np.ndarray, channels: int) -> np.ndarray:
+    """Приводит количество каналов: даунмикс усреднением отсчетов каналов, моно дублируется"""
+    if samples.shape[1] == channels:
+        return samples
+    mono = samples.mean(axis=1, keepdims=True, dtype=np.float32)
+    if channels == 1:
+        return mono
+    return np.repeat(mono, channels, axis=1)
+
+
+def _read_frames(data, info: WavInfo, channels: int, start: int, stop: int) -> np.ndarray:
+    """Кадры [start, stop) с нужным количеством каналов; за границами данных - нули"""
+    block = np.zeros((stop - start, channels), dtype=np.float32)
+    first, last = max(start, 0), min(stop, info.frames)
+    if first < last:
+        block[first - start:last - start] = remix_channels(decode_samples(data, info, first, last), channels)
+    return block
+
+
+@lru_cache(maxsize=32)
+def _polyphase_filter(up: int, down: int) -> np.ndarray:
+    """
+    ФНЧ (windowed sinc, окно Кайзера) для ресемплинга up/down, разложенный на фазы:
+    строка p - коэффициенты h[p], h[p + up], h[p + 2*up], ...
+    """
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    n = np.arange(-half_len, half_len + 1)
+    cutoff = 1.0 / max_rate
+    taps = cutoff * np.sinc(cutoff * n) * np.kaiser(len(n), 5.0)
+    taps *= up / taps.sum()
+    per_phase = -(-len(taps) // up)
+    padded = np.zeros(per_phase * up)
+    padded[:len(taps)] = taps
+    return padded.reshape(per_phase, up).T.astype(np.float32)
+
+
+def _resample_block(data, info: WavInfo, channels: int, up: int, down: int, first: int, count: int) -> np.ndarray:
+    """
+    Выходные кадры [first, first + count) полифазного ресемплинга (как scipy.signal.resample_poly):
+    повышение частоты в up раз, ФНЧ и прореживание в down раз без вычисления нулевых
+    и отбрасываемых отсчетов. Выходы с одинаковой фазой фильтра идут с шагом up,
+    их входы - с шагом down, поэтому каждая фаза считается срезами массива.
+    """
+    phases = _polyphase_filter(up, down)
+    per_phase = phases.shape[1]
+    half_len = 10 * max(up, down)
+    # Входные кадры, от которых зависит блок (с хвостом фильтра)
+    start = (first * down + half_len) // up - (per_phase - 1)
+    stop = ((first + count - 1) * down + half_len) // up + 1
+    x = _read_frames(data, info, channels, start, stop)
+
+    out = np.empty((count, channels), dtype=np.float32)
+    for j in range(min(up, count)):
+        position = (first + j) * down + half_len
+        phase, base = position % up, position // up - start
+        n = len(range(j, count, up))
+        acc = np.zeros((n, channels), dtype=np.float32)
+        for k in range(per_phase):
+            coef = phases[phase, k]
+            if coef == 0.0:
+                continue
+            acc += coef * x[base - k:base - k + (n - 1) * down + 1:down]
+        out[j::up] = acc
+    return out
+
+
+def encode_samples(samples: np.ndarray, bit_depth: int) -> bytes:
+    """float-отсчеты в PCM little-endian указанной битности (с ограничением диапазона)"""
+    flat = samples.reshape(-1)
+    if bit_depth == 8:
+        return (np.clip(np.rint(flat * 128.0), -128, 127) + 128).astype(np.uint8).tobytes()
+    if bit_depth == 16:
+        return np.clip(np.rint(flat * 32768.0), -32768, 32767).astype('<i2').tobytes()
+    if bit_depth == 24:
+        value = np.clip(np.rint(flat * 8388608.0), -8388608, 8388607).astype('<i4')
+        return value.view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    if bit_depth == 32:
+        return np.clip(np.rint(flat.astype(np.float64) * 2147483648.0), -2147483648, 2147483647).astype('<i4').tobytes()
+    raise PcmFormatError(f"Unsupported output bit depth: {bit_depth}")
+
+
+def build_wav_header(channels: int, sample_rate: int, bit_depth: int, data_size: int) -> bytes:
+    """Заголовок WAV (WAVE_FORMAT_PCM, 44 байта)"""
+    block_align = channels * bit_depth // 8
+    return (
+        b'RIFF' + struct.pack('<I', 36 + data_size) + b'WAVE'
+        + b'fmt ' + struct.pack('<IHHIIHH', 16, WAVE_FORMAT_PCM, channels, sample_rate,
+                                sample_rate * block_align, block_align, bit_depth)
+        + b'data' + struct.pack('<I', data_size)
+    )
+
+
+def matches_target(info: WavInfo, sample_rate: int, bit_depth: int, channels: int) -> bool:
+    """Целочисленный PCM WAV уже в целевом формате: отсчеты можно сохранить без перекодирования"""
+    return (
+        info.format_tag == WAVE_FORMAT_PCM
+        and info.sample_rate == sample_rate
+        and info.channels == channels
+        and info.bits_per_sample == bit_depth
+        and info.sample_width * 8 == bit_depth
+    )
+
+
+def passthrough_header(data, sample_rate: int, bit_depth: int, channels: int) -> Optional[Tuple[WavInfo, bytes]]:
+    """Для WAV, который уже соответствует целевому формату, - (параметры, стандартный заголовок); None - нужна конвертация"""
+    info = parse_wav_header(data)
+    if not matches_target(info, sample_rate, bit_depth, channels):
+        return None
+    return info, build_wav_header(channels, sample_rate, bit_depth, info.frames * info.block_align)
+
+
+def has_header(data, info: WavInfo, header: bytes) -> bool:
+    """Файл состоит ровно из заголовка header и данных (без других чанков и лишних байт)"""
+    data_size = info.frames * info.block_align
+    return info.data_offset == len(header) and len(data) == len(header) + data_size and data[:len(header)] == header
+
+
+def write_converted_wav(
+    data,
+    out: BinaryIO,
+    sample_rate: int,
+    bit_depth: int,
+    channels: int,
+    deadline: Optional[float] = None
+) -> int:
+    """
+    Конвертирует WAV (PCM 8/16/24/32-bit или float) в PCM WAV с заданными частотой,
+    битностью и количеством каналов и пишет результат в out. Данные обрабатываются
+    блоками по BLOCK_FRAMES кадров, поэтому промежуточные массивы не зависят от длины записи.
+    deadline - момент time.monotonic(), после которого конвертация прерывается TimeoutError.
+    PcmFormatError - формат или частота не поддерживаются (конвертировать через ffmpeg).
+
+    Returns:
+        Количество записанных байт
+    """
+    if bit_depth not in OUTPUT_BIT_DEPTHS:
+        raise PcmFormatError(f"Unsupported output bit depth: {bit_depth}")
+    info = parse_wav_header(data)
+    for rate in (info.sample_rate, sample_rate):
+        if not MIN_SAMPLE_RATE <= rate <= MAX_SAMPLE_RATE:
+            raise PcmFormatError(f"Unsupported sample rate: {rate} Hz")
+    g = gcd(info.sample_rate, sample_rate)
+    up, down = sample_rate // g, info.sample_rate // g
+    if max(up, down) > MAX_RESAMPLE_FACTOR:
+        raise PcmFormatError(f"Unsupported resampling ratio: {up}/{down}")
+    n_out = -(-info.frames * up // down)
+    data_size = n_out * channels * (bit_depth // 8)
+    written = out.write(build_wav_header(channels, sample_rate, bit_depth, data_size))
+
+    # Для ресемплинга блок кратен up (фазы фильтра повторяются с периодом up), не больше BLOCK_FRAMES + up
+    block = BLOCK_FRAMES if up == down else up * -(-BLOCK_FRAMES // up)
+    for first in range(0, n_out, block):
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError("WAV conversion timed out")
+        count = min(block, n_out - first)
+        if up == down:
+            samples = remix_channels(decode_samples(data, info, first, first + count), channels)
+        else:
+            samples = _resample_block(data, info, channels, up, down, first, count)
+        written += out.write(encode_samples(samples, bit_depth))
+    return written
+
@@ -5,6 +5,16 @@ from fastapi import HTTPException, status
 import bcrypt
 
 from app.config import settings
+from app.core.worker_pool import WorkerPool
+
+
+# bcrypt занимает 100-300 мс CPU и освобождает GIL: операции с паролями выполняются в отдельном пуле потоков
+password_hash_pool = WorkerPool(
+    "password-hash",
+    workers=lambda: settings.PASSWORD_HASH_WORKERS,
+    max_queue=lambda: settings.PASSWORD_HASH_MAX_QUEUE,
+    busy_detail="Too many concurrent logins, please retry",
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -13,11 +23,29 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     # Генерируем соль и хешируем пароль
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password в пуле потоков (не блокирует event loop)"""
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash в пуле потоков (не блокирует event loop)"""
+    return await password_hash_pool.run(get_password_hash, password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Хеш создан с другим cost factor, чем BCRYPT_ROUNDS (формат $2b$<cost>$...)"""
+    parts = hashed_password.split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return False
+    return int(parts[2]) != settings.BCRYPT_ROUNDS
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -0,0 +1,40 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class StageTimer:
+    """
+    Суммарное время по этапам обработки (в секундах).
+    При потоковой обработке этапы чередуются (чтение -> нарезка -> сохранение -> чтение ...),
+    поэтому время каждого этапа накапливается.
+    """
+    
+    def __init__(self, timings: Optional[Dict[str, float]] = None):
+        self.timings: Dict[str, float] = dict(timings or {})
+        self.current: Optional[str] = None
+    
+    @contextmanager
+    def stage(self, name: str):
+        self.current = name
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - started
+    
+    def iterate(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        """Итерирует iterable, засчитывая время получения каждого элемента этапу name"""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+    
+    def snapshot(self) -> Dict[str, float]:
+        return {name: round(seconds, 3) for name, seconds in self.timings.items()}
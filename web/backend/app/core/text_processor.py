@@ -3,8 +3,11 @@
 Разбивает текст на чанки по 3-15 секунд для озвучки.
 """
 
+import os
 import re
-from typing import List
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Deque, Iterable, Iterator, List, Optional
 
 # Импортируем полный нормализатор
 from app.core.normilizer import KyrgyzTextNormalizer
@@ -28,6 +31,31 @@ URL_PATTERN = re.compile(
 # Паттерн для email
 EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
 
+# Скобки и их содержимое (удаляются по очереди: круглые, квадратные, фигурные)
+BRACKET_PATTERNS = (
+    ('(', re.compile(r'\([^)]*\)')),
+    ('[', re.compile(r'\[[^\]]*\]')),
+    ('{', re.compile(r'\{[^}]*\}')),
+)
+
+# Сокращения, после точки которых предложение не разбивается
+SENTENCE_ABBREVIATIONS = r'г|ул|пр|д|кв|стр|корп|оф|тел|факс|др|проф|доц|акад'
+
+# Символы, которые нормализатор заменяет словом, только если перед ними пробел или запятая
+LOOKBEHIND_SYMBOLS = '%№@&'
+
+# Граница абзацев, по которой книгу можно резать на сегменты для параллельной обработки:
+# пустая строка после слова, завершенного знаком конца предложения,
+# и следующий абзац не начинается с LOOKBEHIND_SYMBOLS. Символ, скрытый за кавычкой
+# или сокращением "г.", проверяется уже после нормализации (_is_safe_segment_head)
+SEGMENT_BOUNDARY_PATTERN = re.compile(r'(?<=[^\W\d_][.!?])[^\S\n]*\n\s*\n\s*(?=[^\s' + LOOKBEHIND_SYMBOLS + r'])')
+
+# Минимальный размер сегмента (в символах) для параллельной обработки
+MIN_SEGMENT_CHARS = 20000
+
+# Минимальный размер сегмента (в символах) при потоковой обработке
+STREAM_SEGMENT_CHARS = 4096
+
 # Минимум и максимум слов для чанка (примерно 3-15 секунд озвучки)
 # Средняя скорость речи ~130-160 слов/мин, значит:
 # 3 сек ≈ 7-8 слов, 15 сек ≈ 32-40 слов
@@ -37,6 +65,9 @@ MAX_WORDS = 40
 # Минимальное количество букв в валидном чанке
 MIN_LETTERS = 10
 
+# Слово - непрерывная последовательность букв
+WORD_PATTERN = re.compile(r'[а-яА-ЯөүңӨҮҢёЁ]+')
+
 
 def _remove_urls_and_emails(text: str) -> str:
     """Удаляет URL и email адреса."""
@@ -55,9 +86,8 @@ def _clean_text(text: str) -> str:
     text = re.sub(quote_pattern, '', text)
     
     # Удаляем скобки и их содержимое (часто там ссылки, примечания)
-    text = re.sub(r'\([^)]*\)', '', text)
-    text = re.sub(r'\[[^\]]*\]', '', text)
-    text = re.sub(r'\{[^}]*\}', '', text)
+    for _, pattern in BRACKET_PATTERNS:
+        text = pattern.sub('', text)
     
     # Заменяем различные тире на обычное (– — −)
     text = re.sub('[\u2013\u2014\u2212]', '-', text)
@@ -77,20 +107,33 @@ def _clean_text(text: str) -> str:
     return text.strip()
 
 
-def _has_letters(text: str) -> bool:
-    """Проверяет, содержит ли текст буквы."""
-    return bool(re.search(r'[а-яА-ЯөүңӨҮҢёЁ]', text))
-
-
-def _count_letters(text: str) -> int:
-    """Считает количество букв в тексте."""
-    return len(re.findall(r'[а-яА-ЯөүңӨҮҢёЁ]', text))
-
-
-def _count_words(text: str) -> int:
-    """Считает количество слов в тексте."""
-    words = re.findall(r'[а-яА-ЯөүңӨҮҢёЁ]+', text)
-    return len(words)
+class _Sentence:
+    """
+    Предложение (часть предложения, чанк) с заранее посчитанным количеством слов и букв.
+    Слова - непрерывные последовательности букв, поэтому при склейке через пробел
+    количества просто складываются и текст заново не сканируется.
+    """
+    __slots__ = ('text', 'words', 'letters')
+    
+    def __init__(self, text: str, words: int, letters: int):
+        self.text = text
+        self.words = words
+        self.letters = letters
+    
+    @classmethod
+    def of(cls, text: str) -> "_Sentence":
+        words = WORD_PATTERN.findall(text)
+        return cls(text, len(words), sum(map(len, words)))
+    
+    @classmethod
+    def join(cls, parts: List["_Sentence"]) -> "_Sentence":
+        if len(parts) == 1:
+            return parts[0]
+        return cls(
+            " ".join(part.text for part in parts),
+            sum(part.words for part in parts),
+            sum(part.letters for part in parts)
+        )
 
 
 def _split_into_sentences(text: str) -> List[str]:
@@ -108,7 +151,7 @@ def _split_into_sentences(text: str) -> List[str]:
     )
     
     # Также защищаем сокращения типа "г." (город), "ул." (улица), "др." и т.д.
-    protected = re.sub(r'\b(г|ул|пр|д|кв|стр|корп|оф|тел|факс|др|проф|доц|акад)\.\s+', r'\1<DOT>', protected, flags=re.IGNORECASE)
+    protected = re.sub(r'\b(' + SENTENCE_ABBREVIATIONS + r')\.\s+', r'\1<DOT>', protected, flags=re.IGNORECASE)
     
     # Разделяем по точке, восклицательному и вопросительному знакам
     sentences = re.split(r'(?<=[.!?])\s+', protected)
@@ -124,16 +167,16 @@ def _split_into_sentences(text: str) -> List[str]:
     return result
 
 
-def _split_long_sentence(sentence: str, max_words: int) -> List[str]:
+def _split_long_sentence(sentence: _Sentence, max_words: int) -> List[_Sentence]:
     """
     Разбивает длинное предложение по знакам препинания.
     """
     # Пробуем разбить по запятой, точке с запятой, двоеточию
-    parts = re.split(r'(?<=[,;:])\s+', sentence)
+    parts = re.split(r'(?<=[,;:])\s+', sentence.text)
     
     if len(parts) == 1:
         # Если не получилось разбить, разбиваем по тире
-        parts = re.split(r'\s+-\s+', sentence)
+        parts = re.split(r'\s+-\s+', sentence.text)
     
     if len(parts) == 1:
         # Если всё ещё одна часть, возвращаем как есть
@@ -141,75 +184,114 @@ def _split_long_sentence(sentence: str, max_words: int) -> List[str]:
     
     # Объединяем слишком короткие части
     result = []
-    current = ""
+    current: List[_Sentence] = []
+    current_words = 0
     
     for part in parts:
         part = part.strip()
         if not part:
             continue
-            
+        part = _Sentence.of(part)
+        
         if not current:
-            current = part
-        elif _count_words(current + " " + part) <= max_words:
-            current = current + " " + part
+            current = [part]
+            current_words = part.words
+        elif current_words + part.words <= max_words:
+            current.append(part)
+            current_words += part.words
         else:
-            if current:
-                result.append(current)
-            current = part
+            result.append(_Sentence.join(current))
+            current = [part]
+            current_words = part.words
     
     if current:
-        result.append(current)
+        result.append(_Sentence.join(current))
     
     return result if result else [sentence]
 
 
-def _merge_short_sentences(sentences: List[str], min_words: int, max_words: int) -> List[str]:
+class _SentenceMerger:
     """
-    Объединяет ТОЛЬКО слишком короткие предложения (< min_words).
-    Предложения с min_words+ слов остаются отдельными чанками.
+    Потоковое объединение коротких предложений (логика _merge_short_sentences).
+    Последний готовый чанк придерживается до конца текста: к нему может
+    присоединиться слишком короткий хвост.
     """
-    if not sentences:
-        return []
-    
-    result = []
-    current = ""
-    
-    for sentence in sentences:
-        sentence = sentence.strip()
-        if not sentence:
-            continue
+    __slots__ = ('min_words', 'max_words', 'current', 'current_words', 'held')
+    
+    def __init__(self, min_words: int, max_words: int):
+        self.min_words = min_words
+        self.max_words = max_words
+        # Части текущего чанка и их суммарное количество слов
+        self.current: List[_Sentence] = []
+        self.current_words = 0
+        self.held: Optional[_Sentence] = None
+    
+    def add(self, sentence: _Sentence) -> Optional[_Sentence]:
+        """Добавляет предложение. Возвращает чанк, который окончательно готов, или None."""
+        if not sentence.text.strip():
+            return None
         
-        current_words = _count_words(current)
-        sentence_words = _count_words(sentence)
-        combined_words = _count_words(current + " " + sentence) if current else sentence_words
-        
-        if not current:
+        if not self.current:
             # Начинаем новый чанк
-            current = sentence
-        elif current_words < min_words and combined_words <= max_words:
+            self.current = [sentence]
+            self.current_words = sentence.words
+            return None
+        
+        current_words = self.current_words
+        combined_words = current_words + sentence.words
+        
+        if current_words < self.min_words and combined_words <= self.max_words:
             # Текущий чанк слишком короткий - объединяем
-            current = current + " " + sentence
-        elif sentence_words < min_words and combined_words <= max_words:
+            self.current.append(sentence)
+            self.current_words = combined_words
+            return None
+        if sentence.words < self.min_words and combined_words <= self.max_words:
             # Новое предложение слишком короткое - объединяем
-            current = current + " " + sentence
-        else:
-            # Оба достаточно длинные - сохраняем текущий, начинаем новый
-            result.append(current)
-            current = sentence
-    
-    # Добавляем последний чанк
-    if current:
-        current_words = _count_words(current)
-        # Если последний чанк слишком короткий, пробуем добавить к предыдущему
-        if current_words < min_words and result:
-            prev_words = _count_words(result[-1])
-            if prev_words + current_words <= max_words:
-                result[-1] = result[-1] + " " + current
+            self.current.append(sentence)
+            self.current_words = combined_words
+            return None
+        
+        # Оба достаточно длинные - сохраняем текущий, начинаем новый
+        ready = self.held
+        self.held = _Sentence.join(self.current)
+        self.current = [sentence]
+        self.current_words = sentence.words
+        return ready
+    
+    def finish(self) -> List[_Sentence]:
+        """Возвращает оставшиеся чанки в конце текста."""
+        result = [self.held] if self.held is not None else []
+        
+        # Добавляем последний чанк
+        if self.current:
+            current = _Sentence.join(self.current)
+            # Если последний чанк слишком короткий, пробуем добавить к предыдущему
+            if current.words < self.min_words and result:
+                if result[-1].words + current.words <= self.max_words:
+                    result[-1] = _Sentence.join([result[-1], current])
+                else:
+                    result.append(current)
             else:
                 result.append(current)
-        else:
-            result.append(current)
-    
+        
+        self.current = []
+        self.current_words = 0
+        self.held = None
+        return result
+
+
+def _merge_short_sentences(sentences: List[_Sentence], min_words: int, max_words: int) -> List[_Sentence]:
+    """
+    Объединяет ТОЛЬКО слишком короткие предложения (< min_words).
+    Предложения с min_words+ слов остаются отдельными чанками.
+    """
+    merger = _SentenceMerger(min_words, max_words)
+    result = []
+    for sentence in sentences:
+        chunk = merger.add(sentence)
+        if chunk is not None:
+            result.append(chunk)
+    result.extend(merger.finish())
     return result
 
 
@@ -240,6 +322,239 @@ def split_text_into_chunks(
     if not text or not text.strip():
         return []
     
+    _, cleaned = _normalize_and_clean(text, normalize)
+    processed = _split_into_parts(cleaned, max_words)
+    return _finalize_chunks(processed, min_words, max_words)
+
+
+def split_text_into_chunks_parallel(
+    text: str,
+    min_words: int = MIN_WORDS,
+    max_words: int = MAX_WORDS,
+    normalize: bool = True,
+    max_workers: Optional[int] = None
+) -> List[str]:
+    """
+    Параллельный вариант split_text_into_chunks для больших книг.
+    
+    Текст режется на сегменты по границам абзацев (SEGMENT_BOUNDARY_PATTERN),
+    сегменты нормализуются, очищаются и разбиваются на предложения в ProcessPoolExecutor,
+    а объединение коротких предложений и финальная фильтрация выполняются
+    последовательно (см. TextChunkStream). Результат совпадает с split_text_into_chunks.
+    
+    Args:
+        text: Исходный текст
+        min_words: Минимальное количество слов в чанке
+        max_words: Максимальное количество слов в чанке
+        normalize: Применять ли нормализацию (числа в слова и т.д.)
+        max_workers: Количество процессов (None - по числу ядер)
+    
+    Returns:
+        Список чанков готовых для TTS озвучки
+    """
+    if not text or not text.strip():
+        return []
+    
+    workers = max_workers or os.cpu_count() or 1
+    segment_chars = max(MIN_SEGMENT_CHARS, len(text) // (workers * 4))
+    if len(text) < 2 * segment_chars:
+        return split_text_into_chunks(text, min_words, max_words, normalize)
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        stream = TextChunkStream(
+            min_words, max_words, normalize,
+            executor=executor, segment_chars=segment_chars, max_in_flight=workers * 2
+        )
+        return stream.feed(text) + stream.close()
+
+
+def iter_text_chunks(
+    pieces: Iterable[str],
+    min_words: int = MIN_WORDS,
+    max_words: int = MAX_WORDS,
+    normalize: bool = True
+) -> Iterator[str]:
+    """
+    Потоковый вариант split_text_into_chunks.
+    
+    Принимает текст частями (строки, блоки файла - границы частей не важны)
+    и выдает чанки по мере готовности. В памяти держится только необработанный
+    хвост текста до ближайшей границы абзаца и буфер объединения коротких предложений.
+    Результат совпадает с split_text_into_chunks(''.join(pieces)).
+    """
+    stream = TextChunkStream(min_words, max_words, normalize)
+    for piece in pieces:
+        yield from stream.feed(piece)
+    yield from stream.close()
+
+
+class TextChunkStream:
+    """
+    Инкрементальная нарезка текста на чанки: feed(часть) -> готовые чанки, close() -> остаток.
+    
+    Текст режется по границам абзацев (SEGMENT_BOUNDARY_PATTERN) на сегменты,
+    которые обрабатываются независимо (_process_segment). Если стык сегмента
+    со следующим небезопасен, они склеиваются и обрабатываются заново,
+    поэтому результат совпадает с обработкой всего текста целиком.
+    
+    Группа сегментов с небезопасным концом ("открытая") склеивается со следующими,
+    пока конец не станет безопасным. Закрытая группа выдается, только когда
+    закроется следующая: склейка может изменить начало следующей группы
+    (например, скобка, открытая в ней, удаляется вместе с текстом до закрывающей).
+    
+    С executor сегменты обрабатываются в пуле процессов; одновременно
+    в работе не больше max_in_flight сегментов.
+    """
+    
+    def __init__(
+        self,
+        min_words: int = MIN_WORDS,
+        max_words: int = MAX_WORDS,
+        normalize: bool = True,
+        executor: Optional[Executor] = None,
+        segment_chars: int = STREAM_SEGMENT_CHARS,
+        max_in_flight: int = 8
+    ):
+        self.max_words = max_words
+        self.normalize = normalize
+        self.executor = executor
+        self.segment_chars = segment_chars
+        self.max_in_flight = max_in_flight
+        
+        # Необработанный хвост текста и позиция, с которой искать границу
+        self._buffer = ""
+        self._scan_from = 0
+        # Промежуток (пробелы) перед следующим сегментом
+        self._gap = ""
+        # Отправленные в пул сегменты: (промежуток перед сегментом, сегмент, future)
+        self._in_flight: Deque[tuple[str, str, Future]] = deque()
+        # Закрытая группа (безопасный конец), ждет проверки начала следующей: (сегмент, результат)
+        self._closed: Optional[tuple[str, tuple[List[_Sentence], bool, bool]]] = None
+        # Открытая группа (небезопасный конец): (промежуток перед ней, сегмент, результат)
+        self._open: Optional[tuple[str, str, tuple[List[_Sentence], bool, bool]]] = None
+        self._merger = _SentenceMerger(min_words, max_words)
+    
+    def feed(self, piece: str) -> List[str]:
+        """Добавляет часть текста. Возвращает чанки, которые уже окончательно готовы."""
+        if not piece:
+            return []
+        buffer = self._buffer + piece
+        
+        ready = []
+        start = 0
+        for match in SEGMENT_BOUNDARY_PATTERN.finditer(buffer, self._scan_from):
+            if match.start() - start < self.segment_chars:
+                continue
+            ready.extend(self._add_segment(buffer[start:match.start()]))
+            self._gap = match.group(0)
+            start = match.end()
+        
+        buffer = buffer[start:]
+        self._buffer = buffer
+        # Новая граница может начаться только в пробелах в конце буфера
+        self._scan_from = len(buffer.rstrip())
+        return ready
+    
+    def close(self) -> List[str]:
+        """Обрабатывает остаток текста и возвращает последние чанки."""
+        ready = []
+        if self._buffer.strip():
+            ready.extend(self._add_segment(self._buffer))
+        self._buffer = ""
+        self._scan_from = 0
+        
+        while self._in_flight:
+            gap, segment, future = self._in_flight.popleft()
+            ready.extend(self._commit(gap, segment, future.result()))
+        
+        while self._open is not None:
+            # Конец текста - открытой группе больше не с чем склеиваться
+            gap, segment, result = self._open
+            self._open = None
+            ready.extend(self._close(gap, segment, result))
+        if self._closed is not None:
+            ready.extend(self._emit(self._closed[1][0]))
+            self._closed = None
+        
+        for chunk in self._merger.finish():
+            chunk = _finalize_chunk(chunk)
+            if chunk:
+                ready.append(chunk)
+        return ready
+    
+    def _add_segment(self, segment: str) -> List[str]:
+        gap = self._gap
+        self._gap = ""
+        if self.executor is None:
+            # К открытой группе сегмент все равно будет приклеен - отдельно не обрабатываем
+            result = None if self._open is not None else _process_segment(segment, self.max_words, self.normalize)
+            return self._commit(gap, segment, result)
+        
+        self._in_flight.append(
+            (gap, segment, self.executor.submit(_process_segment, segment, self.max_words, self.normalize))
+        )
+        ready = []
+        while self._in_flight and (len(self._in_flight) > self.max_in_flight or self._in_flight[0][2].done()):
+            gap, segment, future = self._in_flight.popleft()
+            ready.extend(self._commit(gap, segment, future.result()))
+        return ready
+    
+    def _commit(
+        self,
+        gap: str,
+        segment: str,
+        result: Optional[tuple[List[_Sentence], bool, bool]]
+    ) -> List[str]:
+        """Принимает следующий сегмент (в порядке текста) с результатом обработки."""
+        if self._open is not None:
+            # Конец открытой группы небезопасен - склеиваем и обрабатываем заново
+            open_gap, open_segment, _ = self._open
+            self._open = None
+            segment = open_segment + gap + segment
+            gap = open_gap
+            result = _process_segment(segment, self.max_words, self.normalize)
+        
+        _, tail_safe, _ = result
+        if not tail_safe:
+            self._open = (gap, segment, result)
+            return []
+        return self._close(gap, segment, result)
+    
+    def _close(self, gap: str, segment: str, result: tuple[List[_Sentence], bool, bool]) -> List[str]:
+        """Группа закрыта: проверяем ее стык с предыдущей закрытой группой."""
+        if self._closed is None:
+            self._closed = (segment, result)
+            return []
+        
+        closed_segment, closed_result = self._closed
+        _, _, head_safe = result
+        if head_safe:
+            self._closed = (segment, result)
+            return self._emit(closed_result[0])
+        
+        # Начало группы небезопасно - склеиваем с предыдущей.
+        # Начало предыдущей группы от этого не меняется (ее конец безопасен),
+        # поэтому стык склейки с уже выданным текстом заново не проверяется.
+        self._closed = None
+        segment = closed_segment + gap + segment
+        return self._commit("", segment, _process_segment(segment, self.max_words, self.normalize))
+    
+    def _emit(self, parts: List[_Sentence]) -> List[str]:
+        ready = []
+        for part in parts:
+            chunk = self._merger.add(part)
+            if chunk is not None:
+                chunk = _finalize_chunk(chunk)
+                if chunk:
+                    ready.append(chunk)
+        return ready
+
+
+def _normalize_and_clean(text: str, normalize: bool) -> tuple[str, str]:
+    """
+    Удаляет URL, нормализует и очищает текст.
+    Возвращает (текст до очистки, очищенный текст).
+    """
     # 1. Удаляем URL и email
     text = _remove_urls_and_emails(text)
     
@@ -248,47 +563,104 @@ def split_text_into_chunks(
         text = _normalizer.normalize(text)
     
     # 3. Очищаем текст (оставляем только буквы и пунктуацию)
-    text = _clean_text(text)
-    
+    return text, _clean_text(text)
+
+
+def _split_into_parts(text: str, max_words: int) -> List[_Sentence]:
+    """Разбивает очищенный текст на предложения, длинные - на части."""
     # 4. Разбиваем на предложения
     sentences = _split_into_sentences(text)
     
     # 5. Обрабатываем каждое предложение
     processed = []
     for sentence in sentences:
-        word_count = _count_words(sentence)
+        sentence = _Sentence.of(sentence)
         
-        if word_count > max_words:
+        if sentence.words > max_words:
             # Слишком длинное - разбиваем
             parts = _split_long_sentence(sentence, max_words)
             processed.extend(parts)
         else:
             processed.append(sentence)
     
+    return processed
+
+
+def _finalize_chunks(processed: List[_Sentence], min_words: int, max_words: int) -> List[str]:
+    """Объединяет короткие предложения и фильтрует готовые чанки."""
     # 6. Объединяем слишком короткие
     chunks = _merge_short_sentences(processed, min_words, max_words)
     
     # 7. Финальная фильтрация
     result = []
     for chunk in chunks:
-        chunk = chunk.strip()
-        
-        # Пропускаем пустые и чанки без букв
-        if not chunk or not _has_letters(chunk):
-            continue
-        
-        # Пропускаем слишком короткие (меньше MIN_LETTERS букв)
-        if _count_letters(chunk) < MIN_LETTERS:
-            continue
-        
-        # Финальная очистка
-        chunk = re.sub(r'\s+', ' ', chunk)
-        chunk = chunk.strip()
-        
-        # Убираем висящие знаки препинания в начале
-        chunk = re.sub(r'^[.,;:\-\s]+', '', chunk)
-        
-        if chunk and _has_letters(chunk):
+        chunk = _finalize_chunk(chunk)
+        if chunk:
             result.append(chunk)
     
     return result
+
+
+def _finalize_chunk(chunk: _Sentence) -> Optional[str]:
+    """Финальная очистка чанка. None - если чанк нужно пропустить."""
+    # Пропускаем чанки без букв и слишком короткие (меньше MIN_LETTERS букв)
+    if chunk.letters < MIN_LETTERS:
+        return None
+    
+    # Финальная очистка (удаляются только пробелы и знаки препинания - буквы остаются)
+    text = re.sub(r'\s+', ' ', chunk.text)
+    text = text.strip()
+    
+    # Убираем висящие знаки препинания в начале
+    return re.sub(r'^[.,;:\-\s]+', '', text)
+
+
+def _process_segment(segment: str, max_words: int, normalize: bool) -> tuple[List[_Sentence], bool, bool]:
+    """
+    Обработка одного сегмента (в том числе в отдельном процессе).
+    Возвращает (части предложений, безопасен ли конец сегмента, безопасно ли начало).
+    """
+    normalized, cleaned = _normalize_and_clean(segment, normalize)
+    parts = _split_into_parts(cleaned, max_words)
+    return parts, _is_safe_segment_tail(normalized, cleaned), _is_safe_segment_head(normalized, cleaned)
+
+
+def _is_safe_segment_tail(normalized: str, cleaned: str) -> bool:
+    """
+    Конец сегмента безопасен, если следующий сегмент не может на него повлиять:
+    предложение закончено, это не инициал и не сокращение (их точку _split_into_sentences
+    не считает концом предложения), и нет незакрытых скобок (их содержимое удаляется до закрывающей).
+    """
+    if not cleaned or cleaned[-1] not in '.!?':
+        return False
+    if re.search(r'[А-ЯӨҮҢЁA-Z]\.$', cleaned):
+        return False
+    if re.search(r'\b(' + SENTENCE_ABBREVIATIONS + r')\.$', cleaned, flags=re.IGNORECASE):
+        return False
+    
+    for opening, pattern in BRACKET_PATTERNS:
+        normalized = pattern.sub('', normalized)
+        if opening in normalized:
+            return False
+    return True
+
+
+def _is_safe_segment_head(normalized: str, cleaned: str) -> bool:
+    """
+    Начало сегмента безопасно, если оно не приклеится к предыдущему знаку препинания
+    и нормализованный сегмент не начинается с символа из LOOKBEHIND_SYMBOLS: нормализатор
+    удаляет кавычки и "г." перед ним, и в начале сегмента символ остается незамененным,
+    а в целом тексте после пробелов границы заменяется словом.
+    """
+    head = normalized.lstrip()[:1]
+    if head and head in LOOKBEHIND_SYMBOLS:
+        return False
+    return bool(cleaned) and cleaned[0] not in '.,!?;:'
+
+
+def get_normalizer_stats() -> dict:
+    """
+    Статистика кэшей конвертеров чисел глобального нормализатора
+    (попадания в таблицу 0–9999, в LRU кэш, промахи, hit rate).
+    """
+    return _normalizer.converter_stats()
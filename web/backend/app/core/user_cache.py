@@ -0,0 +1,51 @@
+from typing import Optional
+
+from app.config import settings
+from app.core.cache import MemoryCacheBackend
+from app.models.user import User, UserRole
+
+
+class UserCache:
+    """
+    Кэш аутентифицированных пользователей процесса: id -> (username, role).
+    Позволяет проверять токен и роль без запроса к таблице users. Удаление пользователя
+    сбрасывает запись в этом процессе; в остальных воркерах она живет не дольше AUTH_USER_CACHE_TTL.
+    """
+
+    def __init__(self):
+        self._backend: Optional[MemoryCacheBackend] = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.AUTH_USER_CACHE_TTL > 0
+
+    @property
+    def backend(self) -> MemoryCacheBackend:
+        if self._backend is None:
+            self._backend = MemoryCacheBackend(settings.AUTH_USER_CACHE_MAX_ENTRIES)
+        return self._backend
+
+    def get(self, user_id: int) -> Optional[User]:
+        """
+        Пользователь из кэша или None. Возвращается объект вне сессии (только id, username, role):
+        для изменения пользователя его нужно загрузить из БД.
+        """
+        if not self.enabled:
+            return None
+        cached = self.backend.get(str(user_id))
+        if cached is None:
+            return None
+        username, role = cached
+        return User(id=user_id, username=username, role=UserRole(role))
+
+    def set(self, user: User) -> None:
+        if self.enabled:
+            self.backend.set(str(user.id), (user.username, user.role.value), settings.AUTH_USER_CACHE_TTL)
+
+    def invalidate(self, user_id: int) -> None:
+        if self.enabled:
+            self.backend.delete(str(user_id))
+
+
+# Кэш пользователей процесса (общий для запросов)
+user_cache = UserCache()
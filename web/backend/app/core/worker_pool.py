@@ -0,0 +1,123 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from fastapi import HTTPException, status
+
+T = TypeVar('T')
+
+
+class WorkerPool:
+    """
+    Ограниченный пул потоков для тяжелых блокирующих операций (bcrypt, конвертация аудио).
+    Задачи выполняются вне event loop, поэтому не задерживают остальные запросы воркера.
+    Очередь ограничена max_queue(): при переполнении запрос получает 503 с текстом busy_detail.
+    Размеры читаются из настроек при первом использовании, поэтому передаются функциями.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        workers: Callable[[], int],
+        max_queue: Callable[[], int],
+        busy_detail: str
+    ):
+        self.name = name
+        self._workers = workers
+        self._max_queue = max_queue
+        self.busy_detail = busy_detail
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.run_total = 0.0
+        self.run_max = 0.0
+
+    @property
+    def workers(self) -> int:
+        return max(self._workers(), 1)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix=self.name
+                )
+            return self._executor
+
+    def _run(self, fn: Callable[..., T], state: dict, *args) -> Optional[T]:
+        started = time.perf_counter()
+        with self._lock:
+            if state["cancelled"]:
+                return None
+            state["started"] = True
+            self.queued -= 1
+            self.running += 1
+            wait = started - state["submitted"]
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+        failed = True
+        try:
+            result = fn(*args)
+            failed = False
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+                self.failed += failed
+                self.run_total += elapsed
+                self.run_max = max(self.run_max, elapsed)
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """Выполнить fn(*args) в пуле и дождаться результата, не блокируя event loop"""
+        with self._lock:
+            max_queue = self._max_queue()
+            if max_queue and self.queued >= max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=self.busy_detail,
+                )
+            self.queued += 1
+        state = {"submitted": time.perf_counter(), "started": False, "cancelled": False}
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), self._run, fn, state, *args)
+        except asyncio.CancelledError:
+            # Запрос отменен (клиент отключился) до начала выполнения - убираем задачу из очереди
+            with self._lock:
+                if not state["started"]:
+                    state["cancelled"] = True
+                    self.queued -= 1
+            raise
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "wait_avg_ms": self.wait_total / self.completed * 1000 if self.completed else 0.0,
+                "wait_max_ms": self.wait_max * 1000,
+                "run_avg_ms": self.run_total / self.completed * 1000 if self.completed else 0.0,
+                "run_max_ms": self.run_max * 1000,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
@@ -1,19 +1,65 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.config import settings
+from app.core.db_metrics import instrument_engine, instrumented_pool_class
+
+# Асинхронные драйверы для диалектов (DATABASE_URL указывается для синхронного драйвера)
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """URL базы данных с асинхронным драйвером: postgresql -> postgresql+asyncpg, sqlite -> sqlite+aiosqlite"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend: {backend}")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def get_pool_options(database_url: str, name: str, is_async: bool = False) -> dict:
+    """Параметры пула соединений из настроек. Для SQLite остается пул по умолчанию."""
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": instrumented_pool_class(AsyncAdaptedQueuePool if is_async else QueuePool, name),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
 
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using them
+    pool_pre_ping=settings.DB_POOL_PRE_PING,  # Verify connections before using them
     echo=settings.DEBUG,  # Log SQL queries in debug mode
+    **get_pool_options(settings.DATABASE_URL, "sync"),
 )
+instrument_engine(engine)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Асинхронный движок для роутов, которые не должны блокировать event loop запросами к БД
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    echo=settings.DEBUG,
+    **get_pool_options(settings.DATABASE_URL, "async", is_async=True),
+)
+instrument_engine(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -27,3 +73,11 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db():
+    """
+    Асинхронная сессия БД. Синхронный код сервисов и репозиториев выполняется в ней через
+    await db.run_sync(fn): запросы ожидают ответа БД, не блокируя event loop.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
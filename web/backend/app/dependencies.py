@@ -2,6 +2,7 @@ from fastapi import Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
 
 from app.core.security import verify_token
+from app.core.user_cache import user_cache
 from app.database import get_db
 from app.repositories.user_repository import UserRepository
 from app.repositories.book_assignment_repository import BookAssignmentRepository
@@ -30,6 +31,11 @@ async def get_current_user(
     payload = verify_token(token)
     user_id: int = int(payload.get("sub"))
     
+    # Пользователь из кэша - без запроса к БД (роль и id для проверок доступа)
+    user = user_cache.get(user_id)
+    if user:
+        return user
+    
     user_repo = UserRepository()
     user = user_repo.get_by_id(db, user_id)
     if not user:
@@ -38,6 +44,7 @@ async def get_current_user(
             detail="User not found",
         )
     
+    user_cache.set(user)
     return user
 
 
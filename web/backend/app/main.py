@@ -1,11 +1,16 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.routes import (
-    health, auth, users, categories, categories_common, books, book_assignments, chunks, recordings, speakers, assignments_common, statistics
+    health, auth, users, categories, categories_common, books, book_assignments, chunks, recordings, speakers, assignments_common, statistics, ingestion_jobs
 )
 from app.config import settings
+from app.database import async_engine
+from app.core.db_metrics import RequestQueryStats, request_query_stats
+from app.core.security import password_hash_pool
+from app.core.audio_processor import audio_conversion_pool
 from app.core.init_db import init_default_admin
+from app.services.ingestion_service import resume_pending_jobs, shutdown_ingestion_executor
 
 app = FastAPI(
     title="TTS Data Collection API",
@@ -18,6 +23,41 @@ app = FastAPI(
 async def startup_event():
     """Инициализация при старте приложения"""
     init_default_admin()
+    # Задачи загрузки книг, не обработанные до перезапуска
+    if settings.INGESTION_BACKEND == "executor":
+        resume_pending_jobs()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Остановка пулов потоков и закрытие соединений асинхронного движка"""
+    shutdown_ingestion_executor()
+    password_hash_pool.shutdown()
+    audio_conversion_pool.shutdown()
+    await async_engine.dispose()
+
+@app.middleware("http")
+async def db_request_stats_middleware(request: Request, call_next):
+    """Количество и время запросов к БД в ответе и логе (DB_REQUEST_STATS=true)"""
+    if not settings.DB_REQUEST_STATS:
+        return await call_next(request)
+    
+    stats = RequestQueryStats()
+    token = request_query_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        request_query_stats.reset(token)
+    
+    response.headers["X-DB-Queries"] = str(stats.queries)
+    response.headers["X-DB-Time-Ms"] = f"{stats.query_time * 1000:.1f}"
+    response.headers["X-DB-Pool-Wait-Ms"] = f"{stats.pool_wait * 1000:.1f}"
+    print(
+        f"🗄️ {request.method} {request.url.path} -> {response.status_code}: "
+        f"{stats.queries} queries, {stats.query_time * 1000:.1f} ms in DB, "
+        f"{stats.pool_wait * 1000:.1f} ms waiting for pool"
+    )
+    return response
 
 # CORS middleware
 app.add_middleware(
@@ -38,6 +78,7 @@ app.include_router(categories.router, prefix="/api/v1/admin/categories", tags=["
 app.include_router(books.router, prefix="/api/v1/admin/books", tags=["admin-books"])
 app.include_router(book_assignments.router, prefix="/api/v1/admin/assignments", tags=["admin-assignments"])
 app.include_router(chunks.router, prefix="/api/v1/admin/chunks", tags=["admin-chunks"])
+app.include_router(ingestion_jobs.router, prefix="/api/v1/admin/ingestion-jobs", tags=["admin-ingestion-jobs"])
 
 # Speaker routes
 app.include_router(speakers.router, prefix="/api/v1/speakers", tags=["speakers"])
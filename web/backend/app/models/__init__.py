@@ -4,6 +4,9 @@ from app.models.book import Book
 from app.models.chunk import Chunk
 from app.models.recording import Recording
 from app.models.book_speaker_assignment import book_speaker_assignment
+from app.models.ingestion_job import IngestionJob, IngestionJobStatus
+from app.models.speaker_book_progress import SpeakerBookProgress
+from app.models.recording_daily_stats import RecordingDailyStats
 
-__all__ = ["User", "UserRole", "Category", "Book", "Chunk", "Recording", "book_speaker_assignment"]
+__all__ = ["User", "UserRole", "Category", "Book", "Chunk", "Recording", "book_speaker_assignment", "IngestionJob", "IngestionJobStatus", "SpeakerBookProgress", "RecordingDailyStats"]
 
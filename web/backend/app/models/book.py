@@ -15,6 +15,7 @@ class Book(Base):
     original_filename = Column(String, nullable=False)
     file_type = Column(String, nullable=False)  # txt
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
+    chunks_count = Column(Integer, nullable=False, default=0, server_default="0")  # Количество чанков (задается при загрузке)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey, Enum, JSON
+from sqlalchemy.sql import func
+import enum
+from app.database import Base
+
+
+class IngestionJobStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class IngestionJob(Base):
+    """Задача фоновой загрузки книги: разбор файла, нарезка на чанки и сохранение в БД"""
+    __tablename__ = "ingestion_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(Enum(IngestionJobStatus), nullable=False, default=IngestionJobStatus.PENDING, index=True)
+    stage = Column(String, nullable=True)  # Текущий этап: reading, chunking, saving
+    title = Column(String, nullable=True)
+    original_filename = Column(String, nullable=False)
+    file_type = Column(String, nullable=False)  # txt
+    file_path = Column(String, nullable=False)  # Временный файл загрузки (удаляется после обработки)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
+    created_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    book_id = Column(Integer, ForeignKey("books.id", ondelete="SET NULL"), nullable=True)
+    bytes_total = Column(BigInteger, nullable=False, default=0)
+    bytes_processed = Column(BigInteger, nullable=False, default=0)
+    chunks_count = Column(Integer, nullable=False, default=0)
+    stage_timings = Column(JSON, nullable=True)  # Время по этапам в секундах: {"reading": 0.1, ...}
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # Последняя отметка выполняющейся задачи
+    claim_token = Column(String, nullable=True)  # Токен текущего захвата: сохранить результат может только его владелец
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    @property
+    def progress_percentage(self) -> float:
+        if self.status == IngestionJobStatus.COMPLETED:
+            return 100.0
+        if not self.bytes_total:
+            return 0.0
+        return round(min(self.bytes_processed / self.bytes_total, 1.0) * 100, 2)
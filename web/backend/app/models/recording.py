@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, DateTime, Float
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -13,6 +13,7 @@ class Recording(Base):
     audio_file_path = Column(String, nullable=False)
     duration = Column(Float, nullable=True)  # Длительность в секундах
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    recorded_date = Column(Date, nullable=False)  # День записи в часовом поясе статистики (STATISTICS_TIMEZONE)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
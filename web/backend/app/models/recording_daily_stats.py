@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey
+from app.database import Base
+
+
+class RecordingDailyStats(Base):
+    """
+    Дневные агрегаты записей по (дата, спикер, книга). Категория книги хранится денормализованно.
+    Обновляются в одной транзакции с сохранением записи (RecordingService.upload_recording);
+    статистика считается по ним, а не по JOIN recordings -> chunks -> books -> categories.
+    Полный пересчет и проверка согласованности: python -m app.repair
+    """
+    __tablename__ = "recording_daily_stats"
+
+    day = Column(Date, primary_key=True)  # recordings.recorded_date (день в часовом поясе статистики)
+    speaker_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, index=True)
+    book_id = Column(Integer, ForeignKey("books.id", ondelete="CASCADE"), primary_key=True, index=True)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False, index=True)
+    recordings_count = Column(Integer, nullable=False, default=0)
+    total_duration = Column(Float, nullable=False, default=0.0)  # Суммарная длительность в секундах
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class SpeakerBookProgress(Base):
+    """
+    Прогресс спикера по книге. Обновляется в одной транзакции с сохранением записи
+    (RecordingService.upload_recording), поэтому статистику не нужно пересчитывать
+    через JOIN чанков и записей. Полный пересчет: python -m app.repair
+    """
+    __tablename__ = "speaker_book_progress"
+
+    speaker_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    book_id = Column(Integer, ForeignKey("books.id", ondelete="CASCADE"), primary_key=True, index=True)
+    recorded_chunks = Column(Integer, nullable=False, default=0)  # Количество записанных чанков
+    total_duration = Column(Float, nullable=False, default=0.0)  # Суммарная длительность записей в секундах
+    last_recorded_order_index = Column(Integer, nullable=True)  # Наибольший order_index среди записанных чанков
+    # Все чанки с order_index меньше указателя записаны: поиск следующего не записанного начинается с него
+    # (NULL - с начала книги)
+    next_unrecorded_order_index = Column(Integer, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,59 @@
+"""
+Пересчет производных таблиц из исходных данных (chunks, recordings),
+если счетчики разошлись с записями - например, после ручных правок в БД.
+
+Запуск:
+    python -m app.repair           # пересчитать speaker_book_progress и recording_daily_stats
+    python -m app.repair --check   # только проверить дневные агрегаты статистики
+"""
+import argparse
+import sys
+
+from app.database import SessionLocal
+from app.repositories.speaker_book_progress_repository import SpeakerBookProgressRepository
+from app.repositories.recording_stats_repository import RecordingStatsRepository
+
+
+def rebuild_speaker_book_progress() -> int:
+    db = SessionLocal()
+    try:
+        return SpeakerBookProgressRepository.rebuild(db)
+    finally:
+        db.close()
+
+
+def rebuild_recording_daily_stats() -> int:
+    db = SessionLocal()
+    try:
+        return RecordingStatsRepository.rebuild(db)
+    finally:
+        db.close()
+
+
+def check_recording_daily_stats() -> list:
+    db = SessionLocal()
+    try:
+        return RecordingStatsRepository.find_mismatches(db)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Пересчет производных таблиц")
+    parser.add_argument("--check", action="store_true", help="Только проверить согласованность дневных агрегатов")
+    args = parser.parse_args()
+
+    if args.check:
+        mismatches = check_recording_daily_stats()
+        for mismatch in mismatches[:50]:
+            print(f"❌ {mismatch}")
+        if mismatches:
+            print(f"❌ recording_daily_stats: {len(mismatches)} mismatches (run python -m app.repair to rebuild)")
+            sys.exit(1)
+        print("✅ recording_daily_stats is consistent with recordings")
+        sys.exit(0)
+
+    rows = rebuild_speaker_book_progress()
+    print(f"✅ speaker_book_progress rebuilt: {rows} rows")
+    rows = rebuild_recording_daily_stats()
+    print(f"✅ recording_daily_stats rebuilt: {rows} rows")
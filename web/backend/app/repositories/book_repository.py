@@ -63,6 +63,13 @@ class BookRepository:
         db.refresh(book)
         return book
     
+    @staticmethod
+    def add(db: Session, book: Book) -> Book:
+        """Добавить книгу в текущую транзакцию без commit (id доступен после flush)"""
+        db.add(book)
+        db.flush()
+        return book
+    
     @staticmethod
     def delete(db: Session, book: Book) -> None:
         db.delete(book)
@@ -1,7 +1,8 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, and_, insert, func
 from typing import List, Tuple, Optional
 from app.models.chunk import Chunk
+from app.models.recording import Recording
 
 
 class ChunkRepository:
@@ -11,9 +12,13 @@ class ChunkRepository:
         book_id: int,
         page_number: int = 1,
         limit: int = 100,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        after_order_index: Optional[int] = None
     ) -> Tuple[List[Chunk], int]:
-        skip = (page_number - 1) * limit
+        """
+        Чанки книги по order_index. Если задан after_order_index (курсор), страница начинается
+        после него (keyset по индексу ix_chunks_book_order, без OFFSET), иначе - по page_number.
+        """
         query = db.query(Chunk).filter(Chunk.book_id == book_id)
         
         # Поиск по тексту чанка
@@ -25,36 +30,109 @@ class ChunkRepository:
         total = query.count()
         
         # Получение элементов с пагинацией и сортировкой
-        items = query.order_by(Chunk.order_index).offset(skip).limit(limit).all()
+        if after_order_index is not None:
+            query = query.filter(Chunk.order_index > after_order_index).order_by(Chunk.order_index)
+        else:
+            query = query.order_by(Chunk.order_index).offset((page_number - 1) * limit)
+        items = query.limit(limit).all()
         return items, total
     
+    @staticmethod
+    def get_by_book_with_recordings(
+        db: Session,
+        book_id: int,
+        speaker_id: int,
+        page_number: int = 1,
+        limit: int = 100,
+        search: Optional[str] = None,
+        status_filter: str = "all",
+        after_order_index: Optional[int] = None
+    ) -> Tuple[List[Tuple[Chunk, Optional[Recording]]], int]:
+        """
+        Чанки книги вместе с записью спикера (LEFT JOIN) одним запросом.
+        Фильтр по статусу записи (all/recorded/not_recorded), поиск, общее количество
+        (COUNT(*) OVER ()) и пагинация выполняются в БД - в память загружается только страница.
+        Если задан after_order_index (курсор), страница начинается после него (keyset, без OFFSET).
+        """
+        skip = (page_number - 1) * limit
+        query = db.query(Chunk, Recording).outerjoin(
+            Recording,
+            and_(
+                Recording.chunk_id == Chunk.id,
+                Recording.speaker_id == speaker_id
+            )
+        ).filter(Chunk.book_id == book_id)
+        
+        # Поиск по тексту чанка
+        if search:
+            search_pattern = f"%{search}%"
+            query = query.filter(Chunk.text.ilike(search_pattern))
+        
+        # Фильтр по статусу записи
+        if status_filter == "recorded":
+            query = query.filter(Recording.id.isnot(None))
+        elif status_filter == "not_recorded":
+            query = query.filter(Recording.id.is_(None))
+        
+        if after_order_index is not None:
+            # Окно COUNT(*) OVER () посчитало бы только строки после курсора - общее количество отдельно
+            rows = query.filter(Chunk.order_index > after_order_index).order_by(
+                Chunk.order_index
+            ).limit(limit).all()
+            total = query.with_entities(func.count(Chunk.id)).scalar() or 0
+            return [(chunk, recording) for chunk, recording in rows], total
+        
+        rows = query.add_columns(func.count().over().label('total')).order_by(
+            Chunk.order_index
+        ).offset(skip).limit(limit).all()
+        
+        if rows:
+            total = rows[0].total
+        elif skip:
+            # Страница за пределами выборки - общее количество считаем отдельно
+            total = query.with_entities(func.count(Chunk.id)).scalar() or 0
+        else:
+            total = 0
+        return [(chunk, recording) for chunk, recording, _ in rows], total
+    
     @staticmethod
     def get_by_id(db: Session, chunk_id: int) -> Chunk | None:
         return db.query(Chunk).filter(Chunk.id == chunk_id).first()
     
     @staticmethod
-    def create_bulk(db: Session, chunks: List[Chunk]) -> List[Chunk]:
-        db.add_all(chunks)
-        db.commit()
-        for chunk in chunks:
-            db.refresh(chunk)
-        return chunks
+    def insert_bulk(db: Session, rows: List[dict], batch_size: int = 1000) -> List[int]:
+        """
+        Вставить чанки пачками по batch_size в текущую транзакцию (без commit).
+        Каждая пачка - один INSERT ... VALUES (...), (...) RETURNING id,
+        ORM-объекты не создаются и не перечитываются.
+        rows - словари с полями чанка. Возвращает id в порядке rows.
+        """
+        stmt = insert(Chunk).returning(Chunk.id, sort_by_parameter_order=True)
+        ids: List[int] = []
+        for start in range(0, len(rows), batch_size):
+            result = db.execute(stmt, rows[start:start + batch_size])
+            ids.extend(result.scalars().all())
+        return ids
     
     @staticmethod
     def count_by_book(db: Session, book_id: int) -> int:
         return db.query(Chunk).filter(Chunk.book_id == book_id).count()
     
     @staticmethod
-    def get_next_unrecorded_chunk(db: Session, book_id: int, speaker_id: int) -> Chunk | None:
+    def get_next_unrecorded_chunks(
+        db: Session,
+        book_id: int,
+        speaker_id: int,
+        from_order_index: Optional[int] = None,
+        limit: int = 1
+    ) -> List[Chunk]:
         """
-        Получить следующий не записанный чанк для спикера.
-        Возвращает чанк с минимальным order_index, который еще не записан этим спикером.
+        Получить следующие не записанные спикером чанки (по возрастанию order_index).
+        from_order_index - указатель прогресса спикера: все чанки до него записаны,
+        поэтому просмотр по индексу ix_chunks_book_order начинается с него, а не с начала книги.
         """
-        from app.models.recording import Recording
-        from sqlalchemy import and_, outerjoin
-        
         # Используем LEFT JOIN для поиска чанков без записей от этого спикера
-        chunk = db.query(Chunk).outerjoin(
+        query = db.query(Chunk).outerjoin(
             Recording,
             and_(
                 Recording.chunk_id == Chunk.id,
@@ -65,9 +143,10 @@ class ChunkRepository:
                 Chunk.book_id == book_id,
                 Recording.id.is_(None)  # Нет записи от этого спикера
             )
-        ).order_by(Chunk.order_index).first()
+        )
+        if from_order_index is not None:
+            query = query.filter(Chunk.order_index >= from_order_index)
         
-        return chunk
-
+        return query.order_by(Chunk.order_index).limit(limit).all()
 
 
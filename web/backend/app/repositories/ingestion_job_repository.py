@@ -0,0 +1,123 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from typing import List, Optional, Tuple
+from app.models.ingestion_job import IngestionJob, IngestionJobStatus
+
+
+class IngestionJobRepository:
+    @staticmethod
+    def create(db: Session, job: IngestionJob) -> IngestionJob:
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+    
+    @staticmethod
+    def get_by_id(db: Session, job_id: int) -> Optional[IngestionJob]:
+        return db.query(IngestionJob).filter(IngestionJob.id == job_id).first()
+    
+    @staticmethod
+    def get_pending_ids(db: Session) -> List[int]:
+        """ID задач, ожидающих обработки, в порядке создания"""
+        rows = db.query(IngestionJob.id).filter(
+            IngestionJob.status == IngestionJobStatus.PENDING
+        ).order_by(IngestionJob.id).all()
+        return [row.id for row in rows]
+    
+    @staticmethod
+    def requeue_stale(db: Session, timeout_seconds: float) -> List[int]:
+        """
+        Вернуть в очередь (RUNNING -> PENDING) задачи без отметки о работе (heartbeat_at)
+        дольше timeout_seconds: такие задачи остались от остановленного или упавшего процесса.
+        Если прежний исполнитель все же жив, его результат не сохранится: захват сбрасывается,
+        а завершение задачи проверяет claim_token (update_claimed).
+        Возвращает ID возвращенных задач.
+        """
+        seen_before = datetime.now(timezone.utc) - timedelta(seconds=timeout_seconds)
+        last_seen = func.coalesce(IngestionJob.heartbeat_at, IngestionJob.started_at)
+        rows = db.query(IngestionJob.id).filter(
+            IngestionJob.status == IngestionJobStatus.RUNNING,
+            last_seen < seen_before
+        ).order_by(IngestionJob.id).all()
+        requeued = []
+        for row in rows:
+            # Условие повторяется в UPDATE: задачу мог завершить ее воркер или вернуть другой процесс
+            updated = db.query(IngestionJob).filter(
+                IngestionJob.id == row.id,
+                IngestionJob.status == IngestionJobStatus.RUNNING,
+                last_seen < seen_before
+            ).update(
+                {
+                    IngestionJob.status: IngestionJobStatus.PENDING,
+                    IngestionJob.stage: None,
+                    IngestionJob.started_at: None,
+                    IngestionJob.heartbeat_at: None,
+                    IngestionJob.claim_token: None,
+                    IngestionJob.bytes_processed: 0,
+                    IngestionJob.chunks_count: 0,
+                },
+                synchronize_session=False
+            )
+            if updated == 1:
+                requeued.append(row.id)
+        db.commit()
+        return requeued
+    
+    @staticmethod
+    def claim(db: Session, job_id: int) -> Optional[str]:
+        """
+        Захватить задачу для обработки (PENDING -> RUNNING). Возвращает токен захвата
+        или None, если задачу уже взял другой воркер.
+        Условный UPDATE атомарен и в SQLite, и в PostgreSQL: если несколько воркеров
+        пытаются взять одну задачу, успешен только один.
+        """
+        claim_token = uuid.uuid4().hex
+        updated = db.query(IngestionJob).filter(
+            IngestionJob.id == job_id,
+            IngestionJob.status == IngestionJobStatus.PENDING
+        ).update(
+            {
+                IngestionJob.status: IngestionJobStatus.RUNNING,
+                IngestionJob.started_at: func.now(),
+                IngestionJob.heartbeat_at: func.now(),
+                IngestionJob.claim_token: claim_token,
+            },
+            synchronize_session=False
+        )
+        db.commit()
+        return claim_token if updated == 1 else None
+    
+    @staticmethod
+    def claim_next(db: Session) -> Optional[Tuple[int, str]]:
+        """Захватить самую старую ожидающую задачу. Возвращает (ID, токен захвата) или None, если очередь пуста."""
+        while True:
+            job_id = db.query(IngestionJob.id).filter(
+                IngestionJob.status == IngestionJobStatus.PENDING
+            ).order_by(IngestionJob.id).limit(1).scalar()
+            if job_id is None:
+                return None
+            claim_token = IngestionJobRepository.claim(db, job_id)
+            if claim_token is not None:
+                return job_id, claim_token
+            # Задачу перехватил другой воркер - берем следующую
+    
+    @staticmethod
+    def update_claimed(db: Session, job_id: int, claim_token: str, commit: bool = True, **values) -> bool:
+        """
+        Обновить поля задачи без загрузки объекта (прогресс, этап, результат),
+        если она все еще захвачена этим исполнителем (claim_token).
+        False - задачу вернули в очередь и, возможно, захватил другой воркер.
+        commit=False - изменение остается в текущей транзакции (например, вместе с книгой).
+        """
+        updated = db.query(IngestionJob).filter(
+            IngestionJob.id == job_id,
+            IngestionJob.claim_token == claim_token
+        ).update(
+            {getattr(IngestionJob, name): value for name, value in values.items()},
+            synchronize_session=False
+        )
+        if commit:
+            db.commit()
+        return updated == 1
@@ -11,6 +11,12 @@ class RecordingRepository:
         db.refresh(recording)
         return recording
     
+    @staticmethod
+    def add(db: Session, recording: Recording) -> Recording:
+        """Добавить запись в текущую транзакцию без commit"""
+        db.add(recording)
+        return recording
+    
     @staticmethod
     def get_by_id(db: Session, recording_id: int) -> Optional[Recording]:
         return db.query(Recording).filter(Recording.id == recording_id).first()
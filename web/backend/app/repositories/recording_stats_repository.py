@@ -0,0 +1,170 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, insert, select, update, func
+from sqlalchemy.exc import IntegrityError
+from typing import Dict, List, Optional, Tuple
+from datetime import date
+from app.models.recording_daily_stats import RecordingDailyStats
+from app.models.recording import Recording
+from app.models.chunk import Chunk
+from app.models.book import Book
+
+
+# Измерения, по которым группируются агрегаты (None - без группировки, общий итог)
+STATS_DIMENSIONS = {
+    None: None,
+    "day": RecordingDailyStats.day,
+    "speaker": RecordingDailyStats.speaker_id,
+    "book": RecordingDailyStats.book_id,
+    "category": RecordingDailyStats.category_id,
+}
+
+
+def day_key(value) -> str:
+    """Дата в формате YYYY-MM-DD (date или строка, например DATE() в SQLite)"""
+    return value.isoformat() if isinstance(value, date) else str(value)
+
+
+class RecordingStatsRepository:
+    @staticmethod
+    def add_recording(
+        db: Session,
+        day: date,
+        speaker_id: int,
+        book_id: int,
+        category_id: int,
+        count_delta: int,
+        duration_delta: float
+    ) -> None:
+        """
+        Учесть сохранение записи в дневном агрегате в текущей транзакции (без commit).
+        count_delta - 1 для новой записи, 0 для перезаписи; duration_delta - изменение длительности.
+        """
+        stats = RecordingDailyStats.__table__.c
+        stmt = update(RecordingDailyStats).where(
+            stats.day == day,
+            stats.speaker_id == speaker_id,
+            stats.book_id == book_id
+        ).values(
+            recordings_count=stats.recordings_count + count_delta,
+            total_duration=stats.total_duration + duration_delta
+        ).execution_options(synchronize_session=False)
+        if db.execute(stmt).rowcount:
+            return
+
+        try:
+            with db.begin_nested():
+                db.add(RecordingDailyStats(
+                    day=day,
+                    speaker_id=speaker_id,
+                    book_id=book_id,
+                    category_id=category_id,
+                    recordings_count=count_delta,
+                    total_duration=duration_delta
+                ))
+        except IntegrityError:
+            # Строку успел создать параллельный запрос - обновляем ее
+            db.execute(stmt)
+
+    @staticmethod
+    def aggregate(
+        db: Session,
+        dimension: Optional[str] = None,
+        day_from: Optional[date] = None,
+        day_to: Optional[date] = None,
+        speaker_id: Optional[int] = None,
+        book_id: Optional[int] = None,
+        category_id: Optional[int] = None
+    ) -> Dict[object, Tuple[float, int]]:
+        """
+        Суммы по дневным агрегатам за дни [day_from, day_to] с группировкой по dimension.
+        Возвращает {ключ: (длительность в секундах, количество записей)};
+        ключ дня - строка YYYY-MM-DD, без группировки - None.
+        """
+        column = STATS_DIMENSIONS[dimension]
+        columns = [column] if column is not None else []
+        query = db.query(
+            *columns,
+            func.sum(RecordingDailyStats.total_duration),
+            func.sum(RecordingDailyStats.recordings_count)
+        )
+
+        if day_from is not None:
+            query = query.filter(RecordingDailyStats.day >= day_from)
+        if day_to is not None:
+            query = query.filter(RecordingDailyStats.day <= day_to)
+        if speaker_id:
+            query = query.filter(RecordingDailyStats.speaker_id == speaker_id)
+        if book_id:
+            query = query.filter(RecordingDailyStats.book_id == book_id)
+        if category_id:
+            query = query.filter(RecordingDailyStats.category_id == category_id)
+
+        if column is None:
+            duration, count = query.one()
+            return {None: (duration or 0.0, count or 0)} if count else {}
+
+        result = {}
+        for key, duration, count in query.group_by(column).all():
+            if not count:
+                continue
+            result[day_key(key) if dimension == "day" else key] = (duration or 0.0, count)
+        return result
+
+    @staticmethod
+    def _raw_aggregates():
+        """Агрегаты по исходным таблицам в разрезе (день, спикер, книга, категория)"""
+        recorded_day = Recording.recorded_date
+        return select(
+            recorded_day,
+            Recording.speaker_id,
+            Chunk.book_id,
+            Book.category_id,
+            func.count(Recording.id),
+            func.coalesce(func.sum(Recording.duration), 0)
+        ).join(
+            Chunk, Chunk.id == Recording.chunk_id
+        ).join(
+            Book, Book.id == Chunk.book_id
+        ).group_by(recorded_day, Recording.speaker_id, Chunk.book_id, Book.category_id)
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """Пересчитать дневные агрегаты из таблицы recordings. Возвращает количество строк."""
+        db.execute(delete(RecordingDailyStats).execution_options(synchronize_session=False))
+        db.execute(insert(RecordingDailyStats).from_select(
+            ['day', 'speaker_id', 'book_id', 'category_id', 'recordings_count', 'total_duration'],
+            RecordingStatsRepository._raw_aggregates()
+        ))
+        db.commit()
+        return db.query(RecordingDailyStats).count()
+
+    @staticmethod
+    def find_mismatches(db: Session, tolerance: float = 1e-6) -> List[dict]:
+        """
+        Проверка согласованности: сравнивает дневные агрегаты с исходными таблицами.
+        Возвращает расхождения (пустой список - агрегаты верны).
+        """
+        expected = {
+            (day_key(day), speaker_id, book_id): (category_id, count, float(duration))
+            for day, speaker_id, book_id, category_id, count, duration
+            in db.execute(RecordingStatsRepository._raw_aggregates()).all()
+        }
+        actual = {
+            (day_key(row.day), row.speaker_id, row.book_id): (row.category_id, row.recordings_count, row.total_duration)
+            for row in db.query(RecordingDailyStats).all()
+        }
+
+        mismatches = []
+        for key in sorted(set(expected) | set(actual), key=lambda k: (k[0], k[1], k[2])):
+            exp = expected.get(key, (None, 0, 0.0))
+            act = actual.get(key, (None, 0, 0.0))
+            if exp[1] == act[1] and abs(exp[2] - act[2]) <= tolerance and (not exp[1] or exp[0] == act[0]):
+                continue
+            mismatches.append({
+                "day": key[0],
+                "speaker_id": key[1],
+                "book_id": key[2],
+                "expected": {"category_id": exp[0], "recordings_count": exp[1], "total_duration": exp[2]},
+                "actual": {"category_id": act[0], "recordings_count": act[1], "total_duration": act[2]},
+            })
+        return mismatches
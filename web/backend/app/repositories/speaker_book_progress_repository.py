@@ -0,0 +1,114 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import case, delete, insert, select, update, func
+from sqlalchemy.exc import IntegrityError
+from typing import Dict, List, Optional
+from app.models.speaker_book_progress import SpeakerBookProgress
+from app.models.book import Book
+from app.models.chunk import Chunk
+from app.models.recording import Recording
+
+
+class SpeakerBookProgressRepository:
+    @staticmethod
+    def get(db: Session, speaker_id: int, book_id: int) -> Optional[SpeakerBookProgress]:
+        return db.query(SpeakerBookProgress).filter(
+            SpeakerBookProgress.speaker_id == speaker_id,
+            SpeakerBookProgress.book_id == book_id
+        ).first()
+    
+    @staticmethod
+    def get_by_books(db: Session, speaker_id: int, book_ids: List[int]) -> Dict[int, SpeakerBookProgress]:
+        """Прогресс спикера по нескольким книгам: {book_id: прогресс}"""
+        if not book_ids:
+            return {}
+        rows = db.query(SpeakerBookProgress).filter(
+            SpeakerBookProgress.speaker_id == speaker_id,
+            SpeakerBookProgress.book_id.in_(book_ids)
+        ).all()
+        return {row.book_id: row for row in rows}
+    
+    @staticmethod
+    def add_recording(
+        db: Session,
+        speaker_id: int,
+        book_id: int,
+        order_index: int,
+        recorded_delta: int,
+        duration_delta: float
+    ) -> None:
+        """
+        Учесть сохранение записи в текущей транзакции (без commit).
+        recorded_delta - 1 для новой записи, 0 для перезаписи; duration_delta - изменение длительности.
+        Счетчики увеличиваются атомарным UPDATE, строка создается при первой записи спикера по книге.
+        """
+        progress = SpeakerBookProgress.__table__.c
+        stmt = update(SpeakerBookProgress).where(
+            progress.speaker_id == speaker_id,
+            progress.book_id == book_id
+        ).values(
+            recorded_chunks=progress.recorded_chunks + recorded_delta,
+            total_duration=progress.total_duration + duration_delta,
+            last_recorded_order_index=case(
+                (progress.last_recorded_order_index.is_(None), order_index),
+                (progress.last_recorded_order_index < order_index, order_index),
+                else_=progress.last_recorded_order_index
+            ),
+            # Записан чанк под указателем - сдвигаем указатель дальше
+            next_unrecorded_order_index=case(
+                (progress.next_unrecorded_order_index == order_index, order_index + 1),
+                else_=progress.next_unrecorded_order_index
+            )
+        ).execution_options(synchronize_session=False)
+        if db.execute(stmt).rowcount:
+            return
+        
+        try:
+            with db.begin_nested():
+                db.add(SpeakerBookProgress(
+                    speaker_id=speaker_id,
+                    book_id=book_id,
+                    recorded_chunks=recorded_delta,
+                    total_duration=duration_delta,
+                    last_recorded_order_index=order_index
+                ))
+        except IntegrityError:
+            # Строку успел создать параллельный запрос - обновляем ее
+            db.execute(stmt)
+    
+    @staticmethod
+    def set_next_unrecorded(db: Session, speaker_id: int, book_id: int, order_index: int) -> None:
+        """Запомнить позицию первого не записанного чанка (все чанки до нее записаны)"""
+        db.execute(update(SpeakerBookProgress).where(
+            SpeakerBookProgress.speaker_id == speaker_id,
+            SpeakerBookProgress.book_id == book_id
+        ).values(
+            next_unrecorded_order_index=order_index
+        ).execution_options(synchronize_session=False))
+        db.commit()
+    
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """
+        Пересчитать прогресс всех спикеров (и количество чанков книг) из таблиц chunks и recordings.
+        Возвращает количество строк прогресса.
+        """
+        # Указатели next_unrecorded_order_index сбрасываются и заполнятся заново при первом поиске
+        db.execute(delete(SpeakerBookProgress).execution_options(synchronize_session=False))
+        aggregates = select(
+            Recording.speaker_id,
+            Chunk.book_id,
+            func.count(Recording.id),
+            func.coalesce(func.sum(Recording.duration), 0),
+            func.max(Chunk.order_index)
+        ).join(
+            Chunk, Chunk.id == Recording.chunk_id
+        ).group_by(Recording.speaker_id, Chunk.book_id)
+        db.execute(insert(SpeakerBookProgress).from_select(
+            ['speaker_id', 'book_id', 'recorded_chunks', 'total_duration', 'last_recorded_order_index'],
+            aggregates
+        ))
+        
+        chunks_count = select(func.count(Chunk.id)).where(Chunk.book_id == Book.id).scalar_subquery()
+        db.execute(update(Book).values(chunks_count=chunks_count).execution_options(synchronize_session=False))
+        db.commit()
+        return db.query(SpeakerBookProgress).count()
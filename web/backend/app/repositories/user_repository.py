@@ -26,6 +26,12 @@ class UserRepository:
         db.refresh(user)
         return user
     
+    @staticmethod
+    def update(db: Session, user: User) -> User:
+        db.commit()
+        db.refresh(user)
+        return user
+    
     @staticmethod
     def delete(db: Session, user: User) -> None:
         # Use bulk delete to bypass relationship loading
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from app.schemas.pagination import PaginatedResponse
 from app.schemas.recording import RecordingResponse
 
@@ -20,7 +20,7 @@ class ChunkResponse(BaseModel):
 
 class ChunksPaginatedResponse(PaginatedResponse[ChunkResponse]):
     """Пагинированный ответ для чанков"""
-    pass
+    next_cursor: Optional[str] = None  # Курсор следующей страницы (None - страница последняя)
 
 
 class SpeakerChunkResponse(BaseModel):
@@ -39,9 +39,14 @@ class SpeakerChunkResponse(BaseModel):
         from_attributes = True
 
 
+class SpeakerNextChunkResponse(SpeakerChunkResponse):
+    """Чанк для записи (караоке режим) и следующие не записанные чанки для предзагрузки"""
+    next_chunks: List[ChunkResponse] = []
+
+
 class SpeakerChunksPaginatedResponse(PaginatedResponse[SpeakerChunkResponse]):
     """Пагинированный ответ для чанков спикера"""
-    pass
+    next_cursor: Optional[str] = None  # Курсор следующей страницы (None - страница последняя)
 
 
 
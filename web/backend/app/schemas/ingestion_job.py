@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Dict, Optional
+from app.models.ingestion_job import IngestionJobStatus
+
+
+class IngestionJobResponse(BaseModel):
+    """Состояние задачи загрузки книги"""
+    id: int
+    status: IngestionJobStatus
+    stage: Optional[str]
+    title: Optional[str]
+    original_filename: str
+    category_id: int
+    book_id: Optional[int]
+    bytes_total: int
+    bytes_processed: int
+    progress_percentage: float
+    chunks_count: int
+    stage_timings: Optional[Dict[str, float]]  # Время по этапам в секундах
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
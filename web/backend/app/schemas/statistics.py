@@ -58,3 +58,16 @@ class AdminStatisticsResponse(BaseModel):
 
 
 
+
+
+class StatisticsCacheMetricsResponse(BaseModel):
+    """Метрики кэша статистики (текущего процесса)"""
+    enabled: bool
+    backend: str
+    hits: int
+    misses: int
+    hit_ratio: float
+    invalidations: int
+    entries: Optional[int] = None
+    evictions: Optional[int] = None
+    expirations: Optional[int] = None
@@ -4,7 +4,12 @@ from datetime import timedelta
 
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
-from app.core.security import verify_password, create_access_token
+from app.core.security import (
+    verify_password_async,
+    get_password_hash_async,
+    password_needs_rehash,
+    create_access_token
+)
 from app.config import settings
 
 
@@ -13,7 +18,7 @@ class AuthService:
         self.db = db
         self.user_repo = UserRepository()
     
-    def authenticate_user(self, username: str, password: str) -> User:
+    async def authenticate_user(self, username: str, password: str) -> User:
         user = self.user_repo.get_by_username(self.db, username)
         if not user:
             raise HTTPException(
@@ -21,12 +26,18 @@ class AuthService:
                 detail="Incorrect username or password",
             )
         
-        if not verify_password(password, user.hashed_password):
+        # bcrypt выполняется в пуле потоков - вход не блокирует остальные запросы
+        if not await verify_password_async(password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
             )
         
+        # Переводим старый хеш на текущий BCRYPT_ROUNDS, пока известен пароль
+        if settings.PASSWORD_REHASH and password_needs_rehash(user.hashed_password):
+            user.hashed_password = await get_password_hash_async(password)
+            user = self.user_repo.update(self.db, user)
+        
         return user
     
     def create_token_for_user(self, user: User) -> str:
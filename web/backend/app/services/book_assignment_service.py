@@ -6,6 +6,7 @@ from app.models.user import User, UserRole
 from app.repositories.book_assignment_repository import BookAssignmentRepository
 from app.repositories.book_repository import BookRepository
 from app.repositories.user_repository import UserRepository
+from app.repositories.speaker_book_progress_repository import SpeakerBookProgressRepository
 from app.schemas.book_assignment import (
     BookWithSpeakersResponse,
     SpeakerWithBooksResponse,
@@ -20,6 +21,7 @@ class BookAssignmentService:
         self.assignment_repo = BookAssignmentRepository()
         self.book_repo = BookRepository()
         self.user_repo = UserRepository()
+        self.progress_repo = SpeakerBookProgressRepository()
     
     def assign_book_to_speaker(self, book_id: int, speaker_id: int) -> None:
         """Назначить книгу спикеру"""
@@ -122,42 +124,16 @@ class BookAssignmentService:
             speaker_data.assigned_books = []
             return speaker_data
         
-        # Оптимизация: получаем всю статистику одним запросом с JOIN
-        from app.models.chunk import Chunk
-        from app.models.recording import Recording
-        from sqlalchemy import func, case
-        
+        # Прогресс по всем книгам одним запросом к speaker_book_progress
         book_ids = [book.id for book in books]
-        
-        # Один запрос для получения статистики по всем книгам сразу
-        stats_query = self.db.query(
-            Chunk.book_id,
-            func.count(Chunk.id).label('total_chunks'),
-            func.count(case((Recording.id.isnot(None), 1))).label('recorded_chunks')
-        ).outerjoin(
-            Recording,
-            (Recording.chunk_id == Chunk.id) & (Recording.speaker_id == speaker_id)
-        ).filter(
-            Chunk.book_id.in_(book_ids)
-        ).group_by(Chunk.book_id)
-        
-        stats_results = stats_query.all()
-        
-        # Создаем словарь для быстрого доступа к статистике
-        stats_dict = {
-            book_id: {
-                'total_chunks': total,
-                'recorded_chunks': recorded
-            }
-            for book_id, total, recorded in stats_results
-        }
+        progress_by_book = self.progress_repo.get_by_books(self.db, speaker_id, book_ids)
         
         # Формируем ответ
         books_with_stats = []
         for book in books:
-            stats = stats_dict.get(book.id, {'total_chunks': 0, 'recorded_chunks': 0})
-            total_chunks = stats['total_chunks']
-            recorded_count = stats['recorded_chunks']
+            progress = progress_by_book.get(book.id)
+            total_chunks = book.chunks_count or 0
+            recorded_count = progress.recorded_chunks if progress else 0
             unrecorded_count = total_chunks - recorded_count
             progress_percentage = (recorded_count / total_chunks * 100) if total_chunks > 0 else 0.0
             
@@ -200,42 +176,16 @@ class BookAssignmentService:
             user_data.assigned_books = []
             return user_data
         
-        # Оптимизация: получаем всю статистику одним запросом с JOIN
-        from app.models.chunk import Chunk
-        from app.models.recording import Recording
-        from sqlalchemy import func, case
-        
+        # Прогресс по всем книгам одним запросом к speaker_book_progress
         book_ids = [book.id for book in books]
-        
-        # Один запрос для получения статистики по всем книгам сразу
-        stats_query = self.db.query(
-            Chunk.book_id,
-            func.count(Chunk.id).label('total_chunks'),
-            func.count(case((Recording.id.isnot(None), 1))).label('recorded_chunks')
-        ).outerjoin(
-            Recording,
-            (Recording.chunk_id == Chunk.id) & (Recording.speaker_id == user_id)
-        ).filter(
-            Chunk.book_id.in_(book_ids)
-        ).group_by(Chunk.book_id)
-        
-        stats_results = stats_query.all()
-        
-        # Создаем словарь для быстрого доступа к статистике
-        stats_dict = {
-            book_id: {
-                'total_chunks': total,
-                'recorded_chunks': recorded
-            }
-            for book_id, total, recorded in stats_results
-        }
+        progress_by_book = self.progress_repo.get_by_books(self.db, user_id, book_ids)
         
         # Формируем ответ
         books_with_stats = []
         for book in books:
-            stats = stats_dict.get(book.id, {'total_chunks': 0, 'recorded_chunks': 0})
-            total_chunks = stats['total_chunks']
-            recorded_count = stats['recorded_chunks']
+            progress = progress_by_book.get(book.id)
+            total_chunks = book.chunks_count or 0
+            recorded_count = progress.recorded_chunks if progress else 0
             unrecorded_count = total_chunks - recorded_count
             progress_percentage = (recorded_count / total_chunks * 100) if total_chunks > 0 else 0.0
             
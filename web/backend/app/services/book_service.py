@@ -1,14 +1,18 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from sqlalchemy.orm import Session
-from fastapi import HTTPException, status, UploadFile
-from typing import List
+from fastapi import HTTPException, status
+from typing import Callable, Iterable, List, Optional
 
 from app.models.book import Book
-from app.models.chunk import Chunk
 from app.repositories.book_repository import BookRepository
 from app.repositories.chunk_repository import ChunkRepository
 from app.repositories.category_repository import CategoryRepository
-from app.core.document_parser import parse_document
-from app.core.text_processor import split_text_into_chunks
+from app.services.statistics_service import statistics_cache
+from app.core.stage_timer import StageTimer
+from app.core.text_processor import TextChunkStream, MIN_SEGMENT_CHARS
+from app.config import settings
 
 
 class BookService:
@@ -47,95 +51,169 @@ class BookService:
             )
         return book
     
-    async def upload_book(
+    def create_book_from_text(
         self,
-        file: UploadFile,
+        pieces: Iterable[str],
         category_id: int,
-        title: str | None = None
+        title: str,
+        original_filename: str,
+        file_type: str,
+        file_size: int = 0,
+        timer: Optional[StageTimer] = None,
+        on_progress: Optional[Callable[[int], None]] = None,
+        before_commit: Optional[Callable[[Book], None]] = None
     ) -> Book:
-        # Проверяем существование категории
-        category = self.category_repo.get_by_id(self.db, category_id)
-        if not category:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Category not found",
-            )
-        
-        # Парсим документ
-        text, file_type = await parse_document(file)
+        """
+        Создает книгу из текста, поступающего по частям: нарезает его на чанки по мере чтения
+        и сохраняет их пачками. Вызывается из задачи загрузки (не в обработчике запроса).
         
-        # Определяем название книги
-        book_title = title or file.filename or "Untitled"
+        Args:
+            pieces: Текст документа по частям
+            file_size: Размер исходного файла в байтах (для выбора параллельной нарезки)
+            timer: Учет времени по этапам (chunking, saving)
+            on_progress: Вызывается с текущим количеством чанков по мере обработки
+            before_commit: Вызывается в транзакции книги перед commit (исключение отменяет сохранение)
+        """
+        timer = timer or StageTimer()
         
         # Создаем книгу
         new_book = Book(
-            title=book_title,
-            original_filename=file.filename or "unknown",
+            title=title,
+            original_filename=original_filename,
             file_type=file_type,
             category_id=category_id
         )
-        book = self.book_repo.create(self.db, new_book)
+        # Книга и ее чанки сохраняются в одной транзакции:
+        # при ошибке достаточно rollback, книга без чанков не появится
+        with timer.stage("saving"):
+            book = self.book_repo.add(self.db, new_book)
         
-        # Разбиваем текст на чанки
+        # Разбиваем текст на чанки по мере чтения и сохраняем пачками
         try:
-            chunks_text = split_text_into_chunks(text)
-        except Exception as e:
-            # Если не удалось разбить на чанки, удаляем книгу и возвращаем ошибку
-            self.book_repo.delete(self.db, book)
+            has_text, chunks_count = self._create_chunks_streaming(book, pieces, file_size, timer, on_progress)
+        except Exception:
+            # Если не удалось прочитать, разбить или сохранить чанки, книга не создается
+            self.db.rollback()
+            raise
+        
+        if not has_text:
+            self.db.rollback()
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to split text into chunks: {str(e)}"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Document is empty or could not be parsed"
             )
         
         # Проверяем, что получились чанки
-        if not chunks_text:
-            # Если чанков нет, удаляем книгу
-            self.book_repo.delete(self.db, book)
+        if not chunks_count:
+            # Если чанков нет, книга не создается
+            self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Could not create chunks from document. Document may be empty or invalid."
             )
         
-        # Создаем чанки с валидацией
-        chunks = []
-        for index, chunk_text in enumerate(chunks_text, start=1):
-            # Дополнительная валидация перед созданием
-            if not chunk_text or not chunk_text.strip():
-                continue
+        book.chunks_count = chunks_count
+        with timer.stage("saving"):
+            if before_commit:
+                before_commit(book)
+            self.db.commit()
+        return book
+    
+    def _create_chunks_streaming(
+        self,
+        book: Book,
+        pieces: Iterable[str],
+        file_size: int,
+        timer: StageTimer,
+        on_progress: Optional[Callable[[int], None]]
+    ) -> tuple[bool, int]:
+        """
+        Нарезает текст на чанки по мере чтения и добавляет их
+        в текущую транзакцию пачками по CHUNK_INSERT_BATCH_SIZE.
+        Возвращает (был ли в документе текст, количество чанков).
+        """
+        has_text = False
+        chunks_count = 0
+        batch: List[dict] = []
+        
+        def add_chunks(chunks_text: List[str]) -> None:
+            nonlocal chunks_count
+            for chunk_text in chunks_text:
+                # Дополнительная валидация перед созданием
+                if not chunk_text or not chunk_text.strip():
+                    continue
+                
+                chunks_count += 1
+                batch.append({
+                    "book_id": book.id,
+                    "text": chunk_text.strip(),
+                    "order_index": chunks_count,
+                    "estimated_duration": 0,
+                })
             
-            estimated_duration = 0
-            chunk = Chunk(
-                book_id=book.id,
-                text=chunk_text.strip(),
-                order_index=index,
-                estimated_duration=estimated_duration
-            )
-            chunks.append(chunk)
+            if len(batch) >= settings.CHUNK_INSERT_BATCH_SIZE:
+                with timer.stage("saving"):
+                    self._save_chunk_batch(batch)
+                batch.clear()
         
-        # Сохраняем чанки в БД
-        if chunks:
-            try:
-                self.chunk_repo.create_bulk(self.db, chunks)
-            except Exception as e:
-                # Если не удалось сохранить чанки, удаляем книгу
-                self.book_repo.delete(self.db, book)
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Failed to save chunks to database: {str(e)}"
+        with self._chunking_executor(file_size) as executor:
+            if executor is None:
+                stream = TextChunkStream()
+            else:
+                workers = settings.CHUNKING_WORKERS or os.cpu_count() or 1
+                stream = TextChunkStream(
+                    executor=executor,
+                    segment_chars=MIN_SEGMENT_CHARS,
+                    max_in_flight=workers * 2
                 )
-        else:
-            # Если не удалось создать валидные чанки, удаляем книгу
-            self.book_repo.delete(self.db, book)
+            
+            for piece in pieces:
+                has_text = has_text or bool(piece.strip())
+                with timer.stage("chunking"):
+                    chunks_text = self._split_step(stream.feed, piece)
+                add_chunks(chunks_text)
+                if on_progress:
+                    on_progress(chunks_count)
+            with timer.stage("chunking"):
+                chunks_text = self._split_step(stream.close)
+            add_chunks(chunks_text)
+        
+        if batch:
+            with timer.stage("saving"):
+                self._save_chunk_batch(batch)
+        if on_progress:
+            on_progress(chunks_count)
+        return has_text, chunks_count
+    
+    def _chunking_executor(self, file_size: int):
+        """Пул процессов для нарезки больших книг (CHUNKING_WORKERS, CHUNKING_PARALLEL_MIN_SIZE)."""
+        if settings.CHUNKING_WORKERS != 1 and file_size >= settings.CHUNKING_PARALLEL_MIN_SIZE:
+            return ProcessPoolExecutor(max_workers=settings.CHUNKING_WORKERS or None)
+        return nullcontext()
+    
+    @staticmethod
+    def _split_step(step, *args) -> List[str]:
+        try:
+            return step(*args)
+        except Exception as e:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No valid chunks could be created from the document."
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to split text into chunks: {str(e)}"
+            )
+    
+    def _save_chunk_batch(self, rows: List[dict]) -> None:
+        try:
+            self.chunk_repo.insert_bulk(self.db, rows, batch_size=settings.CHUNK_INSERT_BATCH_SIZE)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to save chunks to database: {str(e)}"
             )
-        
-        return book
     
     def delete_book(self, book_id: int) -> None:
         book = self.get_book_by_id(book_id)
         self.book_repo.delete(self.db, book)
+        statistics_cache.invalidate_all()
 
 
 
@@ -5,6 +5,7 @@ from typing import List
 from app.models.category import Category
 from app.repositories.category_repository import CategoryRepository
 from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.services.statistics_service import statistics_cache
 
 
 class CategoryService:
@@ -37,7 +38,10 @@ class CategoryService:
             name=category_data.name,
             description=category_data.description
         )
-        return self.category_repo.create(self.db, new_category)
+        category = self.category_repo.create(self.db, new_category)
+        # Статистика админа перечисляет все категории
+        statistics_cache.invalidate_all()
+        return category
     
     def update_category(self, category_id: int, category_data: CategoryUpdate) -> Category:
         category = self.get_category_by_id(category_id)
@@ -54,11 +58,14 @@ class CategoryService:
         if category_data.description is not None:
             category.description = category_data.description
         
-        return self.category_repo.update(self.db, category)
+        category = self.category_repo.update(self.db, category)
+        statistics_cache.invalidate_all()
+        return category
     
     def delete_category(self, category_id: int) -> None:
         category = self.get_category_by_id(category_id)
         self.category_repo.delete(self.db, category)
+        statistics_cache.invalidate_all()
 
 
 
@@ -1,11 +1,14 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from app.models.chunk import Chunk
+from app.models.recording import Recording
 from app.models.book import Book
 from app.repositories.chunk_repository import ChunkRepository
 from app.repositories.book_repository import BookRepository
+from app.repositories.speaker_book_progress_repository import SpeakerBookProgressRepository
+from app.core.pagination import decode_chunk_cursor
 
 
 class ChunkService:
@@ -13,16 +16,19 @@ class ChunkService:
         self.db = db
         self.chunk_repo = ChunkRepository()
         self.book_repo = BookRepository()
+        self.progress_repo = SpeakerBookProgressRepository()
     
     def get_chunks_by_book(
         self,
         book_id: int,
         page_number: int = 1,
         limit: int = 100,
-        search: str | None = None
+        search: str | None = None,
+        cursor: str | None = None
     ) -> Tuple[List[Chunk], int]:
         """
         Получить чанки книги с пагинацией и поиском.
+        Если передан cursor (next_cursor предыдущей страницы), page_number не используется.
         
         Returns:
             Tuple[List[Chunk], int]: (список чанков, общее количество чанков)
@@ -41,9 +47,71 @@ class ChunkService:
             book_id,
             page_number=page_number,
             limit=limit,
-            search=search
+            search=search,
+            after_order_index=decode_chunk_cursor(cursor, book_id) if cursor else None
         )
     
+    def get_chunks_with_recordings(
+        self,
+        book_id: int,
+        speaker_id: int,
+        page_number: int = 1,
+        limit: int = 100,
+        search: str | None = None,
+        status_filter: str = "all",
+        cursor: str | None = None
+    ) -> Tuple[List[Tuple[Chunk, Optional[Recording]]], int]:
+        """
+        Получить страницу чанков книги с записями спикера.
+        Фильтр по статусу записи и пагинация выполняются в БД.
+        Если передан cursor (next_cursor предыдущей страницы), page_number не используется.
+        
+        Returns:
+            Tuple[List[Tuple[Chunk, Optional[Recording]]], int]: (чанки с записью спикера или None, общее количество)
+        """
+        # Проверяем существование книги
+        book = self.book_repo.get_by_id(self.db, book_id)
+        if not book:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Book not found",
+            )
+        
+        return self.chunk_repo.get_by_book_with_recordings(
+            self.db,
+            book_id,
+            speaker_id,
+            page_number=page_number,
+            limit=limit,
+            search=search,
+            status_filter=status_filter,
+            after_order_index=decode_chunk_cursor(cursor, book_id) if cursor else None
+        )
+    
+    def get_next_unrecorded_chunks(self, book_id: int, speaker_id: int, count: int = 1) -> List[Chunk]:
+        """
+        Следующие не записанные спикером чанки книги (караоке режим).
+        Поиск начинается с указателя в speaker_book_progress, который сдвигается при загрузке записей;
+        если перед найденным чанком были пропуски, указатель переносится на него.
+        """
+        progress = self.progress_repo.get(self.db, speaker_id, book_id)
+        start = progress.next_unrecorded_order_index if progress else None
+        
+        chunks = self.chunk_repo.get_next_unrecorded_chunks(
+            self.db,
+            book_id,
+            speaker_id,
+            from_order_index=start,
+            limit=count
+        )
+        
+        if progress and chunks and chunks[0].order_index != start:
+            # Отсоединяем чанки от сессии, чтобы commit указателя не сбросил их загруженное состояние
+            for chunk in chunks:
+                self.db.expunge(chunk)
+            self.progress_repo.set_next_unrecorded(self.db, speaker_id, book_id, chunks[0].order_index)
+        return chunks
+    
     def get_chunk_by_id(self, chunk_id: int) -> Chunk:
         """Получить чанк по ID"""
         chunk = self.chunk_repo.get_by_id(self.db, chunk_id)
@@ -0,0 +1,362 @@
+import os
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from fastapi import HTTPException, status, UploadFile
+
+from app.database import SessionLocal
+from app.models.ingestion_job import IngestionJob, IngestionJobStatus
+from app.repositories.ingestion_job_repository import IngestionJobRepository
+from app.repositories.category_repository import CategoryRepository
+from app.services.book_service import BookService
+from app.core.document_parser import get_file_type, save_upload_file, decode_text_blocks, READ_BLOCK_SIZE
+from app.core.stage_timer import StageTimer
+from app.config import settings
+
+
+# Как часто задача сохраняет прогресс в БД (секунды)
+PROGRESS_REPORT_INTERVAL = 1.0
+
+# Как часто приложение (INGESTION_BACKEND=executor) ищет брошенные задачи (секунды)
+STALE_JOBS_CHECK_INTERVAL = 60.0
+
+
+def get_uploads_dir() -> Path:
+    """Директория для временных файлов загружаемых книг (создается при необходимости)"""
+    # INGESTION_UPLOADS_DIR задан относительно корня проекта (backend/)
+    backend_dir = Path(__file__).parent.parent.parent  # Переходим из app/services/ в backend/
+
+    if Path(settings.INGESTION_UPLOADS_DIR).is_absolute():
+        uploads_dir = Path(settings.INGESTION_UPLOADS_DIR)
+    else:
+        uploads_dir = backend_dir / settings.INGESTION_UPLOADS_DIR
+
+    uploads_dir.mkdir(parents=True, exist_ok=True)
+    return uploads_dir
+
+
+class IngestionService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.job_repo = IngestionJobRepository()
+        self.category_repo = CategoryRepository()
+
+    async def create_job(
+        self,
+        file: UploadFile,
+        category_id: int,
+        title: str | None = None,
+        created_by: int | None = None
+    ) -> IngestionJob:
+        """
+        Сохраняет загруженный файл и ставит книгу в очередь на обработку.
+        Разбор, нормализация, нарезка и сохранение чанков выполняются в фоне
+        (пул потоков приложения или отдельный воркер, см. INGESTION_BACKEND).
+        """
+        # Проверяем существование категории
+        category = self.category_repo.get_by_id(self.db, category_id)
+        if not category:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Category not found",
+            )
+
+        # Проверяем тип файла
+        file_type = get_file_type(file)
+
+        # Сохраняем файл во временную директорию
+        timer = StageTimer()
+        file_path = get_uploads_dir() / f"{uuid.uuid4().hex}.{file_type}"
+        try:
+            with timer.stage("upload"):
+                file_size = await save_upload_file(file, file_path)
+        except Exception as e:
+            file_path.unlink(missing_ok=True)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to save uploaded file: {str(e)}"
+            )
+
+        new_job = IngestionJob(
+            status=IngestionJobStatus.PENDING,
+            title=title or file.filename or "Untitled",
+            original_filename=file.filename or "unknown",
+            file_type=file_type,
+            file_path=str(file_path),
+            category_id=category_id,
+            created_by=created_by,
+            bytes_total=file_size,
+            bytes_processed=0,
+            chunks_count=0,
+            stage_timings=timer.snapshot()
+        )
+        job = self.job_repo.create(self.db, new_job)
+
+        if settings.INGESTION_BACKEND == "executor":
+            submit_ingestion_job(job.id)
+        return job
+
+    def get_job(self, job_id: int) -> IngestionJob:
+        job = self.job_repo.get_by_id(self.db, job_id)
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Ingestion job not found",
+            )
+        return job
+
+
+class _JobSupersededError(Exception):
+    """Задачу вернули в очередь (см. requeue_stale), пока она выполнялась: результат не сохраняется"""
+
+
+class _JobProgress:
+    """
+    Прогресс выполняемой задачи. Пишется в отдельной сессии, чтобы не фиксировать
+    транзакцию с чанками книги, и не чаще PROGRESS_REPORT_INTERVAL.
+    Вместе с прогрессом обновляется heartbeat_at: по нему брошенные задачи возвращаются в очередь.
+    Все изменения задачи проверяют claim_token: после повторного захвата прежний исполнитель ничего не пишет.
+    """
+
+    def __init__(self, job_id: int, claim_token: str, timer: StageTimer):
+        self.job_id = job_id
+        self.claim_token = claim_token
+        self.timer = timer
+        self.bytes_processed = 0
+        self.chunks_count = 0
+        self._reported_at = 0.0
+        self.db = SessionLocal()
+        self._single_writer = self.db.get_bind().dialect.name == "sqlite"
+
+    def read_blocks(self, file_path: str) -> Iterator[bytes]:
+        with open(file_path, 'rb') as f:
+            while True:
+                block = f.read(READ_BLOCK_SIZE)
+                if not block:
+                    break
+                self.bytes_processed += len(block)
+                yield block
+
+    def report(self, chunks_count: int) -> None:
+        self.chunks_count = chunks_count
+        # SQLite допускает одного писателя: транзакция книги держит блокировку до commit,
+        # поэтому промежуточный прогресс пишется только в PostgreSQL (в SQLite - по завершении)
+        if self._single_writer:
+            return
+        now = time.monotonic()
+        if now - self._reported_at < PROGRESS_REPORT_INTERVAL:
+            return
+        self._reported_at = now
+        IngestionJobRepository.update_claimed(
+            self.db,
+            self.job_id,
+            self.claim_token,
+            stage=self.timer.current,
+            bytes_processed=self.bytes_processed,
+            chunks_count=self.chunks_count,
+            stage_timings=self.timer.snapshot(),
+            heartbeat_at=func.now()
+        )
+
+    def complete(self, db: Session, book) -> None:
+        """
+        Отметить задачу выполненной в транзакции книги (db), перед ее commit:
+        если задачу уже перехватили, книга не сохраняется.
+        """
+        if not IngestionJobRepository.update_claimed(
+            db,
+            self.job_id,
+            self.claim_token,
+            commit=False,
+            status=IngestionJobStatus.COMPLETED,
+            stage=None,
+            book_id=book.id,
+            bytes_processed=self.bytes_processed,
+            chunks_count=self.chunks_count,
+            stage_timings=self.timer.snapshot(),
+            error=None,
+            finished_at=func.now()
+        ):
+            raise _JobSupersededError()
+
+    def record_timings(self) -> None:
+        """Время этапов с учетом commit книги (после complete)"""
+        IngestionJobRepository.update_claimed(
+            self.db,
+            self.job_id,
+            self.claim_token,
+            stage_timings=self.timer.snapshot()
+        )
+
+    def fail(self, error: str) -> bool:
+        """Отметить задачу неудачной. False - задачу уже перехватили (ничего не записано)."""
+        return IngestionJobRepository.update_claimed(
+            self.db,
+            self.job_id,
+            self.claim_token,
+            status=IngestionJobStatus.FAILED,
+            stage=None,
+            bytes_processed=self.bytes_processed,
+            chunks_count=0,
+            stage_timings=self.timer.snapshot(),
+            error=error,
+            finished_at=func.now()
+        )
+
+    def close(self) -> None:
+        self.db.close()
+
+
+def run_ingestion_job(job_id: int, claim_token: Optional[str] = None) -> bool:
+    """
+    Обработать задачу загрузки книги. Возвращает False, если задача уже
+    захвачена другим воркером (или не ожидает обработки) либо перехвачена во время выполнения.
+    claim_token - задача уже захвачена вызывающим (IngestionJobRepository.claim_next).
+    """
+    db = SessionLocal()
+    try:
+        if claim_token is None:
+            claim_token = IngestionJobRepository.claim(db, job_id)
+            if claim_token is None:
+                return False
+        job = IngestionJobRepository.get_by_id(db, job_id)
+        file_path = job.file_path
+        timer = StageTimer(job.stage_timings)
+        progress = _JobProgress(job_id, claim_token, timer)
+        try:
+            BookService(db).create_book_from_text(
+                timer.iterate("reading", decode_text_blocks(progress.read_blocks(file_path))),
+                category_id=job.category_id,
+                title=job.title,
+                original_filename=job.original_filename,
+                file_type=job.file_type,
+                file_size=job.bytes_total,
+                timer=timer,
+                on_progress=progress.report,
+                before_commit=lambda book: progress.complete(db, book)
+            )
+        except _JobSupersededError:
+            db.rollback()
+            print(f"⚠️  Ingestion job {job_id} was requeued while running, result discarded")
+            return False
+        except HTTPException as e:
+            owned = progress.fail(str(e.detail))
+        except Exception as e:
+            db.rollback()
+            owned = progress.fail(f"Failed to process book: {str(e)}")
+        else:
+            progress.record_timings()
+            owned = True
+        finally:
+            progress.close()
+
+        if not owned:
+            # Файл нужен воркеру, который перехватил задачу
+            return False
+        # Файл больше не нужен: текст книги сохранен в чанках
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+        return True
+    finally:
+        db.close()
+
+
+# Пул потоков для INGESTION_BACKEND=executor (создается при первой задаче)
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(settings.INGESTION_WORKERS, 1),
+                thread_name_prefix="ingestion"
+            )
+        return _executor
+
+
+def _run_in_executor(job_id: int) -> None:
+    try:
+        run_ingestion_job(job_id)
+    except Exception as e:
+        # Исключения задач пула никто не ожидает - выводим, чтобы не потерять
+        print(f"❌ Ingestion job {job_id} failed: {e}")
+
+
+def submit_ingestion_job(job_id: int) -> None:
+    """Отправить задачу в пул потоков приложения"""
+    _get_executor().submit(_run_in_executor, job_id)
+
+
+def requeue_stale_jobs(db: Session) -> List[int]:
+    """Вернуть в очередь задачи, брошенные остановленным или упавшим процессом (см. INGESTION_JOB_TIMEOUT)"""
+    job_ids = IngestionJobRepository.requeue_stale(db, settings.INGESTION_JOB_TIMEOUT)
+    if job_ids:
+        print(f"⚠️  Requeued stale ingestion jobs: {job_ids}")
+    return job_ids
+
+
+# Фоновая проверка брошенных задач для INGESTION_BACKEND=executor
+_stale_jobs_stop = threading.Event()
+_stale_jobs_thread: Optional[threading.Thread] = None
+
+
+def _watch_stale_jobs() -> None:
+    while not _stale_jobs_stop.wait(STALE_JOBS_CHECK_INTERVAL):
+        db = SessionLocal()
+        try:
+            job_ids = requeue_stale_jobs(db)
+        except Exception as e:
+            print(f"❌ Stale ingestion jobs check failed: {e}")
+            continue
+        finally:
+            db.close()
+        for job_id in job_ids:
+            submit_ingestion_job(job_id)
+
+
+def resume_pending_jobs() -> None:
+    """
+    Отправить в пул задачи, оставшиеся в очереди, и брошенные задачи в статусе RUNNING
+    (например, после перезапуска приложения). Брошенные задачи других процессов
+    приложения проверяются и дальше, раз в STALE_JOBS_CHECK_INTERVAL.
+    """
+    global _stale_jobs_thread
+    db = SessionLocal()
+    try:
+        requeue_stale_jobs(db)
+        job_ids = IngestionJobRepository.get_pending_ids(db)
+    finally:
+        db.close()
+    for job_id in job_ids:
+        submit_ingestion_job(job_id)
+
+    if _stale_jobs_thread is None:
+        _stale_jobs_stop.clear()
+        _stale_jobs_thread = threading.Thread(target=_watch_stale_jobs, name="ingestion-stale-jobs", daemon=True)
+        _stale_jobs_thread.start()
+
+
+def shutdown_ingestion_executor() -> None:
+    """
+    Остановить пул потоков, не дожидаясь выполняемых задач. Задачи, не начатые до остановки,
+    остаются в очереди (PENDING); прерванные задачи остаются в статусе RUNNING и возвращаются
+    в очередь по истечении INGESTION_JOB_TIMEOUT (при следующем запуске приложения,
+    проверкой других процессов приложения или воркером).
+    """
+    global _executor, _stale_jobs_thread
+    _stale_jobs_stop.set()
+    _stale_jobs_thread = None
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
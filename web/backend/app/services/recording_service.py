@@ -11,7 +11,11 @@ from app.repositories.recording_repository import RecordingRepository
 from app.repositories.chunk_repository import ChunkRepository
 from app.repositories.user_repository import UserRepository
 from app.repositories.book_repository import BookRepository
-from app.core.audio_processor import convert_to_wav_16bit_mono, save_audio_file
+from app.repositories.speaker_book_progress_repository import SpeakerBookProgressRepository
+from app.repositories.recording_stats_repository import RecordingStatsRepository
+from app.services.statistics_service import statistics_cache
+from app.core import dates
+from app.core.audio_processor import store_uploaded_audio
 from app.config import settings
 
 
@@ -22,6 +26,8 @@ class RecordingService:
         self.chunk_repo = ChunkRepository()
         self.user_repo = UserRepository()
         self.book_repo = BookRepository()
+        self.progress_repo = SpeakerBookProgressRepository()
+        self.stats_repo = RecordingStatsRepository()
     
     async def upload_recording(
         self,
@@ -71,23 +77,13 @@ class RecordingService:
                 detail="Book not found",
             )
         
-        # Читаем аудио файл
-        audio_data = await audio_file.read()
-        
-        # Определяем формат входного файла (будет определен автоматически по содержимому)
-        input_format = None
-        if audio_file.filename:
-            ext = audio_file.filename.lower().split('.')[-1]
-            if ext in ['wav', 'mp3', 'm4a', 'ogg', 'flac', 'aac', 'webm', 'opus']:
-                input_format = ext
-        
-        # Конвертируем в WAV с настройками качества из config
+        # Конвертируем в WAV с настройками качества из config и сохраняем файл
         # По умолчанию: 24-bit, 48kHz, mono (можно настроить в .env)
-        wav_data = convert_to_wav_16bit_mono(audio_data, input_format, audio_file.filename)
-        
-        # Сохраняем файл
-        audio_file_path, duration = save_audio_file(
-            wav_data,
+        # Загрузка не читается в память целиком: копируется на диск блоками и конвертируется
+        # из файла в файл в пуле потоков, не блокируя остальные запросы.
+        # Формат входного файла определяется по содержимому
+        audio_file_path, duration = await store_uploaded_audio(
+            audio_file.file,
             speaker.username,
             book.title,
             chunk_id
@@ -102,20 +98,47 @@ class RecordingService:
         
         if existing_recording:
             # Обновляем существующую запись
+            recorded_delta = 0
+            duration_delta = (duration or 0) - (existing_recording.duration or 0)
             existing_recording.audio_file_path = audio_file_path
             existing_recording.duration = duration
-            self.db.commit()
-            self.db.refresh(existing_recording)
             recording = existing_recording
         else:
             # Создаем новую запись
+            recorded_delta = 1
+            duration_delta = duration or 0
+            # created_at проставляет БД (server_default), день записи - в часовом поясе статистики
             recording = Recording(
                 chunk_id=chunk_id,
                 speaker_id=speaker_id,
                 audio_file_path=audio_file_path,
-                duration=duration
+                duration=duration,
+                recorded_date=dates.today()
             )
-            recording = self.recording_repo.create(self.db, recording)
+            self.recording_repo.add(self.db, recording)
+        
+        # Прогресс спикера по книге и дневные агрегаты статистики обновляются в той же транзакции, что и запись
+        self.progress_repo.add_recording(
+            self.db,
+            speaker_id,
+            book.id,
+            chunk.order_index,
+            recorded_delta,
+            duration_delta
+        )
+        self.db.flush()
+        self.stats_repo.add_recording(
+            self.db,
+            recording.recorded_date,
+            speaker_id,
+            book.id,
+            book.category_id,
+            recorded_delta,
+            duration_delta
+        )
+        self.db.commit()
+        statistics_cache.invalidate_speaker(speaker_id)
+        self.db.refresh(recording)
         
         return recording
     
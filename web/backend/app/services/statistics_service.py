@@ -1,12 +1,17 @@
+import threading
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from typing import Optional
-from datetime import datetime, timedelta
+from sqlalchemy import func, and_, tuple_
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
 from app.models.recording import Recording
 from app.models.chunk import Chunk
 from app.models.book import Book
 from app.models.category import Category
 from app.models.user import User, UserRole
+from app.repositories.recording_stats_repository import RecordingStatsRepository, day_key
+from app.core.cache import CacheBackend, load_cache_backend
+from app.core import dates
+from app.config import settings
 from app.schemas.statistics import (
     SpeakerStatisticsResponse,
     AdminStatisticsResponse,
@@ -17,26 +22,144 @@ from app.schemas.statistics import (
 )
 
 
+# Окно статистики для дневных агрегатов: (первый день, последний день, частичный первый день).
+# Частичный день - интервал времени [начало, полночь), который считается по таблице recordings.
+RollupWindow = Tuple[Optional[date], Optional[date], Optional[Tuple[datetime, datetime]]]
+
+
+class StatisticsCache:
+    """
+    Кэш ответов статистики с TTL. Ключ - нормализованные фильтры запроса и версии областей,
+    от которых зависит ответ: all (любое изменение справочников), any (записи любого спикера)
+    и speaker:<id> (записи спикера). Сохранение записи увеличивает версии any и speaker:<id>.
+    """
+    
+    ALL_SCOPE = "statistics:all"
+    ANY_SPEAKER_SCOPE = "statistics:any"
+    
+    def __init__(self):
+        self._backend: Optional[CacheBackend] = None
+        self._lock = threading.Lock()
+        # Счетчики обновляются из потоков запросов и пула, отдельно от ленивой загрузки бэкенда
+        self._counters_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return settings.STATISTICS_CACHE_TTL > 0
+    
+    @property
+    def backend(self) -> CacheBackend:
+        with self._lock:
+            if self._backend is None:
+                self._backend = load_cache_backend(
+                    settings.STATISTICS_CACHE_BACKEND,
+                    settings.STATISTICS_CACHE_MAX_ENTRIES
+                )
+            return self._backend
+    
+    @staticmethod
+    def speaker_scope(speaker_id: int) -> str:
+        return f"statistics:speaker:{speaker_id}"
+    
+    @staticmethod
+    def normalize_period(
+        period: Optional[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> tuple:
+        """Часть ключа для периода: даты важны только для custom, относительные периоды зависят от текущего дня"""
+        if period == "custom":
+            return (period, start_date.isoformat() if start_date else None, end_date.isoformat() if end_date else None)
+        if period in ("day", "week", "month"):
+            return (period, dates.today().isoformat())
+        return (None,)
+    
+    def get_or_compute(self, scopes: List[str], key: tuple, compute: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return compute()
+        
+        backend = self.backend
+        # Версии читаются до расчета: если запись сохранят во время расчета,
+        # результат ляжет под старым ключом и больше не будет найден
+        cache_key = repr((key, tuple(backend.get_versions(scopes))))
+        value = backend.get(cache_key)
+        if value is not None:
+            with self._counters_lock:
+                self.hits += 1
+            return value
+        
+        with self._counters_lock:
+            self.misses += 1
+        value = compute()
+        backend.set(cache_key, value, settings.STATISTICS_CACHE_TTL)
+        return value
+    
+    def invalidate_speaker(self, speaker_id: int) -> None:
+        """
+        Сбросить ответы, которые учитывают записи спикера: его собственную статистику и
+        статистику админа без фильтра по спикеру или с фильтром по нему. Фильтры по книге и
+        категории не сужают область: by_period в статистике админа их не учитывает.
+        """
+        if not self.enabled:
+            return
+        self.backend.bump_versions([self.ANY_SPEAKER_SCOPE, self.speaker_scope(speaker_id)])
+        with self._counters_lock:
+            self.invalidations += 1
+    
+    def invalidate_all(self) -> None:
+        """Сбросить все ответы (удаление книг и пользователей, изменение категорий)"""
+        if not self.enabled:
+            return
+        self.backend.bump_versions([self.ALL_SCOPE])
+        with self._counters_lock:
+            self.invalidations += 1
+    
+    def metrics(self) -> Dict[str, Any]:
+        with self._counters_lock:
+            hits, misses, invalidations = self.hits, self.misses, self.invalidations
+        requests = hits + misses
+        metrics = {
+            "enabled": self.enabled,
+            "backend": self.backend.name,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / requests if requests else 0.0,
+            "invalidations": invalidations,
+        }
+        metrics.update(self.backend.metrics())
+        return metrics
+
+
+# Кэш статистики процесса (общий для запросов)
+statistics_cache = StatisticsCache()
+
+
 class StatisticsService:
     def __init__(self, db: Session):
         self.db = db
+        self.stats_repo = RecordingStatsRepository()
     
     def _apply_date_filter(self, query, period, start_date, end_date):
         """Применить фильтр по дате к запросу"""
         if period == "day":
-            today = datetime.now().date()
-            return query.filter(func.date(Recording.created_at) == today)
+            # Полуоткрытый интервал по created_at (использует индекс), а не DATE(created_at) == сегодня
+            day_from, day_to = dates.day_range(dates.today())
+            return query.filter(Recording.created_at >= day_from, Recording.created_at < day_to)
         elif period == "week":
-            week_ago = datetime.now() - timedelta(days=7)
+            week_ago = dates.now() - timedelta(days=7)
             return query.filter(Recording.created_at >= week_ago)
         elif period == "month":
-            month_ago = datetime.now() - timedelta(days=30)
+            month_ago = dates.now() - timedelta(days=30)
             return query.filter(Recording.created_at >= month_ago)
         elif period == "custom" and start_date and end_date:
+            # Целые дни запроса: [полночь start_date, полночь после end_date), как и для day
             return query.filter(
                 and_(
-                    Recording.created_at >= start_date,
-                    Recording.created_at <= end_date
+                    Recording.created_at >= dates.day_start(start_date.date()),
+                    Recording.created_at < dates.day_range(end_date.date())[1]
                 )
             )
         return query
@@ -77,6 +200,32 @@ class StatisticsService:
         end_date: Optional[datetime] = None
     ) -> SpeakerStatisticsResponse:
         """Получить статистику для спикера."""
+        return statistics_cache.get_or_compute(
+            [StatisticsCache.ALL_SCOPE, StatisticsCache.speaker_scope(speaker_id)],
+            ("speaker", speaker_id, StatisticsCache.normalize_period(period, start_date, end_date)),
+            lambda: self._get_speaker_statistics(speaker_id, period, start_date, end_date)
+        )
+    
+    def _get_speaker_statistics(
+        self,
+        speaker_id: int,
+        period: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> SpeakerStatisticsResponse:
+        if settings.STATISTICS_STRATEGY == "rollup":
+            window = self._rollup_window(period, start_date, end_date)
+            return self._get_speaker_statistics_from_rollups(speaker_id, period, window)
+        return self._get_speaker_statistics_raw(speaker_id, period, start_date, end_date)
+    
+    def _get_speaker_statistics_raw(
+        self,
+        speaker_id: int,
+        period: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> SpeakerStatisticsResponse:
+        """Статистика спикера агрегатными запросами по таблице recordings."""
         # Базовый запрос для записей спикера
         base_query = self.db.query(Recording).filter(
             Recording.speaker_id == speaker_id
@@ -101,10 +250,10 @@ class StatisticsService:
             date_query = self._apply_date_filter(date_query, period, start_date, end_date)
             
             date_stats = date_query.with_entities(
-                func.date(Recording.created_at).label('date'),
+                Recording.recorded_date.label('date'),
                 func.sum(Recording.duration).label('total_duration'),
                 func.count(Recording.id).label('count')
-            ).group_by(func.date(Recording.created_at)).all()
+            ).group_by(Recording.recorded_date).all()
             
             for date, duration, count in date_stats:
                 period_stats.append(PeriodStatsItem(
@@ -183,6 +332,45 @@ class StatisticsService:
         category_id: Optional[int] = None
     ) -> AdminStatisticsResponse:
         """Получить статистику для админа (по всем пользователям)."""
+        speaker_scope = StatisticsCache.speaker_scope(speaker_id) if speaker_id else StatisticsCache.ANY_SPEAKER_SCOPE
+        return statistics_cache.get_or_compute(
+            [StatisticsCache.ALL_SCOPE, speaker_scope],
+            (
+                "admin",
+                StatisticsCache.normalize_period(period, start_date, end_date),
+                speaker_id or None,
+                book_id or None,
+                category_id or None
+            ),
+            lambda: self._get_admin_statistics(period, start_date, end_date, speaker_id, book_id, category_id)
+        )
+    
+    def _get_admin_statistics(
+        self,
+        period: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        speaker_id: Optional[int] = None,
+        book_id: Optional[int] = None,
+        category_id: Optional[int] = None
+    ) -> AdminStatisticsResponse:
+        if settings.STATISTICS_STRATEGY == "grouping_sets":
+            return self._get_admin_statistics_grouping_sets(period, start_date, end_date, speaker_id, book_id, category_id)
+        if settings.STATISTICS_STRATEGY == "rollup":
+            window = self._rollup_window(period, start_date, end_date)
+            return self._get_admin_statistics_from_rollups(period, window, speaker_id, book_id, category_id)
+        return self._get_admin_statistics_raw(period, start_date, end_date, speaker_id, book_id, category_id)
+    
+    def _get_admin_statistics_raw(
+        self,
+        period: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        speaker_id: Optional[int] = None,
+        book_id: Optional[int] = None,
+        category_id: Optional[int] = None
+    ) -> AdminStatisticsResponse:
+        """Статистика для админа агрегатными запросами по таблице recordings."""
         # Используем оптимизированный базовый запрос
         base_query = self._build_base_query(
             speaker_id=speaker_id,
@@ -214,10 +402,10 @@ class StatisticsService:
             date_query = self._apply_date_filter(date_query, period, start_date, end_date)
             
             date_stats = date_query.with_entities(
-                func.date(Recording.created_at).label('date'),
+                Recording.recorded_date.label('date'),
                 func.sum(Recording.duration).label('total_duration'),
                 func.count(Recording.id).label('count')
-            ).group_by(func.date(Recording.created_at)).all()
+            ).group_by(Recording.recorded_date).all()
             
             for date, duration, count in date_stats:
                 period_stats.append(PeriodStatsItem(
@@ -352,3 +540,338 @@ class StatisticsService:
             by_book=book_stats,
             by_category=category_stats
         )
+    
+    # ---- Статистика по дневным агрегатам (STATISTICS_STRATEGY=rollup) ----
+    
+    def _rollup_window(
+        self,
+        period: Optional[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> RollupWindow:
+        """
+        Перевести фильтр по дате в диапазон дней для дневных агрегатов.
+        week/month начинаются в середине дня: этот неполный день считается по recordings.
+        """
+        if period == "day":
+            today = dates.today()
+            return today, today, None
+        elif period in ("week", "month"):
+            since = dates.now() - timedelta(days=7 if period == "week" else 30)
+            next_day = since.date() + timedelta(days=1)
+            return next_day, None, (since, dates.day_start(next_day))
+        elif period == "custom" and start_date and end_date:
+            # Целые дни запроса, как и в _apply_date_filter
+            return start_date.date(), end_date.date(), None
+        return None, None, None
+    
+    def _aggregate(
+        self,
+        dimension: Optional[str],
+        window: RollupWindow,
+        speaker_id: Optional[int] = None,
+        book_id: Optional[int] = None,
+        category_id: Optional[int] = None
+    ) -> Dict[object, Tuple[float, int]]:
+        """Суммы (длительность, количество) по агрегатам за окно с группировкой по dimension"""
+        day_from, day_to, partial_day = window
+        groups = self.stats_repo.aggregate(
+            self.db,
+            dimension,
+            day_from=day_from,
+            day_to=day_to,
+            speaker_id=speaker_id,
+            book_id=book_id,
+            category_id=category_id
+        )
+        if partial_day:
+            partial = self._aggregate_recordings(dimension, partial_day[0], partial_day[1], speaker_id, book_id, category_id)
+            for key, (duration, count) in partial.items():
+                prev_duration, prev_count = groups.get(key, (0.0, 0))
+                groups[key] = (prev_duration + duration, prev_count + count)
+        return groups
+    
+    def _aggregate_recordings(
+        self,
+        dimension: Optional[str],
+        start: datetime,
+        end: datetime,
+        speaker_id: Optional[int] = None,
+        book_id: Optional[int] = None,
+        category_id: Optional[int] = None
+    ) -> Dict[object, Tuple[float, int]]:
+        """То же, что агрегаты, но по таблице recordings за интервал [start, end) (неполный день)"""
+        column = {
+            None: None,
+            "day": Recording.recorded_date,
+            "speaker": Recording.speaker_id,
+            "book": Chunk.book_id,
+            "category": Book.category_id,
+        }[dimension]
+        columns = [column] if column is not None else []
+        query = self.db.query(
+            *columns,
+            func.sum(Recording.duration),
+            func.count(Recording.id)
+        ).select_from(Recording).join(
+            Chunk, Recording.chunk_id == Chunk.id
+        ).join(
+            Book, Chunk.book_id == Book.id
+        ).filter(
+            Recording.created_at >= start,
+            Recording.created_at < end
+        )
+        
+        if speaker_id:
+            query = query.filter(Recording.speaker_id == speaker_id)
+        if book_id:
+            query = query.filter(Chunk.book_id == book_id)
+        if category_id:
+            query = query.filter(Book.category_id == category_id)
+        
+        if column is None:
+            duration, count = query.one()
+            return {None: (duration or 0.0, count)} if count else {}
+        
+        return {
+            day_key(key) if dimension == "day" else key: (duration or 0.0, count)
+            for key, duration, count in query.group_by(column).all()
+        }
+    
+    @staticmethod
+    def _period_items(groups: Dict[object, Tuple[float, int]]) -> list:
+        return [
+            PeriodStatsItem(
+                date=day,
+                duration_hours=duration / 3600.0,
+                recordings_count=count
+            )
+            for day, (duration, count) in sorted(groups.items())
+        ]
+    
+    def _book_items(self, groups: Dict[object, Tuple[float, int]]) -> list:
+        titles = dict(self.db.query(Book.id, Book.title).filter(Book.id.in_(list(groups))).all()) if groups else {}
+        return [
+            BookStatsItem(
+                book_id=b_id,
+                book_title=titles[b_id],
+                duration_hours=duration / 3600.0,
+                recordings_count=count
+            )
+            for b_id, (duration, count) in sorted(groups.items())
+            if b_id in titles
+        ]
+    
+    def _get_speaker_statistics_from_rollups(
+        self,
+        speaker_id: int,
+        period: Optional[str],
+        window: RollupWindow
+    ) -> SpeakerStatisticsResponse:
+        """Статистика спикера по дневным агрегатам (тот же ответ, что и по recordings)."""
+        total_duration, total_recordings = self._aggregate(None, window, speaker_id=speaker_id).get(None, (0.0, 0))
+        
+        # Статистика по периодам (по дням)
+        period_stats = []
+        if period in ["week", "month", "custom"] or period is None:
+            period_stats = self._period_items(self._aggregate("day", window, speaker_id=speaker_id))
+        
+        # Статистика по книгам
+        book_stats = self._book_items(self._aggregate("book", window, speaker_id=speaker_id))
+        
+        # Статистика по категориям (только категории с записями)
+        category_groups = self._aggregate("category", window, speaker_id=speaker_id)
+        names = dict(
+            self.db.query(Category.id, Category.name).filter(Category.id.in_(list(category_groups))).all()
+        ) if category_groups else {}
+        category_stats = [
+            CategoryStatsItem(
+                category_id=cat_id,
+                category_name=names[cat_id],
+                duration_hours=duration / 3600.0,
+                recordings_count=count
+            )
+            for cat_id, (duration, count) in sorted(category_groups.items())
+            if cat_id in names
+        ]
+        
+        return SpeakerStatisticsResponse(
+            total_duration_hours=total_duration / 3600.0,
+            total_recordings=total_recordings,
+            by_period=period_stats,
+            by_book=book_stats,
+            by_category=category_stats
+        )
+    
+    def _get_admin_statistics_from_rollups(
+        self,
+        period: Optional[str],
+        window: RollupWindow,
+        speaker_id: Optional[int] = None,
+        book_id: Optional[int] = None,
+        category_id: Optional[int] = None
+    ) -> AdminStatisticsResponse:
+        """Статистика для админа по дневным агрегатам (тот же ответ, что и по recordings)."""
+        filters = {"speaker_id": speaker_id, "book_id": book_id, "category_id": category_id}
+        
+        # Статистика по периодам (по дням) - как и в запросе по recordings, учитывается только фильтр по спикеру
+        day_groups = None
+        if period in ["week", "month", "custom"] or period is None:
+            day_groups = self._aggregate("day", window, speaker_id=speaker_id)
+        
+        return self._build_admin_response(
+            day_groups,
+            self._aggregate("speaker", window, **filters),
+            self._aggregate("book", window, **filters),
+            self._aggregate("category", window, **filters),
+            category_id
+        )
+    
+    def _build_admin_response(
+        self,
+        day_groups: Optional[Dict[object, Tuple[float, int]]],
+        speaker_groups: Dict[object, Tuple[float, int]],
+        book_groups: Dict[object, Tuple[float, int]],
+        category_groups: Dict[object, Tuple[float, int]],
+        category_id: Optional[int] = None
+    ) -> AdminStatisticsResponse:
+        """Ответ для админа из сумм по измерениям. Общие итоги - сумма по спикерам (у записи ровно один спикер)."""
+        total_duration = sum(duration for duration, _ in speaker_groups.values())
+        total_recordings = sum(count for _, count in speaker_groups.values())
+        
+        # Статистика по спикерам
+        usernames = dict(
+            self.db.query(User.id, User.username).filter(User.id.in_(list(speaker_groups))).all()
+        ) if speaker_groups else {}
+        speaker_stats = [
+            SpeakerStatsItem(
+                speaker_id=user_id,
+                speaker_username=usernames[user_id],
+                duration_hours=duration / 3600.0,
+                recordings_count=count
+            )
+            for user_id, (duration, count) in sorted(speaker_groups.items())
+            if user_id in usernames
+        ]
+        
+        # Статистика по категориям - все категории (или выбранная), в том числе без записей
+        categories_query = self.db.query(Category.id, Category.name)
+        if category_id:
+            categories_query = categories_query.filter(Category.id == category_id)
+        category_stats = []
+        for cat_id, cat_name in categories_query.all():
+            duration, count = category_groups.get(cat_id, (0.0, 0))
+            category_stats.append(CategoryStatsItem(
+                category_id=cat_id,
+                category_name=cat_name,
+                duration_hours=duration / 3600.0,
+                recordings_count=count
+            ))
+        
+        return AdminStatisticsResponse(
+            total_duration_hours=total_duration / 3600.0,
+            total_recordings=total_recordings,
+            total_speakers=len(speaker_groups),
+            by_period=self._period_items(day_groups) if day_groups is not None else [],
+            by_speaker=speaker_stats,
+            by_book=self._book_items(book_groups),
+            by_category=category_stats
+        )
+    
+    # ---- Статистика одним проходом по записям (STATISTICS_STRATEGY=grouping_sets) ----
+    
+    def _get_admin_statistics_grouping_sets(
+        self,
+        period: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        speaker_id: Optional[int] = None,
+        book_id: Optional[int] = None,
+        category_id: Optional[int] = None
+    ) -> AdminStatisticsResponse:
+        """
+        Статистика для админа одним проходом по отфильтрованным записям.
+        PostgreSQL: GROUP BY GROUPING SETS ((день), (спикер), (книга), (категория)).
+        Другие БД: GROUP BY по всем измерениям сразу, свертка по каждому измерению в Python.
+        """
+        dimensions = {
+            "speaker": Recording.speaker_id,
+            "book": Chunk.book_id,
+            "category": Book.category_id,
+        }
+        # by_period в запросе по recordings учитывает только фильтр по спикеру:
+        # при фильтре по книге или категории дни считаются отдельным запросом
+        with_period = period in ["week", "month", "custom"] or period is None
+        if with_period and not book_id and not category_id:
+            dimensions["day"] = Recording.recorded_date
+        
+        query = self.db.query(Recording).join(
+            Chunk, Recording.chunk_id == Chunk.id
+        ).join(
+            Book, Chunk.book_id == Book.id
+        )
+        if speaker_id:
+            query = query.filter(Recording.speaker_id == speaker_id)
+        if book_id:
+            query = query.filter(Chunk.book_id == book_id)
+        if category_id:
+            query = query.filter(Book.category_id == category_id)
+        query = self._apply_date_filter(query, period, start_date, end_date)
+        
+        columns = list(dimensions.values())
+        groups = {name: {} for name in dimensions}
+        if self.db.get_bind().dialect.name == "postgresql":
+            rows = query.with_entities(
+                *columns,
+                *[func.grouping(column) for column in columns],
+                func.sum(Recording.duration),
+                func.count(Recording.id)
+            ).group_by(
+                func.grouping_sets(*[tuple_(column) for column in columns])
+            ).all()
+            
+            n = len(columns)
+            for row in rows:
+                keys, flags = row[:n], row[n:2 * n]
+                duration, count = row[2 * n], row[2 * n + 1]
+                # В строке набора (измерение) GROUPING(измерение) = 0, для остальных 1
+                name = list(dimensions)[list(flags).index(0)]
+                key = keys[list(dimensions).index(name)]
+                groups[name][day_key(key) if name == "day" else key] = (duration or 0.0, count)
+        else:
+            rows = query.with_entities(
+                *columns,
+                func.sum(Recording.duration),
+                func.count(Recording.id)
+            ).group_by(*columns).all()
+            
+            for row in rows:
+                duration, count = row[-2] or 0.0, row[-1]
+                for name, key in zip(dimensions, row):
+                    if name == "day":
+                        key = day_key(key)
+                    prev_duration, prev_count = groups[name].get(key, (0.0, 0))
+                    groups[name][key] = (prev_duration + duration, prev_count + count)
+        
+        day_groups = groups.get("day")
+        if with_period and day_groups is None:
+            date_query = self.db.query(Recording)
+            if speaker_id:
+                date_query = date_query.filter(Recording.speaker_id == speaker_id)
+            date_query = self._apply_date_filter(date_query, period, start_date, end_date)
+            day_groups = {
+                day_key(day): (duration or 0.0, count)
+                for day, duration, count in date_query.with_entities(
+                    Recording.recorded_date,
+                    func.sum(Recording.duration),
+                    func.count(Recording.id)
+                ).group_by(Recording.recorded_date).all()
+            }
+        
+        return self._build_admin_response(
+            day_groups,
+            groups["speaker"],
+            groups["book"],
+            groups["category"],
+            category_id
+        )
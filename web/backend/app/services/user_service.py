@@ -4,7 +4,9 @@ from typing import List
 
 from app.models.user import User, UserRole
 from app.repositories.user_repository import UserRepository
-from app.core.security import get_password_hash
+from app.services.statistics_service import statistics_cache
+from app.core.security import get_password_hash_async
+from app.core.user_cache import user_cache
 from app.schemas.user import UserCreate, UserUpdate
 
 
@@ -25,7 +27,7 @@ class UserService:
             )
         return user
     
-    def create_user(self, user_data: UserCreate) -> User:
+    async def create_user(self, user_data: UserCreate) -> User:
         # Проверяем, существует ли пользователь с таким username
         existing_user = self.user_repo.get_by_username(self.db, user_data.username)
         if existing_user:
@@ -37,7 +39,7 @@ class UserService:
         # Всегда создаем пользователя как speaker
         new_user = User(
             username=user_data.username,
-            hashed_password=get_password_hash(user_data.password),
+            hashed_password=await get_password_hash_async(user_data.password),
             role=UserRole.SPEAKER
         )
         return self.user_repo.create(self.db, new_user)
@@ -51,6 +53,8 @@ class UserService:
                 detail="Cannot delete admin user",
             )
         self.user_repo.delete(self.db, user)
+        user_cache.invalidate(user_id)
+        statistics_cache.invalidate_all()
 
 
 
@@ -0,0 +1,55 @@
+"""
+Воркер загрузки книг для INGESTION_BACKEND=queue.
+Берет задачи из таблицы ingestion_jobs (SQLite или PostgreSQL) - внешний брокер не нужен.
+Можно запускать несколько воркеров: задача захватывается условным UPDATE и выполняется один раз.
+
+Запуск:
+    python -m app.worker
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from app.database import SessionLocal
+from app.repositories.ingestion_job_repository import IngestionJobRepository
+from app.services.ingestion_service import run_ingestion_job, requeue_stale_jobs
+from app.config import settings
+
+
+def claim_next_job():
+    db = SessionLocal()
+    try:
+        # Задачи упавших воркеров (RUNNING дольше INGESTION_JOB_TIMEOUT) снова попадают в очередь
+        requeue_stale_jobs(db)
+        return IngestionJobRepository.claim_next(db)
+    finally:
+        db.close()
+
+
+def run_worker() -> None:
+    """Опрашивает очередь и обрабатывает до INGESTION_WORKERS задач одновременно"""
+    workers = max(settings.INGESTION_WORKERS, 1)
+    running = set()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingestion") as executor:
+        while True:
+            if running:
+                done, running = wait(running, timeout=0 if len(running) < workers else None, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is not None:
+                        print(f"❌ Ingestion job failed: {future.exception()}")
+            if len(running) >= workers:
+                continue
+
+            claimed = claim_next_job()
+            if claimed is None:
+                time.sleep(settings.INGESTION_POLL_INTERVAL)
+                continue
+            job_id, claim_token = claimed
+            running.add(executor.submit(run_ingestion_job, job_id, claim_token))
+
+
+if __name__ == "__main__":
+    print(f"Ingestion worker started ({settings.INGESTION_WORKERS} workers)")
+    try:
+        run_worker()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,13 @@
+import os
+import sys
+from pathlib import Path
+
+# Тесты запускаются из web/backend: пакет app импортируется из этой папки
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Обязательные настройки (app.config) для модулей, которые их читают
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-0123456789abcdef0123")
+os.environ.setdefault("DEFAULT_ADMIN_USERNAME", "admin")
+os.environ.setdefault("DEFAULT_ADMIN_PASSWORD", "admin")
@@ -0,0 +1,217 @@
+"""
+Конвертация записей через AUDIO_FFMPEG_BINARY: вместо ffmpeg подставляются
+shell-скрипты (ожидание, ошибка, копирование готового WAV).
+"""
+import asyncio
+import io
+import os
+import stat
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.core import audio_processor
+from app.core.pcm import build_wav_header
+from app.core.worker_pool import WorkerPool
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="stub converters are shell scripts")
+
+# Не WAV: такие записи всегда конвертируются через AUDIO_FFMPEG_BINARY
+OGG_UPLOAD = b"OggS" + bytes(1020)
+
+
+def write_stub(tmp_path, name: str, body: str) -> str:
+    path = tmp_path / name
+    path.write_text("#!/bin/sh\n" + body + "\n")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+@pytest.fixture
+def converter(tmp_path, monkeypatch):
+    """Подставляет скрипт вместо ffmpeg; записи сохраняются во временную папку"""
+    monkeypatch.setattr(settings, "WAVS_DIR", str(tmp_path / "wavs"))
+    monkeypatch.setattr(settings, "AUDIO_CONVERSION_TIMEOUT", 5.0)
+
+    def use(body: str) -> None:
+        monkeypatch.setattr(settings, "AUDIO_FFMPEG_BINARY", write_stub(tmp_path, "ffmpeg-stub", body))
+        audio_processor._find_binary.cache_clear()
+
+    yield use
+    audio_processor._find_binary.cache_clear()
+
+
+@pytest.fixture
+def converted_wav(tmp_path):
+    """Готовый результат конвертации: 1 секунда тишины в целевом формате"""
+    bit_depth = audio_processor.target_bit_depth()
+    data_size = settings.AUDIO_SAMPLE_RATE * settings.AUDIO_CHANNELS * bit_depth // 8
+    path = tmp_path / "converted.wav"
+    path.write_bytes(build_wav_header(settings.AUDIO_CHANNELS, settings.AUDIO_SAMPLE_RATE, bit_depth, data_size) + bytes(data_size))
+    return path
+
+
+# Копирует готовый WAV в выходной файл (последний аргумент команды)
+COPY_OUTPUT = 'for out in "$@"; do :; done\ncp "{wav}" "$out"'
+
+
+def upload(chunk_id: int = 1):
+    return audio_processor.save_uploaded_audio(io.BytesIO(OGG_UPLOAD), "speaker", "book", chunk_id)
+
+
+def test_converter_output_is_stored(converter, converted_wav, tmp_path):
+    converter(COPY_OUTPUT.format(wav=converted_wav))
+    before = audio_processor.ffmpeg_stats.snapshot()
+
+    relative_path, duration = upload()
+
+    assert relative_path.endswith("speaker/book_1.wav")
+    assert duration == pytest.approx(1.0)
+    assert (tmp_path / "wavs" / "speaker" / "book_1.wav").read_bytes() == converted_wav.read_bytes()
+    # Временные файлы загрузки удалены
+    assert os.listdir(tmp_path / "wavs" / "speaker") == ["book_1.wav"]
+    after = audio_processor.ffmpeg_stats.snapshot()
+    assert after["runs"] == before["runs"] + 1
+    assert after["errors"] == before["errors"]
+    assert after["input_bytes"] == before["input_bytes"] + len(OGG_UPLOAD)
+
+
+def test_converter_error_returns_400(converter, tmp_path):
+    converter("echo 'Invalid data found when processing input' >&2\nexit 1")
+    before = audio_processor.ffmpeg_stats.snapshot()
+
+    with pytest.raises(HTTPException) as exc:
+        upload()
+
+    assert exc.value.status_code == 400
+    assert "Invalid data found" in exc.value.detail
+    after = audio_processor.ffmpeg_stats.snapshot()
+    assert after["runs"] == before["runs"] + 1
+    assert after["errors"] == before["errors"] + 1
+    assert after["timeouts"] == before["timeouts"]
+    assert os.listdir(tmp_path / "wavs" / "speaker") == []
+
+
+def test_converter_timeout_returns_504(converter, monkeypatch, tmp_path):
+    converter("exec sleep 10")
+    monkeypatch.setattr(settings, "AUDIO_CONVERSION_TIMEOUT", 0.5)
+    before = audio_processor.ffmpeg_stats.snapshot()
+
+    with pytest.raises(HTTPException) as exc:
+        upload()
+
+    assert exc.value.status_code == 504
+    after = audio_processor.ffmpeg_stats.snapshot()
+    assert after["errors"] == before["errors"] + 1
+    assert after["timeouts"] == before["timeouts"] + 1
+    assert os.listdir(tmp_path / "wavs" / "speaker") == []
+
+
+def test_full_conversion_queue_returns_503(converter, converted_wav, monkeypatch):
+    converter("sleep 1\n" + COPY_OUTPUT.format(wav=converted_wav))
+    monkeypatch.setattr(settings, "AUDIO_CONVERSION_WORKERS", 1)
+    monkeypatch.setattr(settings, "AUDIO_CONVERSION_MAX_QUEUE", 1)
+    pool = WorkerPool(
+        "audio-convert-test",
+        workers=lambda: settings.AUDIO_CONVERSION_WORKERS,
+        max_queue=lambda: settings.AUDIO_CONVERSION_MAX_QUEUE,
+        busy_detail=audio_processor.audio_conversion_pool.busy_detail,
+    )
+    monkeypatch.setattr(audio_processor, "audio_conversion_pool", pool)
+
+    async def scenario():
+        store = audio_processor.store_uploaded_audio
+        # Первая запись конвертируется, вторая ждет в очереди
+        running = asyncio.create_task(store(io.BytesIO(OGG_UPLOAD), "speaker", "book", 1))
+        queued = asyncio.create_task(store(io.BytesIO(OGG_UPLOAD), "speaker", "book", 2))
+        await asyncio.sleep(0.3)
+        with pytest.raises(HTTPException) as exc:
+            await store(io.BytesIO(OGG_UPLOAD), "speaker", "book", 3)
+        return exc.value, await asyncio.gather(running, queued)
+
+    try:
+        error, results = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+    assert error.status_code == 503
+    assert error.detail == pool.busy_detail
+    assert [path.rsplit("/", 1)[1] for path, _ in results] == ["book_1.wav", "book_2.wav"]
+    metrics = pool.metrics()
+    assert metrics["rejected"] == 1
+    assert metrics["completed"] == 2
+    assert metrics["failed"] == 0
+
+
+def test_wav_with_unsupported_rate_goes_to_converter(converter, converted_wav):
+    converter(COPY_OUTPUT.format(wav=converted_wav))
+    # Частота из заголовка вне MIN_SAMPLE_RATE..MAX_SAMPLE_RATE: NumPy ее не ресемплирует
+    body = build_wav_header(1, 1_000_003, 16, 9600) + bytes(9600)
+    before = audio_processor.ffmpeg_stats.snapshot()
+
+    _, duration = audio_processor.save_uploaded_audio(io.BytesIO(body), "speaker", "book", 1)
+
+    assert duration == pytest.approx(1.0)
+    assert audio_processor.ffmpeg_stats.snapshot()["runs"] == before["runs"] + 1
+
+
+def test_wav_conversion_timeout_returns_504(converter, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "AUDIO_CONVERSION_TIMEOUT", 0.0)
+    body = build_wav_header(1, 44100, 16, 88200) + bytes(88200)
+    before = audio_processor.pcm_stats.snapshot()
+
+    with pytest.raises(HTTPException) as exc:
+        audio_processor.save_uploaded_audio(io.BytesIO(body), "speaker", "book", 1)
+
+    assert exc.value.status_code == 504
+    assert audio_processor.pcm_stats.snapshot()["timeouts"] == before["timeouts"] + 1
+    assert os.listdir(tmp_path / "wavs" / "speaker") == []
+
+
+def adpcm_wav() -> bytes:
+    """WAV со сжатием (format tag 0x0002): NumPy его не читает, запись уходит в ffmpeg"""
+    header = bytearray(build_wav_header(1, 44100, 16, 9600))
+    header[20:22] = (2).to_bytes(2, "little")
+    return bytes(header) + bytes(9600)
+
+
+def test_wav_upload_replaces_existing_file(converter, converted_wav, tmp_path):
+    converter("exit 1")
+    speaker_dir = tmp_path / "wavs" / "speaker"
+    speaker_dir.mkdir(parents=True)
+    (speaker_dir / "book_1.wav").write_bytes(b"old recording")
+
+    _, duration = audio_processor.save_uploaded_audio(io.BytesIO(converted_wav.read_bytes()), "speaker", "book", 1)
+
+    assert duration == pytest.approx(1.0)
+    assert (speaker_dir / "book_1.wav").read_bytes() == converted_wav.read_bytes()
+    assert os.listdir(speaker_dir) == ["book_1.wav"]
+
+
+def test_failed_wav_upload_keeps_existing_file(converter, tmp_path):
+    converter("echo 'Invalid data found when processing input' >&2\nexit 1")
+    speaker_dir = tmp_path / "wavs" / "speaker"
+    speaker_dir.mkdir(parents=True)
+    (speaker_dir / "book_1.wav").write_bytes(b"old recording")
+
+    with pytest.raises(HTTPException) as exc:
+        audio_processor.save_uploaded_audio(io.BytesIO(adpcm_wav()), "speaker", "book", 1)
+
+    assert exc.value.status_code == 400
+    # Старая запись не тронута, временные .upload/.part удалены
+    assert (speaker_dir / "book_1.wav").read_bytes() == b"old recording"
+    assert os.listdir(speaker_dir) == ["book_1.wav"]
+
+
+def test_compressed_wav_falls_back_to_converter(converter, converted_wav, tmp_path):
+    converter(COPY_OUTPUT.format(wav=converted_wav))
+    before = audio_processor.ffmpeg_stats.snapshot()
+    pcm_before = audio_processor.pcm_stats.snapshot()
+
+    _, duration = audio_processor.save_uploaded_audio(io.BytesIO(adpcm_wav()), "speaker", "book", 1)
+
+    assert duration == pytest.approx(1.0)
+    assert audio_processor.ffmpeg_stats.snapshot()["runs"] == before["runs"] + 1
+    assert audio_processor.pcm_stats.snapshot()["runs"] == pcm_before["runs"]
+    assert os.listdir(tmp_path / "wavs" / "speaker") == ["book_1.wav"]
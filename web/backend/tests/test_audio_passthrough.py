@@ -0,0 +1,113 @@
+"""
+WAV, который уже в целевом формате, сохраняется без перекодирования:
+файл переименовывается или переписывается только заголовок.
+"""
+import struct
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.core import audio_processor, pcm
+
+
+@pytest.fixture(autouse=True)
+def target_format(monkeypatch):
+    monkeypatch.setattr(settings, "AUDIO_SAMPLE_RATE", 48000)
+    monkeypatch.setattr(settings, "AUDIO_BIT_DEPTH", 24)
+    monkeypatch.setattr(settings, "AUDIO_CHANNELS", 1)
+
+
+# 0.5 с 24-bit моно: произвольные байты отсчетов
+PCM_DATA = np.random.default_rng(0).integers(0, 256, size=24000 * 3, dtype=np.uint8).tobytes()
+
+
+def chunk(chunk_id: bytes, body: bytes) -> bytes:
+    return chunk_id + struct.pack('<I', len(body)) + body + (b'\0' if len(body) & 1 else b'')
+
+
+def extensible_wav(data: bytes) -> bytes:
+    """WAVE_FORMAT_EXTENSIBLE, SubFormat - PCM"""
+    fmt = struct.pack('<HHIIHH', pcm.WAVE_FORMAT_EXTENSIBLE, 1, 48000, 48000 * 3, 3, 24)
+    fmt += struct.pack('<HHI', 22, 24, 0x4) + struct.pack('<H', pcm.WAVE_FORMAT_PCM) + b'\x00\x00\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71'
+    body = b'WAVE' + chunk(b'fmt ', fmt) + chunk(b'data', data)
+    return b'RIFF' + struct.pack('<I', len(body)) + body
+
+
+def wav_with_list_chunk(data: bytes) -> bytes:
+    standard = pcm.build_wav_header(1, 48000, 24, len(data))
+    body = b'WAVE' + standard[12:36] + chunk(b'LIST', b'INFOISFT\x05\x00\x00\x00Lavf\x00') + chunk(b'data', data)
+    return b'RIFF' + struct.pack('<I', len(body)) + body
+
+
+def streamed_wav(data: bytes) -> bytes:
+    """Записан в поток: размеры RIFF и data не проставлены (0xFFFFFFFF)"""
+    header = bytearray(pcm.build_wav_header(1, 48000, 24, len(data)))
+    struct.pack_into('<I', header, 4, 0xFFFFFFFF)
+    struct.pack_into('<I', header, 40, 0xFFFFFFFF)
+    return bytes(header) + data
+
+
+def stats_runs():
+    return {name: stats.snapshot()["runs"] for name, stats in (
+        ("passthrough", audio_processor.passthrough_stats),
+        ("pcm", audio_processor.pcm_stats),
+        ("ffmpeg", audio_processor.ffmpeg_stats),
+    )}
+
+
+def test_standard_wav_is_renamed(tmp_path):
+    original = pcm.build_wav_header(1, 48000, 24, len(PCM_DATA)) + PCM_DATA
+    input_path, output_path = tmp_path / "upload", tmp_path / "out.wav"
+    input_path.write_bytes(original)
+    before = stats_runs()
+
+    duration = audio_processor.convert_file_to_wav(input_path, output_path)
+
+    assert duration == pytest.approx(0.5)
+    # os.replace: входной файл стал выходным без копирования
+    assert not input_path.exists()
+    assert output_path.read_bytes() == original
+    after = stats_runs()
+    assert after["passthrough"] == before["passthrough"] + 1
+    assert (after["pcm"], after["ffmpeg"]) == (before["pcm"], before["ffmpeg"])
+
+
+@pytest.mark.parametrize("build", [extensible_wav, wav_with_list_chunk, streamed_wav])
+def test_header_is_rewritten_and_data_kept(tmp_path, build):
+    input_path, output_path = tmp_path / "upload", tmp_path / "out.wav"
+    input_path.write_bytes(build(PCM_DATA))
+    before = stats_runs()
+
+    duration = audio_processor.convert_file_to_wav(input_path, output_path)
+
+    assert duration == pytest.approx(0.5)
+    assert input_path.exists()
+    assert output_path.read_bytes() == pcm.build_wav_header(1, 48000, 24, len(PCM_DATA)) + PCM_DATA
+    after = stats_runs()
+    assert after["passthrough"] == before["passthrough"] + 1
+    assert after["pcm"] == before["pcm"]
+
+
+def test_other_format_is_converted(tmp_path):
+    input_path, output_path = tmp_path / "upload", tmp_path / "out.wav"
+    input_path.write_bytes(pcm.build_wav_header(1, 44100, 16, 88200) + bytes(88200))
+    before = stats_runs()
+
+    audio_processor.convert_file_to_wav(input_path, output_path)
+
+    after = stats_runs()
+    assert after["pcm"] == before["pcm"] + 1
+    assert after["passthrough"] == before["passthrough"]
+
+
+def test_passthrough_ratio(tmp_path):
+    for index in range(3):
+        path = tmp_path / f"upload{index}"
+        path.write_bytes(pcm.build_wav_header(1, 48000, 24, len(PCM_DATA)) + PCM_DATA)
+        audio_processor.convert_file_to_wav(path, tmp_path / f"out{index}.wav")
+
+    metrics = audio_processor.conversion_metrics()
+    runs = [metrics[name]["runs"] for name in ("passthrough", "pcm", "ffmpeg")]
+    assert metrics["passthrough"]["runs"] >= 3
+    assert metrics["passthrough_ratio"] == pytest.approx(runs[0] / sum(runs))
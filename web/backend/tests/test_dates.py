@@ -0,0 +1,25 @@
+from datetime import date, datetime
+
+import pytest
+
+from app.config import settings
+from app.core import dates
+
+
+@pytest.mark.parametrize("timezone", ["", "Asia/Bishkek"])
+def test_now_and_day_bounds_are_timezone_aware(monkeypatch, timezone):
+    monkeypatch.setattr(settings, "STATISTICS_TIMEZONE", timezone)
+
+    assert dates.now().tzinfo is not None
+    day_from, day_to = dates.day_range(date(2026, 3, 29))
+    assert day_from.tzinfo is not None and day_to.tzinfo is not None
+    assert (day_from.date(), day_to.date()) == (date(2026, 3, 29), date(2026, 3, 30))
+
+
+def test_localize_keeps_request_wall_clock(monkeypatch):
+    monkeypatch.setattr(settings, "STATISTICS_TIMEZONE", "Asia/Bishkek")
+
+    value = dates.localize(datetime(2026, 1, 1, 12, 30))
+
+    assert value.utcoffset().total_seconds() == 6 * 3600
+    assert (value.hour, value.minute) == (12, 30)
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401 - все таблицы для create_all
+from app.database import Base
+from app.models.book import Book
+from app.models.category import Category
+from app.models.ingestion_job import IngestionJob, IngestionJobStatus
+from app.repositories.ingestion_job_repository import IngestionJobRepository
+from app.services import ingestion_service
+
+
+BOOK_TEXT = "Бул китептин биринчи сүйлөмү жетиштүү узун болушу керек. Экинчи сүйлөм да ушундай эле узун жазылган.\n"
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(ingestion_service, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+def add_job(db, status, started_at=None, heartbeat_at=None, file_path="/tmp/book.txt"):
+    return IngestionJobRepository.create(db, IngestionJob(
+        status=status,
+        title="Китеп",
+        original_filename="book.txt",
+        file_type="txt",
+        file_path=str(file_path),
+        category_id=1,
+        bytes_total=100,
+        bytes_processed=50 if status == IngestionJobStatus.RUNNING else 0,
+        started_at=started_at,
+        heartbeat_at=heartbeat_at,
+    )).id
+
+
+def test_requeue_stale_uses_heartbeat_age(db):
+    now = datetime.now(timezone.utc)
+    long_ago = now - timedelta(hours=2)
+    stale = add_job(db, IngestionJobStatus.RUNNING, long_ago, long_ago)
+    # Долгая задача, которая продолжает отмечаться, остается у своего исполнителя
+    alive = add_job(db, IngestionJobStatus.RUNNING, long_ago, now)
+    # Задача без отметок (до heartbeat_at) - по времени начала
+    legacy = add_job(db, IngestionJobStatus.RUNNING, long_ago)
+    pending = add_job(db, IngestionJobStatus.PENDING)
+
+    assert IngestionJobRepository.requeue_stale(db, 3600) == [stale, legacy]
+    assert IngestionJobRepository.get_pending_ids(db) == [stale, legacy, pending]
+
+    db.expire_all()
+    job = IngestionJobRepository.get_by_id(db, stale)
+    assert job.started_at is None and job.heartbeat_at is None and job.claim_token is None
+    assert job.bytes_processed == 0
+    assert IngestionJobRepository.get_by_id(db, alive).status == IngestionJobStatus.RUNNING
+
+
+def test_requeued_job_is_claimed_with_new_token(db):
+    long_ago = datetime.now(timezone.utc) - timedelta(hours=2)
+    stale = add_job(db, IngestionJobStatus.RUNNING, long_ago, long_ago)
+
+    IngestionJobRepository.requeue_stale(db, 3600)
+    job_id, claim_token = IngestionJobRepository.claim_next(db)
+
+    assert job_id == stale
+    assert IngestionJobRepository.requeue_stale(db, 3600) == []
+    assert IngestionJobRepository.update_claimed(db, stale, claim_token, stage="reading")
+    assert not IngestionJobRepository.update_claimed(db, stale, "old-token", stage="saving")
+
+
+def add_book_job(db, tmp_path):
+    db.add(Category(id=1, name="Проза"))
+    db.commit()
+    file_path = tmp_path / "book.txt"
+    file_path.write_text(BOOK_TEXT * 3, encoding="utf-8")
+    return add_job(db, IngestionJobStatus.PENDING, file_path=file_path), file_path
+
+
+def test_job_creates_book_and_removes_upload(db, tmp_path):
+    job_id, file_path = add_book_job(db, tmp_path)
+
+    assert ingestion_service.run_ingestion_job(job_id)
+
+    job = IngestionJobRepository.get_by_id(db, job_id)
+    assert job.status == IngestionJobStatus.COMPLETED
+    assert job.chunks_count > 0
+    assert db.query(Book).filter(Book.id == job.book_id).count() == 1
+    assert not file_path.exists()
+
+
+def test_superseded_run_does_not_save_book(db, tmp_path):
+    job_id, file_path = add_book_job(db, tmp_path)
+    claim_token = IngestionJobRepository.claim(db, job_id)
+    # Пока задача выполнялась, ее вернули в очередь и захватил другой воркер
+    IngestionJobRepository.requeue_stale(db, -60)
+    new_token = IngestionJobRepository.claim(db, job_id)
+
+    assert not ingestion_service.run_ingestion_job(job_id, claim_token)
+
+    db.expire_all()
+    job = IngestionJobRepository.get_by_id(db, job_id)
+    assert job.status == IngestionJobStatus.RUNNING
+    assert job.claim_token == new_token
+    assert db.query(Book).count() == 0
+    # Файл нужен новому исполнителю
+    assert file_path.exists()
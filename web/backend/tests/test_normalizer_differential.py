@@ -0,0 +1,97 @@
+"""
+Дифференциальная проверка нормализатора: таблица правил (use_rule_engine=True)
+и последовательное применение правил (use_rule_engine=False) должны давать
+тот же результат, что и исходная реализация (tests/baseline_normilizer.py), байт в байт.
+"""
+import random
+
+import pytest
+
+from app.core.normilizer import KyrgyzTextNormalizer
+
+from baseline_normilizer import KyrgyzTextNormalizer as BaselineNormalizer
+
+
+# Конфликты правил и перекрывающиеся сокращения: здесь порядок применения
+# словарных правил влияет на результат
+CONFLICT_CASES = [
+    "жж.б.",
+    "кк.жж.",
+    "ж.б.у.с.",
+    "ж.б.у.с. ж.б.",
+    "б.з.ч. 5-кылым",
+    "б.з.ч 300-жылы",
+    "б.з. б.з.ч.",
+    "к.кк.жж.",
+    "мис. т.б. ө.к. б.а.",
+    "м-н б-ча ж-а",
+    "көч.к.",
+    "5$5",
+    "€5$",
+    "5€5₽",
+    "$5.5€",
+    "10,5$ 20€ ₽30 £4 ¥5 ₸6 ₴7",
+    "1$2$3$",
+    "20 сом",
+    "БУУнун КРнын ЖЧКга",
+    "ЕАЭБ ЕБ ЕККУ",
+    "ИИМ ОИИБ ШИИББ РИИБ",
+    "HTTP HTTPS HTML",
+    "CD DVD ID IT",
+    "WiFi iOS GPU CPU",
+    "5 км 10 м 15 см",
+    "5км 10м 2.5см",
+    "3 TB 5 min 10 sec 2 h",
+    "5 млн 3 млрд 2 трлн 4 тыс",
+    "2-кылымда 3-курста",
+    "1-чи 5-чи 10-чу 21чи 100-чү",
+    "г. Бишкек ш. Ош",
+    "",
+    "   ",
+]
+
+TOKENS = [
+    "ж.б.", "жж.", "кк.", "к.", "б.з.ч.", "б.з.ч", "б.з.", "ж.б.у.с.", "т.б.", "ө.к.", "б.а.", "мис.",
+    "көч.", "м-н", "б-ча", "ж-а", "КР", "КРнын", "БУУ", "БУУнун", "АКШ", "ЕБ", "ЕАЭБ", "ЖЧКга",
+    "IT", "AI", "HTTP", "HTTPS", "WiFi", "ID", "CD", "км", "м", "см", "TB", "min", "h",
+    "$", "€", "₽", "£", "¥", "₸", "₴", "сом", "млн", "млрд", "тыс",
+    "0", "5", "12", "2024", "3.5", "10,25", "100", "1000000",
+    "-", ".", ",", "-чи", "-кылымда", "жыл", "Бишкек", "г.", "ш.", "(", ")", "%", ":",
+]
+SEPARATORS = ["", " ", " ", " ", "  "]
+
+
+def random_corpus(size: int, seed: int = 2024):
+    """Фиксированный случайный корпус из словарных ключей, чисел и разделителей"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        parts = []
+        for _ in range(rng.randint(1, 12)):
+            parts.append(rng.choice(TOKENS))
+            parts.append(rng.choice(SEPARATORS))
+        corpus.append("".join(parts))
+    return corpus
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    return BaselineNormalizer()
+
+
+@pytest.fixture(scope="module", params=[True, False], ids=["rule_engine", "sequential"])
+def normalizer(request):
+    return KyrgyzTextNormalizer(use_rule_engine=request.param)
+
+
+@pytest.mark.parametrize("text", CONFLICT_CASES)
+def test_conflict_cases_match_baseline(baseline, normalizer, text):
+    assert normalizer.normalize(text).encode("utf-8") == baseline.normalize(text).encode("utf-8")
+
+
+def test_random_corpus_matches_baseline(baseline, normalizer):
+    mismatches = [
+        text for text in random_corpus(3000)
+        if normalizer.normalize(text).encode("utf-8") != baseline.normalize(text).encode("utf-8")
+    ]
+    assert mismatches == []
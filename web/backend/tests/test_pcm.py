@@ -0,0 +1,155 @@
+import io
+import math
+import wave
+from math import gcd
+
+import numpy as np
+import pytest
+
+from app.core import pcm
+
+
+def silent_wav(sample_rate: int, frames: int, channels: int = 1, bit_depth: int = 16) -> bytes:
+    data_size = frames * channels * bit_depth // 8
+    return pcm.build_wav_header(channels, sample_rate, bit_depth, data_size) + bytes(data_size)
+
+
+def convert(data: bytes, sample_rate: int = 48000, bit_depth: int = 24, channels: int = 1, **kwargs) -> bytes:
+    out = io.BytesIO()
+    pcm.write_converted_wav(data, out, sample_rate, bit_depth, channels, **kwargs)
+    return out.getvalue()
+
+
+def wave_fixture(samples: np.ndarray, sample_rate: int, sample_width: int) -> bytes:
+    """WAV, записанный стандартным модулем wave: samples - целые отсчеты формы (кадры, каналы)"""
+    if sample_width == 1:
+        raw = (samples + 128).astype(np.uint8).tobytes()
+    elif sample_width == 3:
+        raw = samples.astype('<i4').view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    else:
+        raw = samples.astype(f'<i{sample_width}').tobytes()
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as w:
+        w.setnchannels(samples.shape[1])
+        w.setsampwidth(sample_width)
+        w.setframerate(sample_rate)
+        w.writeframes(raw)
+    return buffer.getvalue()
+
+
+def read_wave(data: bytes):
+    """(параметры, целые отсчеты формы (кадры, каналы)) результата через модуль wave"""
+    with wave.open(io.BytesIO(data), 'rb') as w:
+        params = w.getparams()
+        raw = w.readframes(params.nframes)
+    width = params.sampwidth
+    if width == 1:
+        samples = np.frombuffer(raw, dtype=np.uint8).astype(np.int64) - 128
+    elif width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int64)
+        samples = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        samples = np.where(samples >= 1 << 23, samples - (1 << 24), samples)
+    else:
+        samples = np.frombuffer(raw, dtype=f'<i{width}').astype(np.int64)
+    return params, samples.reshape(-1, params.nchannels)
+
+
+def random_samples(frames: int, channels: int, bit_depth: int, seed: int = 0) -> np.ndarray:
+    limit = 1 << (bit_depth - 1)
+    return np.random.default_rng(seed).integers(-limit, limit, size=(frames, channels), dtype=np.int64)
+
+
+@pytest.mark.parametrize("sample_rate", [0, 4000, 1_000_003, 2_000_000_011])
+def test_rejects_sample_rates_outside_range(sample_rate):
+    with pytest.raises(pcm.PcmFormatError):
+        convert(silent_wav(sample_rate, 4800))
+
+
+def test_rejects_irreducible_resampling_ratio():
+    # 48000/44101 - фильтр на ~10^6 отсчетов
+    with pytest.raises(pcm.PcmFormatError):
+        convert(silent_wav(44101, 4410))
+
+
+def test_conversion_stops_at_deadline():
+    with pytest.raises(TimeoutError):
+        convert(silent_wav(44100, 44100), deadline=0.0)
+
+
+@pytest.mark.parametrize("bit_depth", [8, 16, 24, 32])
+def test_round_trip_keeps_samples(bit_depth):
+    samples = random_samples(5000, 1, bit_depth)
+    # Включая крайние значения: -2^(n-1) и 2^(n-1) - 1
+    samples[:2, 0] = [-(1 << (bit_depth - 1)), (1 << (bit_depth - 1)) - 1]
+
+    params, result = read_wave(convert(wave_fixture(samples, 48000, bit_depth // 8), 48000, bit_depth, 1))
+
+    assert (params.nchannels, params.sampwidth, params.framerate, params.nframes) == (1, bit_depth // 8, 48000, 5000)
+    # 32-bit проходит через float32 (24 бита мантиссы)
+    tolerance = 1 << 8 if bit_depth == 32 else 0
+    assert np.abs(result - samples).max() <= tolerance
+
+
+@pytest.mark.parametrize("source_depth, target_depth", [(8, 16), (16, 24), (24, 16), (16, 8), (24, 32)])
+def test_bit_depth_conversion_scales_samples(source_depth, target_depth):
+    samples = random_samples(3000, 1, source_depth, seed=1)
+
+    _, result = read_wave(convert(wave_fixture(samples, 48000, source_depth // 8), 48000, target_depth, 1))
+
+    shift = target_depth - source_depth
+    expected = samples << shift if shift >= 0 else np.clip(np.rint(samples / (1 << -shift)), -(1 << (target_depth - 1)), (1 << (target_depth - 1)) - 1)
+    assert np.abs(result - expected).max() <= 1
+
+
+def test_stereo_downmix_averages_channels():
+    samples = random_samples(4000, 2, 16, seed=2)
+
+    params, result = read_wave(convert(wave_fixture(samples, 48000, 2), 48000, 16, 1))
+
+    assert params.nchannels == 1
+    assert np.array_equal(result[:, 0], np.rint(samples.mean(axis=1)).astype(np.int64))
+
+
+def test_mono_is_duplicated_to_stereo():
+    samples = random_samples(1000, 1, 16, seed=3)
+
+    _, result = read_wave(convert(wave_fixture(samples, 48000, 2), 48000, 16, 2))
+
+    assert np.array_equal(result, np.repeat(samples, 2, axis=1))
+
+
+@pytest.mark.parametrize("source_rate", [8000, 11025, 22050, 44100, 96000, 192000])
+@pytest.mark.parametrize("frames", [1, 997, 44101])
+def test_resampled_length(source_rate, frames):
+    up, down = 48000 // gcd(48000, source_rate), source_rate // gcd(48000, source_rate)
+
+    params, result = read_wave(convert(wave_fixture(np.zeros((frames, 1), dtype=np.int64), source_rate, 2), 48000, 16, 1))
+
+    assert params.nframes == len(result) == math.ceil(frames * up / down)
+
+
+@pytest.mark.parametrize("source_rate, channels", [(44100, 1), (48000, 2), (22050, 2), (96000, 1)])
+def test_block_boundaries_do_not_change_output(monkeypatch, source_rate, channels):
+    # Длина в несколько блоков с неполным последним
+    samples = random_samples(3 * pcm.BLOCK_FRAMES + 123, channels, 16, seed=4)
+    data = wave_fixture(samples, source_rate, 2)
+
+    blockwise = convert(data, 48000, 24, 1)
+    monkeypatch.setattr(pcm, "BLOCK_FRAMES", 1 << 24)
+    whole = convert(data, 48000, 24, 1)
+
+    assert blockwise == whole
+
+
+@pytest.mark.parametrize("source_rate", [8000, 22050, 44100, 96000])
+def test_resampler_matches_resample_poly(source_rate):
+    signal = pytest.importorskip("scipy.signal")
+    # Четверть полной шкалы: после фильтра шум не выходит за диапазон и не ограничивается
+    samples = random_samples(20000, 1, 24, seed=5) >> 2
+    g = gcd(48000, source_rate)
+
+    _, result = read_wave(convert(wave_fixture(samples, source_rate, 3), 48000, 32, 1))
+
+    expected = signal.resample_poly(samples[:, 0] / 8388608.0, 48000 // g, source_rate // g)
+    assert len(result) == len(expected)
+    assert np.abs(result[:, 0] / 2147483648.0 - expected).max() < 1e-4
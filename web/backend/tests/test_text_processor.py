@@ -0,0 +1,80 @@
+"""
+Нарезка по сегментам (параллельная и потоковая) должна давать те же чанки,
+что и split_text_into_chunks для всего текста целиком.
+"""
+import random
+
+import pytest
+
+from app.core import text_processor
+from app.core.text_processor import TextChunkStream, iter_text_chunks, split_text_into_chunks, split_text_into_chunks_parallel
+
+
+SENTENCE = "Бул биринчи абзацтагы узун сүйлөм болуп саналат жана аягына чейин окулат."
+
+# Абзацы, начало которых зависит от предыдущего текста: символ за кавычкой или "г."
+# нормализатор заменяет словом только после пробела границы
+BOUNDARY_CASES = [
+    SENTENCE + "\n\n«%» белгиси пайызды билдирет жана ал көп колдонулат.",
+    SENTENCE + "\n\nг.@ белгиси электрондук даректе колдонулат жана маанилүү.",
+    SENTENCE + '\n\n"№" белгиси номурду билдирет жана ал дагы көп колдонулат.',
+    SENTENCE + "\n \n„&“ белгиси жана дегенди билдирет, бул абдан маанилүү.",
+    SENTENCE + "\n\n«г.№» белгиси номурду билдирет жана ал көп колдонулат.",
+    SENTENCE + "\n\n%, № жана @ белгилери текстте көп учурайт жана окулат.",
+]
+
+HEADS = ['«%»', '"%"', '«№»', 'г.@', 'г. &', '"&"', '(%)', '„@“', "'№'", '№ 5', '5%', '«г.№»', '—', '...', ',', 'ж.б.', 'КР', '$5', '(', '[x]', 'Бишкек']
+WORDS = "бул китеп абзац сүйлөм белгиси жана ал көп колдонулат маанилүү окуучу мектеп шаар".split()
+ENDS = ['.', '!', '?', ' г.', ' ж.б.', ' КР.', ' 5%.', ' (эскертүү', ' А.', ' 10.', '.»']
+
+
+def random_books(count: int, seed: int = 7):
+    """Фиксированный набор текстов из абзацев с "опасными" началами и концами"""
+    rng = random.Random(seed)
+    books = []
+    for _ in range(count):
+        paragraphs = []
+        for _ in range(rng.randint(2, 6)):
+            words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 12)))
+            paragraphs.append(f"{rng.choice(HEADS)} {words}{rng.choice(ENDS)}")
+        books.append(rng.choice(["\n\n", "\n \n", " \n\n  "]).join(paragraphs))
+    return books
+
+
+def chunk_by_segments(text: str):
+    """Каждый абзац - отдельный сегмент"""
+    stream = TextChunkStream(segment_chars=1)
+    return stream.feed(text) + stream.close()
+
+
+@pytest.mark.parametrize("text", BOUNDARY_CASES)
+def test_segment_heads_match_serial(text):
+    assert chunk_by_segments(text) == split_text_into_chunks(text)
+
+
+def test_random_segmented_books_match_serial():
+    mismatches = [text for text in random_books(1000) if chunk_by_segments(text) != split_text_into_chunks(text)]
+    assert mismatches == []
+
+
+def test_parallel_matches_serial(monkeypatch):
+    monkeypatch.setattr(text_processor, "MIN_SEGMENT_CHARS", 200)
+    # Каждый второй абзац начинается с символа за кавычкой: на них попадают границы сегментов
+    text = "\n\n".join(BOUNDARY_CASES * 8)
+
+    assert split_text_into_chunks_parallel(text, max_workers=2) == split_text_into_chunks(text)
+
+
+def test_streamed_book_matches_serial():
+    # Книга больше STREAM_SEGMENT_CHARS, подается блоками произвольной длины (как decode_text_blocks)
+    text = "\n\n".join(BOUNDARY_CASES * 40 + random_books(200, seed=5))
+    assert len(text) > 4 * text_processor.STREAM_SEGMENT_CHARS
+    rng = random.Random(3)
+    pieces = []
+    position = 0
+    while position < len(text):
+        size = rng.randint(1, 700)
+        pieces.append(text[position:position + size])
+        position += size
+
+    assert list(iter_text_chunks(pieces)) == split_text_into_chunks(text)
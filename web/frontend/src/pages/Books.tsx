@@ -243,7 +243,7 @@ export default function Books() {
         formData.title
       );
       toast({
-        description: "Book uploaded successfully",
+        description: "Book uploaded, processing started",
         variant: "success",
       });
       setDialogOpen(false);
@@ -1,5 +1,5 @@
 import { api } from "@/my_lib/api";
-import type { Book, BooksPaginatedResponse } from "@/types";
+import type { Book, BooksPaginatedResponse, IngestionJob } from "@/types";
 
 export const booksService = {
   async getBooks(
@@ -29,14 +29,18 @@ export const booksService = {
     return api.get<Book>(`/admin/books/${bookId}`);
   },
 
-  async uploadBook(file: File, categoryId: number, title?: string): Promise<Book> {
+  async uploadBook(file: File, categoryId: number, title?: string): Promise<IngestionJob> {
     const formData = new FormData();
     formData.append("file", file);
     formData.append("category_id", categoryId.toString());
     if (title) {
       formData.append("title", title);
     }
-    return api.uploadFile<Book>("/admin/books/upload", formData);
+    return api.uploadFile<IngestionJob>("/admin/books/upload", formData);
+  },
+
+  async getIngestionJob(jobId: number): Promise<IngestionJob> {
+    return api.get<IngestionJob>(`/admin/ingestion-jobs/${jobId}`);
   },
 
   async deleteBook(bookId: number): Promise<void> {
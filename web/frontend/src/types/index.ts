@@ -35,6 +35,27 @@ export interface Book {
   updated_at: string | null;
 }
 
+export type IngestionJobStatus = "pending" | "running" | "completed" | "failed";
+
+export interface IngestionJob {
+  id: number;
+  status: IngestionJobStatus;
+  stage: string | null;
+  title: string | null;
+  original_filename: string;
+  category_id: number;
+  book_id: number | null;
+  bytes_total: number;
+  bytes_processed: number;
+  progress_percentage: number;
+  chunks_count: number;
+  stage_timings: Record<string, number> | null;
+  error: string | null;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
 export interface BookWithStatistics extends Book {
   total_chunks: number;
   recorded_chunks: number;